@@ -0,0 +1,107 @@
+# analytics.py
+"""Vectorized bid analytics.
+
+Bids are loaded straight from the database cursor into NumPy structured
+arrays (amount, bid time in epoch seconds, bidder id) so every metric is a
+handful of array operations instead of a Python loop over ORM rows.
+"""
+import numpy as np
+
+# Bids in the last minute before the end time count as sniping
+SNIPING_WINDOW_SECONDS = 60.0
+
+BID_DTYPE = np.dtype([("amount", "f8"), ("time", "f8"), ("bidder", "i8")])
+SELLER_BID_DTYPE = np.dtype([("amount", "f8"), ("time", "f8"), ("bidder", "i8"), ("auction", "i8")])
+AUCTION_DTYPE = np.dtype([("id", "i8"), ("base_price", "f8"), ("end_time", "f8")])
+
+
+def load(rows, dtype, order=None):
+    """Build a structured array from an iterable of tuples, optionally sorted by a field."""
+    data = np.fromiter(rows, dtype=dtype)
+    if order:
+        data.sort(order=order, kind="stable")
+    return data
+
+
+def auction_metrics(bids, base_price, start_time, end_time, buckets=60):
+    """Price curve, bid velocity and bidder mix for one auction.
+
+    ``bids`` is a BID_DTYPE array sorted by time; all times are epoch seconds.
+    """
+    n = bids.size
+    amounts = bids["amount"]
+    times = bids["time"]
+    horizon = max(end_time, float(times[-1]) if n else end_time)
+    edges = np.linspace(start_time, horizon, buckets + 1)
+    bucket_seconds = (horizon - start_time) / buckets if horizon > start_time else 0.0
+
+    # Highest bid so far, sampled at the end of each bucket
+    running_max = np.maximum.accumulate(amounts) if n else amounts
+    last_bid = np.searchsorted(times, edges[1:], side="right") - 1
+    price = np.full(buckets, float(base_price))
+    has_bid = last_bid >= 0
+    if n:
+        price[has_bid] = np.maximum(running_max[last_bid[has_bid]], base_price)
+
+    counts = np.diff(np.searchsorted(times, edges, side="left"))
+    if n:
+        # Bids exactly at (or after) the horizon belong to the last bucket
+        counts[-1] += n - np.searchsorted(times, horizon, side="left")
+    per_minute = counts * (60.0 / bucket_seconds) if bucket_seconds else counts.astype(np.float64)
+
+    duration_minutes = (horizon - start_time) / 60.0
+    final_price = float(running_max[-1]) if n else float(base_price)
+    sniping = int(np.count_nonzero(times >= end_time - SNIPING_WINDOW_SECONDS))
+
+    return {
+        "total_bids": int(n),
+        "unique_bidders": int(np.unique(bids["bidder"]).size),
+        "bids_per_minute": n / duration_minutes if duration_minutes > 0 else float(n),
+        "peak_bids_per_minute": float(per_minute.max()),
+        "final_minute_bids": sniping,
+        "sniping_share": sniping / n if n else 0.0,
+        "final_price": final_price,
+        "price_over_base": final_price / base_price if base_price else None,
+        "bucket_seconds": bucket_seconds,
+        "price_curve": [
+            {"t": float(t), "price": float(p), "bids_per_minute": float(v)}
+            for t, p, v in zip(edges[1:], price, per_minute)
+        ],
+    }
+
+
+def seller_metrics(bids, auctions):
+    """Aggregate bid behaviour across all of a seller's auctions.
+
+    ``bids`` is a SELLER_BID_DTYPE array sorted by time and ``auctions`` an
+    AUCTION_DTYPE array sorted by id.
+    """
+    n = bids.size
+    times = bids["time"]
+    position = np.searchsorted(auctions["id"], bids["auction"])
+
+    bids_per_auction = np.bincount(position, minlength=auctions.size)
+    top_bid = np.zeros(auctions.size)
+    np.maximum.at(top_bid, position, bids["amount"])
+    with_bids = bids_per_auction > 0
+    # Auctions starting at 0 have no price-over-base ratio
+    priced = with_bids & (auctions["base_price"] > 0)
+    ratios = top_bid[priced] / auctions["base_price"][priced]
+
+    sniping = int(np.count_nonzero(times >= auctions["end_time"][position] - SNIPING_WINDOW_SECONDS))
+    hours = ((times // 3600) % 24).astype(np.int64)
+    span_minutes = (times[-1] - times[0]) / 60.0 if n > 1 else 0.0
+
+    return {
+        "auctions": int(auctions.size),
+        "auctions_with_bids": int(with_bids.sum()),
+        "total_bids": int(n),
+        "unique_bidders": int(np.unique(bids["bidder"]).size),
+        "bids_per_minute": n / span_minutes if span_minutes else float(n),
+        "average_bids_per_auction": float(bids_per_auction.mean()) if auctions.size else 0.0,
+        "final_minute_bids": sniping,
+        "sniping_share": sniping / n if n else 0.0,
+        "average_price_over_base": float(ratios.mean()) if ratios.size else None,
+        "median_price_over_base": float(np.median(ratios)) if ratios.size else None,
+        "bids_by_hour_utc": np.bincount(hours, minlength=24).tolist(),
+    }
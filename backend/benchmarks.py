@@ -0,0 +1,340 @@
+# benchmarks.py
+"""Micro-benchmarks for backend hot paths.
+
+Run from the backend directory, e.g. ``python benchmarks.py encoding`` or
+``python benchmarks.py analytics --count 100000``. Every
+benchmark works on a throwaway database in a temporary directory.
+"""
+import argparse
+import gzip
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def scratch_app():
+    """Open an empty database in a temporary directory; returns the database module."""
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    os.chdir(tempfile.mkdtemp(prefix="auction-bench-"))
+    import database
+    database.init_database()
+    return database
+
+
+def best_of(fn, repeat=5):
+    """Fastest of ``repeat`` runs in milliseconds, plus the last result."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def bench_encoding(count):
+    """Bytes and time to list ``count`` auctions: model rebuild vs projected rows and compact encodings."""
+    database = scratch_app()
+    from fastapi.encoders import jsonable_encoder
+    from sqlalchemy import insert
+    import serialization
+    from models import Auction, AuctionStatus
+    from responses import projection
+    from schemas import AuctionResponse
+    from services.auctions import AUCTION_FIELDS, auction_page
+
+    now = datetime.utcnow()
+    description = "Gently used, original box and accessories included. Ships within two days of payment. " * 3
+    with database.engine.begin() as conn:
+        conn.execute(insert(Auction.__table__), [
+            {
+                "product_name": f"Item {i}",
+                "description": description,
+                "base_price": 10.0 + i % 500,
+                "current_highest_bid": 10.0 + i % 500,
+                "start_time": now,
+                "end_time": now + timedelta(minutes=i % 1440),
+                "status": AuctionStatus.ACTIVE,
+                "seller_id": 1 + i % 50,
+                "created_at": now
+            } for i in range(count)
+        ])
+
+    db = database.SessionLocal()
+    shards = database.ShardSessions(db)
+
+    def models():
+        # What the endpoints did before: ORM entities, one response model per row
+        return [
+            AuctionResponse(
+                id=a.id, product_name=a.product_name, description=a.description, base_price=a.base_price,
+                current_highest_bid=a.current_highest_bid, start_time=a.start_time, end_time=a.end_time,
+                status=a.status, image_url=a.image_url, seller_id=a.seller_id
+            ) for a in db.query(Auction).all()
+        ]
+
+    variants = [
+        ("models + json", models,
+         lambda rows: json.dumps(jsonable_encoder(rows), separators=(",", ":")).encode("utf-8")),
+        ("rows + json", lambda: auction_page(shards, list(AUCTION_FIELDS)), serialization.dumps_json),
+        ("fields=product_name,current_highest_bid,end_time",
+         lambda: auction_page(shards, projection("product_name,current_highest_bid,end_time", AUCTION_FIELDS)),
+         serialization.dumps_json),
+    ]
+    if serialization.msgpack is not None:
+        variants.append(("rows + msgpack", lambda: auction_page(shards, list(AUCTION_FIELDS)), serialization.dumps_msgpack))
+
+    print(f"{count} auctions (json encoder: {'orjson' if serialization.orjson else 'json'})")
+    print(f"{'variant':<52}{'query ms':>10}{'encode ms':>11}{'bytes':>11}{'gzip':>10}{'br':>10}")
+    for name, query, encode in variants:
+        query_ms, rows = best_of(query)
+        encode_ms, body = best_of(lambda: encode(rows))
+        gzipped = len(gzip.compress(body, compresslevel=serialization.GZIP_LEVEL))
+        brotli_size = len(serialization.brotli.compress(body, quality=serialization.BROTLI_QUALITY)) if serialization.brotli else None
+        print(f"{name:<52}{query_ms:>10.1f}{encode_ms:>11.1f}{len(body):>11}{gzipped:>10}{brotli_size or '-':>10}")
+    shards.close()
+    db.close()
+
+
+# Run in a fresh interpreter per boot; times are cumulative seconds since it started
+STARTUP_PROBE = """
+import asyncio, json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {backend!r})
+import main
+imported = time.perf_counter()
+app = main.create_app(main.Settings.from_env()._replace(background_jobs=False))
+created = time.perf_counter()
+
+async def boot():
+    async with app.router.lifespan_context(app):
+        return time.perf_counter()
+
+started = asyncio.run(boot())
+print(json.dumps({{"import": imported - start, "create_app": created - imported, "startup": started - created}}))
+"""
+
+
+def boot_times(directory, repeat):
+    """Median phase times in milliseconds of ``repeat`` cold boots in ``directory``."""
+    probe = STARTUP_PROBE.format(backend=os.path.dirname(os.path.abspath(__file__)))
+    runs = []
+    for _ in range(repeat + 1):
+        output = subprocess.run([sys.executable, "-c", probe], cwd=directory, capture_output=True, text=True, check=True)
+        runs.append(json.loads(output.stdout.strip().splitlines()[-1]))
+    # The first boot also writes bytecode caches
+    runs = runs[1:]
+    return {phase: statistics.median(run[phase] for run in runs) * 1000 for phase in runs[0]}
+
+
+def bench_startup(count):
+    """Cold worker boot: importing main, create_app and startup, on an empty and a populated database."""
+    empty = tempfile.mkdtemp(prefix="auction-bench-")
+    database = scratch_app()
+    from sqlalchemy import insert
+    from models import Auction, AuctionStatus, Bid
+    populated = os.getcwd()
+    now = datetime.utcnow()
+    with database.engine.begin() as conn:
+        conn.execute(insert(Auction.__table__), [
+            {
+                "product_name": f"Item {i}",
+                "base_price": 10.0,
+                "current_highest_bid": 10.0 + i % 500,
+                "start_time": now,
+                "end_time": now + timedelta(minutes=i % 1440),
+                "status": AuctionStatus.ACTIVE,
+                "seller_id": 1 + i % 50,
+                "created_at": now
+            } for i in range(count)
+        ])
+        conn.execute(insert(Bid.__table__), [
+            {"amount": 11.0 + i % 500, "bidder_id": 100 + i % 1000, "auction_id": 1 + i, "bid_time": now}
+            for i in range(count)
+        ])
+    database.engine.dispose()
+
+    print("median of 5 cold boots (ms)")
+    print(f"{'database':<32}{'import':>10}{'create_app':>12}{'startup':>10}{'total':>10}")
+    for name, directory in (("empty", empty), (f"{count} active auctions + bids", populated)):
+        times = boot_times(directory, repeat=5)
+        print(f"{name:<32}{times['import']:>10.1f}{times['create_app']:>12.1f}{times['startup']:>10.1f}{sum(times.values()):>10.1f}")
+
+
+# Concurrent bidders, and how long each run lasts
+BID_CLIENTS = (1, 4, 16)
+BID_RUN_SECONDS = 3.0
+BID_FLUSH_WINDOWS_MS = (0, 1, 2, 5, 10)
+
+
+def bid_run(database, clients, auction_count, amounts):
+    """Per-bid latencies (ms) of accepted bids, rejected and failed counts, and elapsed seconds."""
+    import random
+    import threading
+    from fastapi import HTTPException
+    from schemas import BidCreate
+    from services.bids import submit_bid
+
+    latencies = []
+    rejected = []
+    failed = []
+    deadline = time.perf_counter() + BID_RUN_SECONDS
+
+    def client(seed):
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            bid = BidCreate(auction_id=rng.randint(1, auction_count), amount=next(amounts), bidder_id=rng.randint(100, 999))
+            # What the endpoint gets from its dependencies
+            db = database.SessionLocal()
+            shards = database.ShardSessions(db)
+            start = time.perf_counter()
+            try:
+                submit_bid(bid, shards)
+                latencies.append((time.perf_counter() - start) * 1000)
+            except HTTPException:
+                # Another client's higher bid committed between our read and write
+                rejected.append(1)
+            except Exception:
+                # Lock or connection pool timeouts
+                failed.append(1)
+            finally:
+                shards.close()
+                db.close()
+
+    threads = [threading.Thread(target=client, args=(seed,)) for seed in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, len(rejected), len(failed), time.perf_counter() - started
+
+
+def bench_bids(count):
+    """Bid throughput and latency with group commit off and at several flush windows."""
+    import itertools
+    import logging
+    database = scratch_app()
+    import main
+    from sqlalchemy import insert
+    from models import Auction, AuctionStatus
+    from settings import Settings
+    logging.getLogger("auction").setLevel(logging.CRITICAL)
+    now = datetime.utcnow()
+    with database.engine.begin() as conn:
+        conn.execute(insert(Auction.__table__), [
+            {
+                "product_name": f"Item {i}",
+                "base_price": 10.0,
+                "current_highest_bid": 10.0,
+                "start_time": now,
+                "end_time": now + timedelta(days=1),
+                "status": AuctionStatus.ACTIVE,
+                "seller_id": 1 + i % 50,
+                "created_at": now
+            } for i in range(count)
+        ])
+    # Rising amounts, so bids are only rejected when a higher one overtakes them
+    amounts = itertools.count(11)
+
+    print(f"bidding on {count} auctions for {BID_RUN_SECONDS:.0f}s per run")
+    print(f"{'clients':>8}{'flush window':>14}{'bids/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'rejected':>10}{'failed':>8}")
+    for clients in BID_CLIENTS:
+        for window_ms in BID_FLUSH_WINDOWS_MS:
+            main.start_app(Settings.from_env()._replace(background_jobs=False, bid_flush_window_ms=window_ms))
+            try:
+                latencies, rejected, failed, elapsed = bid_run(database, clients, count, amounts)
+            finally:
+                main.stop_app()
+            latencies.sort()
+            pick = lambda fraction: latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] if latencies else float("nan")
+            name = f"{window_ms} ms" if window_ms else "off"
+            print(f"{clients:>8}{name:>14}{len(latencies) / elapsed:>10.0f}{pick(0.5):>10.2f}{pick(0.95):>10.2f}"
+                  f"{pick(0.99):>10.2f}{rejected:>10}{failed:>8}")
+
+
+def bench_analytics(count):
+    """Seller analytics over ``count`` bids: NumPy arrays from the raw cursor vs a loop over ORM rows."""
+    import random
+    from sqlalchemy import insert, select
+    from sqlalchemy.orm import Session
+    database = scratch_app()
+    import analytics
+    from models import Auction, AuctionStatus, Bid
+
+    auction_count = max(1, count // 100)
+    now = datetime.utcnow()
+    rng = random.Random(0)
+    with database.engine.begin() as conn:
+        conn.execute(insert(Auction.__table__), [
+            {
+                "product_name": f"Item {i}",
+                "base_price": 10.0 + i % 50,
+                "current_highest_bid": 10.0 + i % 50,
+                "start_time": now - timedelta(days=1),
+                "end_time": now + timedelta(minutes=i % 1440),
+                "status": AuctionStatus.ACTIVE,
+                "seller_id": 1,
+                "created_at": now
+            } for i in range(auction_count)
+        ])
+        conn.execute(insert(Bid.__table__), [
+            {
+                "auction_id": 1 + i % auction_count,
+                "bidder_id": rng.randrange(1, 1000),
+                "amount": 10.0 + i,
+                "bid_time": now - timedelta(seconds=rng.randrange(86400))
+            } for i in range(count)
+        ])
+
+    def vectorized():
+        with Session(database.engine) as db:
+            auctions = analytics.load(
+                database.iter_raw_rows(db, select(Auction.id, Auction.base_price, database.epoch_seconds(Auction.end_time))
+                                       .where(Auction.seller_id == 1)),
+                analytics.AUCTION_DTYPE, order="id"
+            )
+            bids = analytics.load(
+                database.iter_raw_rows(db, select(Bid.amount, database.epoch_seconds(Bid.bid_time), Bid.bidder_id, Bid.auction_id)
+                                       .join(Auction, Auction.id == Bid.auction_id).where(Auction.seller_id == 1)),
+                analytics.SELLER_BID_DTYPE, order="time"
+            )
+            return analytics.seller_metrics(bids, auctions)
+
+    def orm_loop():
+        with Session(database.engine) as db:
+            auctions = {auction.id: auction for auction in db.query(Auction).filter(Auction.seller_id == 1)}
+            top_bid, bidders, sniping = {}, set(), 0
+            for bid in db.query(Bid).join(Auction).filter(Auction.seller_id == 1):
+                top_bid[bid.auction_id] = max(top_bid.get(bid.auction_id, 0.0), bid.amount)
+                bidders.add(bid.bidder_id)
+                end_time = auctions[bid.auction_id].end_time
+                sniping += (end_time - bid.bid_time).total_seconds() <= analytics.SNIPING_WINDOW_SECONDS
+            ratios = [amount / auctions[auction_id].base_price for auction_id, amount in top_bid.items()]
+            return {"unique_bidders": len(bidders), "final_minute_bids": sniping, "average_price_over_base": sum(ratios) / len(ratios)}
+
+    print(f"seller analytics over {count} bids on {auction_count} auctions")
+    for name, fn in (("numpy", vectorized), ("orm loop", orm_loop)):
+        elapsed, result = best_of(fn, repeat=3)
+        print(f"{name:>10}{elapsed:>10.1f} ms   unique bidders {result['unique_bidders']}, "
+              f"avg price/base {result['average_price_over_base']:.2f}")
+
+
+BENCHMARKS = {
+    "analytics": bench_analytics,
+    "bids": bench_bids,
+    "encoding": bench_encoding,
+    "startup": bench_startup,
+}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--count", type=int, default=10000)
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args.count)
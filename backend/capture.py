@@ -0,0 +1,141 @@
+# capture.py
+"""Opt-in traffic capture for later replay (see replay.py).
+
+Each request becomes one JSON line in an append-only file: when it started,
+method, path, matched route, query string, JSON body, the authenticated user
+id, response status, size and duration. Values of personal fields (emails,
+passwords, phone numbers, ...) are replaced by keyed hashes, so the file
+holds no PII but equal inputs still map to equal outputs, and hashed emails
+remain valid email addresses.
+"""
+import hashlib
+import hmac
+import json
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode
+
+PII_FIELDS = {
+    "email", "password", "phone", "phone_number", "phoneNumber", "contactNo",
+    "userName", "user_name", "name", "address", "account_number", "accountNumber"
+}
+# Bodies larger than this, and non-JSON bodies, are recorded by size only
+MAX_BODY_BYTES = 64 * 1024
+
+
+def hash_value(value, salt):
+    digest = hmac.new(salt, str(value).encode("utf-8"), hashlib.sha256).hexdigest()[:16]
+    return f"{digest}@example.com" if "@" in str(value) else f"h:{digest}"
+
+
+def scrub(value, salt):
+    """Copy of a decoded JSON value with every PII field's value hashed."""
+    if isinstance(value, dict):
+        return {
+            key: hash_value(item, salt) if key in PII_FIELDS and item is not None else scrub(item, salt)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [scrub(item, salt) for item in value]
+    return value
+
+
+def scrub_query(query, salt):
+    return urlencode([
+        (key, hash_value(value, salt) if key in PII_FIELDS else value)
+        for key, value in parse_qsl(query, keep_blank_values=True)
+    ])
+
+
+class CaptureWriter:
+    """Appends records as JSON lines, flushing each one so a crash loses nothing.
+
+    The file is opened by the first write, not when the app is built.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def write(self, record):
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+
+
+class CaptureMiddleware:
+    """ASGI middleware recording each HTTP request to a CaptureWriter.
+
+    ``identify`` maps a bearer token to a user id (or None) so replays can
+    act as the same user without the token itself being stored.
+    """
+
+    def __init__(self, app, writer, salt, identify=None):
+        self.app = app
+        self.writer = writer
+        self.salt = salt.encode("utf-8") if isinstance(salt, str) else salt
+        self.identify = identify
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.writer is None:
+            await self.app(scope, receive, send)
+            return
+        started = time.time()
+        clock = time.perf_counter()
+        headers = dict(scope.get("headers", ()))
+        chunks = []
+        size = 0
+        response = {"status": None, "bytes": 0}
+
+        async def receive_and_keep():
+            nonlocal size
+            message = await receive()
+            if message["type"] == "http.request":
+                body = message.get("body", b"")
+                size += len(body)
+                if size <= MAX_BODY_BYTES:
+                    chunks.append(body)
+            return message
+
+        async def send_and_measure(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_and_keep, send_and_measure)
+        finally:
+            self._record(scope, headers, started, clock, chunks, size, response)
+
+    def _record(self, scope, headers, started, clock, chunks, size, response):
+        content_type = headers.get(b"content-type", b"").decode("latin-1")
+        record = {
+            "t": round(started, 4),
+            "m": scope["method"],
+            "p": scope["path"],
+            "q": scrub_query(scope.get("query_string", b"").decode("latin-1"), self.salt),
+            "ct": content_type.split(";")[0],
+            "s": response["status"],
+            "d": round((time.perf_counter() - clock) * 1000, 3),
+            "n": response["bytes"],
+        }
+        route = scope.get("route")
+        if route is not None:
+            record["r"] = route.path
+        if size:
+            record["bs"] = size
+            if size <= MAX_BODY_BYTES and content_type.startswith("application/json"):
+                try:
+                    record["b"] = scrub(json.loads(b"".join(chunks)), self.salt)
+                except ValueError:
+                    pass
+        authorization = headers.get(b"authorization", b"").decode("latin-1")
+        if self.identify and authorization.lower().startswith("bearer "):
+            record["u"] = self.identify(authorization[7:])
+        self.writer.write(record)
@@ -0,0 +1,534 @@
+# database.py
+"""Databases: auction.db, the auction shards and the per-request sessions on them.
+
+init_database opens them when an app starts and replaces ``settings``,
+``engine``, ``SessionLocal`` and ``shard_router``, so other modules reach
+those through this module (``database.engine``) rather than importing them.
+"""
+from fastapi import Depends
+from sqlalchemy import create_engine, Integer, cast, literal, select, insert, update, delete, event
+from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.sql import func
+from typing import Optional, List
+from datetime import datetime, timedelta
+import logging
+import threading
+import bisect
+import heapq
+import itertools
+from collections import defaultdict
+from contextlib import contextmanager
+
+from models import (
+    SHARDED_TABLES, create_schema, User, Auction, Bid, Notification, ShardLayout, UserShardLayout, IdSequence,
+    ChangeLogEntry, Backfill
+)
+from settings import Settings, MEMORY_DATABASE_URL
+import tracing
+
+logger = logging.getLogger("auction")
+
+# Settings of the running app; create_app's startup replaces them with its own
+settings = Settings.from_env()
+
+# Database setup: opened by init_database when the app starts, not on import
+engine = None
+SessionLocal = None
+
+# Auction sharding (AUCTION_SHARDS=4 spreads auctions and their bids by auction id,
+# and notifications by user id, over auction.db and auction_shard1.db .. auction_shard3.db)
+SHARD_ID_BLOCK_SIZE = 100
+# Notifications moved per transaction when they first go to their user's shard
+NOTIFICATION_MOVE_CHUNK_SIZE = 500
+
+# Tracing (settings.trace_exporter picks the exporter; unset turns tracing off)
+TRACE_STATEMENT_MAX_LENGTH = 1000
+
+# Change feed for polling clients (GET /changes)
+CHANGE_LOG_RETENTION_HOURS = 24
+
+def open_engine(url: str):
+    if url == MEMORY_DATABASE_URL:
+        # Every session shares the one connection, or each would get its own empty database
+        return create_engine(url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    return create_engine(url, connect_args={"check_same_thread": False})
+
+class ShardRouter:
+    """Maps auction ids to database files.
+
+    Shard 0 is auction.db itself, which also holds the global tables. Each
+    layout in shard_layouts assigns auction ids from its first id onwards to
+    ``id % shard_count``; changing AUCTION_SHARDS starts a new layout at the
+    next auction id, so existing rows never move. Notifications go to their
+    user's shard instead, by the same rule over user ids in
+    user_shard_layouts. Once any layout has more than one shard, auction, bid
+    and notification ids are handed out from id_sequences in blocks instead of
+    by each file's rowids, keeping them unique across shards.
+    """
+
+    def __init__(self, shard_count: int, shard_url: str):
+        self._lock = threading.Lock()
+        self._blocks = {}
+        self._shard_url = shard_url
+        layouts = self._load_layouts()
+        user_layouts = self._load_user_layouts()
+        self._open(max([shard_count] + [count for _, count in layouts + user_layouts]))
+        if shard_count != (layouts[-1][1] if layouts else 1):
+            layouts = self._start_layout(shard_count)
+        if shard_count != (user_layouts[-1][1] if user_layouts else 1):
+            user_layouts = self._start_user_layout(shard_count)
+        self._firsts = [first for first, _ in layouts]
+        self._counts = [count for _, count in layouts]
+        self._user_firsts = [first for first, _ in user_layouts]
+        self._user_counts = [count for _, count in user_layouts]
+        self.sharded = any(count > 1 for count in self._counts + self._user_counts)
+
+    @property
+    def count(self) -> int:
+        return len(self.engines)
+
+    def shard_for(self, auction_id: Optional[int]) -> int:
+        """Shard holding an auction; rows not yet given an id belong to shard 0."""
+        if auction_id is None:
+            return 0
+        layout = bisect.bisect_right(self._firsts, auction_id) - 1
+        return auction_id % self._counts[layout] if layout >= 0 else 0
+
+    def engine_for(self, auction_id: Optional[int]):
+        return self.engines[self.shard_for(auction_id)]
+
+    def shard_for_user(self, user_id: int) -> int:
+        """Shard holding a user's notifications."""
+        layout = bisect.bisect_right(self._user_firsts, user_id) - 1
+        return user_id % self._user_counts[layout] if layout >= 0 else 0
+
+    def allocate(self, name: str) -> Optional[int]:
+        """A new id for a sharded table, or None while unsharded (SQLite assigns it).
+
+        Ids come from a block reserved in its own transaction, so call this
+        before the current transaction writes to auction.db.
+        """
+        if not self.sharded:
+            return None
+        with self._lock:
+            next_id, end = self._blocks.get(name, (0, 0))
+            if next_id >= end:
+                next_id = self.reserve(name, SHARD_ID_BLOCK_SIZE)
+                end = next_id + SHARD_ID_BLOCK_SIZE
+            self._blocks[name] = (next_id + 1, end)
+        return next_id
+
+    def reserve(self, name: str, count: int, conn=None) -> Optional[int]:
+        """First of ``count`` consecutive new ids, or None while unsharded.
+
+        A connection to auction.db reserves them inside its own transaction.
+        """
+        if not self.sharded:
+            return None
+        if conn is None or conn.engine is not engine:
+            with engine.begin() as conn:
+                return self._reserve(conn, name, count)
+        return self._reserve(conn, name, count)
+
+    def reserve_colocated(self, name: str, count: int, conn=None) -> Optional[List[int]]:
+        """``count`` new auction ids that all fall on one shard, or None while unsharded.
+
+        Takes every shard_count-th id of a block ``shard_count`` times as long,
+        so whole import chunks can be written in a single shard transaction.
+        """
+        if not self.sharded:
+            return None
+        shard_count = self._counts[-1]
+        first_id = self.reserve(name, count * shard_count, conn)
+        return list(range(first_id, first_id + count * shard_count, shard_count))
+
+    def _load_layouts(self):
+        with engine.connect() as conn:
+            return [tuple(row) for row in conn.execute(
+                select(ShardLayout.first_auction_id, ShardLayout.shard_count).order_by(ShardLayout.first_auction_id)
+            )]
+
+    def _open(self, shard_count: int):
+        self.engines = [engine]
+        self.sessionmakers = [SessionLocal]
+        for shard in range(1, shard_count):
+            shard_engine = open_engine(self._shard_url.format(shard))
+            create_schema(shard_engine, SHARDED_TABLES)
+            self.engines.append(shard_engine)
+            self.sessionmakers.append(sessionmaker(autocommit=False, autoflush=False, bind=shard_engine))
+
+    def _start_layout(self, shard_count: int):
+        sequences = IdSequence.__table__
+        last_ids = {}
+        for table in (Auction.__table__, Bid.__table__, Notification.__table__):
+            last_ids[table.name] = 0
+            for shard_engine in self.engines:
+                with shard_engine.connect() as conn:
+                    last_ids[table.name] = max(last_ids[table.name], conn.execute(select(func.max(table.c.id))).scalar() or 0)
+        with engine.begin() as conn:
+            # Seeding the sequences first takes the write lock, so concurrently
+            # starting workers agree on a single new layout
+            conn.execute(
+                insert(sequences).prefix_with("OR IGNORE"),
+                [{"name": name, "next_id": last_id + 1} for name, last_id in last_ids.items()]
+            )
+            layouts = conn.execute(
+                select(ShardLayout.first_auction_id, ShardLayout.shard_count).order_by(ShardLayout.first_auction_id)
+            ).all()
+            if not layouts or layouts[-1].shard_count != shard_count:
+                first_id = conn.execute(select(sequences.c.next_id).where(sequences.c.name == "auctions")).scalar()
+                conn.execute(insert(ShardLayout.__table__).values(
+                    first_auction_id=first_id, shard_count=shard_count, created_at=datetime.utcnow()
+                ))
+                layouts = layouts + [(first_id, shard_count)]
+        return [tuple(row) for row in layouts]
+
+    def _load_user_layouts(self):
+        with engine.connect() as conn:
+            return [tuple(row) for row in conn.execute(
+                select(UserShardLayout.first_user_id, UserShardLayout.shard_count).order_by(UserShardLayout.first_user_id)
+            )]
+
+    def _start_user_layout(self, shard_count: int):
+        layouts = UserShardLayout.__table__
+        with engine.begin() as conn:
+            # As in _start_layout, concurrently starting workers agree on a single new layout
+            take_write_lock(conn)
+            rows = conn.execute(select(layouts.c.first_user_id, layouts.c.shard_count).order_by(layouts.c.first_user_id)).all()
+            if not rows or rows[-1].shard_count != shard_count:
+                first_id = (conn.execute(select(func.max(User.id))).scalar() or 0) + 1
+                if rows and rows[-1].first_user_id == first_id:
+                    # No user has signed up under the last layout yet
+                    conn.execute(update(layouts).where(layouts.c.first_user_id == first_id).values(shard_count=shard_count))
+                    rows = rows[:-1]
+                else:
+                    conn.execute(insert(layouts).values(first_user_id=first_id, shard_count=shard_count, created_at=datetime.utcnow()))
+                rows = rows + [(first_id, shard_count)]
+        return [tuple(row) for row in rows]
+
+    def _reserve(self, conn, name: str, count: int) -> int:
+        sequences = IdSequence.__table__
+        conn.execute(update(sequences).where(sequences.c.name == name).values(next_id=sequences.c.next_id + count))
+        return conn.execute(select(sequences.c.next_id).where(sequences.c.name == name)).scalar() - count
+
+shard_router = None
+
+def trace_exporter(settings: Settings):
+    if settings.trace_exporter == "otlp":
+        return tracing.OtlpHttpExporter(settings.trace_otlp_endpoint)
+    if settings.trace_exporter == "file":
+        return tracing.FileExporter(settings.trace_file)
+    if settings.trace_exporter:
+        logger.warning("Unknown AUCTION_TRACE_EXPORTER %r; tracing is off", settings.trace_exporter)
+    return None
+
+# Samples nothing until init_database gives it an exporter
+tracer = tracing.Tracer("auction-api")
+
+def trace_statements(bind, shard: int):
+    """Record each SQL statement run on an engine inside a sampled trace as a client span."""
+    @event.listens_for(bind, "before_cursor_execute")
+    def start_statement(conn, cursor, statement, parameters, context, executemany):
+        parent = tracer.current()
+        if parent is None or not parent.sampled:
+            return
+        span = tracer.start_span(statement.split(None, 1)[0].upper(), tracing.KIND_CLIENT, {
+            "db.system": "sqlite",
+            "db.shard": shard,
+            "db.statement": statement[:TRACE_STATEMENT_MAX_LENGTH]
+        }, parent=parent)
+        if executemany:
+            span.set_attribute("db.batch_size", len(parameters))
+        conn.info["trace_span"] = span
+    
+    @event.listens_for(bind, "after_cursor_execute")
+    def end_statement(conn, cursor, statement, parameters, context, executemany):
+        span = conn.info.pop("trace_span", None)
+        if span is not None:
+            span.end()
+    
+    @event.listens_for(bind, "handle_error")
+    def fail_statement(context):
+        span = context.connection.info.pop("trace_span", None) if context.connection is not None else None
+        if span is not None:
+            span.record_error(context.original_exception)
+            span.end()
+
+def init_database(app_settings: Optional[Settings] = None):
+    """Open auction.db and the shards, creating missing tables.
+    
+    Runs when an app starts rather than on import; scripts such as seed.py
+    call it directly. Opening again (a second test app, say) disposes the
+    engines of the previous one.
+    """
+    global settings, engine, SessionLocal, shard_router
+    if app_settings is not None:
+        settings = app_settings
+    if shard_router is not None:
+        for shard_engine in shard_router.engines:
+            shard_engine.dispose()
+    engine = open_engine(settings.database_url)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    create_schema(engine)
+    shard_router = ShardRouter(settings.shard_count, settings.shard_database_url)
+    tracer.sample_rate = settings.trace_sample_rate
+    tracer.exporter = trace_exporter(settings)
+    if tracer.enabled:
+        for shard, shard_engine in enumerate(shard_router.engines):
+            trace_statements(shard_engine, shard)
+
+# Database dependency
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+class ShardSessions:
+    """Sessions on the auction shards for one request, opened on first use.
+
+    Shard 0 reuses the request's main session, so with a single shard every
+    endpoint still runs in one session and one transaction.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._sessions = {0: db}
+
+    def get(self, shard: int) -> Session:
+        session = self._sessions.get(shard)
+        if session is None:
+            session = self._sessions[shard] = shard_router.sessionmakers[shard]()
+        return session
+
+    def for_auction(self, auction_id: Optional[int]) -> Session:
+        return self.get(shard_router.shard_for(auction_id))
+
+    def all(self) -> List[Session]:
+        return [self.get(shard) for shard in range(shard_router.count)]
+
+    def close(self):
+        for shard, session in self._sessions.items():
+            if shard:
+                session.close()
+
+def get_shards(db: Session = Depends(get_db)):
+    shards = ShardSessions(db)
+    try:
+        yield shards
+    finally:
+        shards.close()
+
+def scatter(shards: ShardSessions, query) -> list:
+    """Concatenated results of ``query(session)`` on every shard."""
+    return [row for session in shards.all() for row in query(session)]
+
+def scatter_page(shards: ShardSessions, query, skip: int = 0, limit: Optional[int] = None) -> list:
+    """One page of auctions from every shard, in id order.
+
+    Each shard returns at most skip + limit rows already sorted by id and the
+    streams are merged, so deep pages stay bounded by the page end.
+    """
+    end = None if limit is None else skip + limit
+    streams = []
+    for session in shards.all():
+        rows = query(session).order_by(Auction.id)
+        streams.append(rows.limit(end) if end is not None else rows)
+    return list(itertools.islice(heapq.merge(*streams, key=lambda auction: auction.id), skip, end))
+
+def assign_ids(name: str, rows: List[dict], conn=None) -> List[dict]:
+    """Give rows bulk-inserted into a sharded table their ids (left to SQLite while unsharded)."""
+    first_id = shard_router.reserve(name, len(rows), conn)
+    if first_id is not None:
+        for offset, row in enumerate(rows):
+            row["id"] = first_id + offset
+    return rows
+
+def scatter_count(shards: ShardSessions, query) -> int:
+    return sum(query(session).count() for session in shards.all())
+
+def log_changes(conn, changes: List[tuple]):
+    """Append (entity, entity_id, user_id) rows to the change log; ``conn`` is on auction.db."""
+    if not changes:
+        return
+    now = datetime.utcnow()
+    conn.execute(insert(ChangeLogEntry.__table__), [
+        {"entity": entity, "entity_id": entity_id, "user_id": user_id, "created_at": now}
+        for entity, entity_id, user_id in changes
+    ])
+
+def commit_with_changes(session: Session, changes: List[tuple], summarize=None):
+    """Commit a session and log what it wrote.
+
+    On auction.db the entries are part of the same transaction, so they become
+    visible in commit order. On other shards they are logged right after the
+    shard commits, so a client that reads a change always finds it applied.
+    ``summarize(conn, shard_conn)`` updates the dashboard summaries in auction.db
+    at the same point, with a connection that sees the shard's writes.
+    """
+    local = session.get_bind() is engine
+    if local:
+        conn = session.connection()
+        log_changes(conn, changes)
+        if summarize:
+            summarize(conn, conn)
+    session.commit()
+    if not local:
+        with engine.begin() as conn, session.get_bind().connect() as shard_conn:
+            log_changes(conn, changes)
+            if summarize:
+                summarize(conn, shard_conn)
+
+@contextmanager
+def begin_with_changes(shard_engine):
+    """``shard_engine.begin()`` yielding (conn, changes); changes appended are logged as by commit_with_changes."""
+    changes = []
+    with shard_engine.begin() as conn:
+        yield conn, changes
+        if shard_engine is engine:
+            log_changes(conn, changes)
+    if shard_engine is not engine:
+        with engine.begin() as conn:
+            log_changes(conn, changes)
+
+@contextmanager
+def main_db_connection(conn):
+    """A connection on auction.db for writes that accompany ``conn``'s transaction.
+    
+    That is ``conn`` itself when it is on auction.db; for another shard it is
+    a transaction of its own, committed before ``conn``'s.
+    """
+    if conn.engine is engine:
+        yield conn
+    else:
+        with engine.begin() as main_conn:
+            yield main_conn
+
+def insert_notifications(conn, rows: List[dict]) -> List[dict]:
+    """Bulk-insert notifications (dicts with user_id and message) on ``conn``'s shard and give them their ids."""
+    if not rows:
+        return rows
+    with tracer.span("notifications.insert", attributes={"notifications": len(rows)}):
+        conn.execute(insert(Notification.__table__), assign_ids("notifications", rows, conn))
+    if "id" not in rows[0]:
+        # The transaction holds the write lock, so the ids SQLite gave them are contiguous
+        last_id = conn.execute(select(func.max(Notification.id))).scalar()
+        for row_id, row in enumerate(rows, start=last_id - len(rows) + 1):
+            row["id"] = row_id
+    return rows
+
+def notify(conn, rows: List[dict], changes: List[tuple]) -> List[dict]:
+    """Write the notifications whose users live on ``conn``'s shard as part of its transaction.
+    
+    Their change log entries are appended to ``changes``. The others are
+    returned, for deliver_notifications once the transaction has committed.
+    """
+    shard = shard_router.engines.index(conn.engine)
+    local = [row for row in rows if shard_router.shard_for_user(row["user_id"]) == shard]
+    insert_notifications(conn, local)
+    changes.extend(("notification", row["id"], row["user_id"]) for row in local)
+    return [row for row in rows if shard_router.shard_for_user(row["user_id"]) != shard]
+
+def deliver_notifications(rows: List[dict]):
+    """Write notifications to their users' shards, one transaction per shard.
+    
+    Used for those left over by notify: like the change log of other shards,
+    they are written right after the transaction that caused them commits.
+    That transaction stands either way, so a failure here is only logged.
+    """
+    by_shard = defaultdict(list)
+    for row in rows:
+        by_shard[shard_router.shard_for_user(row["user_id"])].append(row)
+    for shard, shard_rows in sorted(by_shard.items()):
+        try:
+            with begin_with_changes(shard_router.engines[shard]) as (conn, changes):
+                insert_notifications(conn, shard_rows)
+                changes.extend(("notification", row["id"], row["user_id"]) for row in shard_rows)
+        except Exception:
+            logger.exception("Writing %d notifications to shard %s failed", len(shard_rows), shard)
+
+def prune_change_log():
+    log = ChangeLogEntry.__table__
+    with engine.begin() as conn:
+        # The newest entry stays, so /changes can still tell a quiet period from a pruned cursor
+        conn.execute(delete(log).where(
+            log.c.created_at < datetime.utcnow() - timedelta(hours=CHANGE_LOG_RETENTION_HOURS),
+            log.c.id < select(func.max(log.c.id)).scalar_subquery()
+        ))
+
+def epoch_seconds(column):
+    """SQL expression for a DateTime column as float Unix seconds (SQLite)."""
+    return (func.julianday(column) - 2440587.5) * 86400.0
+
+def epoch_day(column):
+    """SQL expression for the Unix day number of a DateTime column (SQLite)."""
+    return cast(func.julianday(column) - 2440587.5, Integer)
+
+def to_epoch(value: datetime) -> float:
+    return (value - datetime(1970, 1, 1)).total_seconds()
+
+def day_number(value: datetime) -> int:
+    return int(to_epoch(value) // 86400)
+
+def claim_backfill(conn, name: str) -> bool:
+    """Record a one-time backfill in ``conn``'s transaction; False if it already ran.
+    
+    The insert takes SQLite's write lock, so of several workers starting at
+    once only the first gets True.
+    """
+    return bool(conn.execute(insert(Backfill.__table__).prefix_with("OR IGNORE").values(name=name)).rowcount)
+
+def backfill_user_notifications():
+    """Move notifications stored next to their auction to their user's shard, once.
+    
+    Every chunk is copied with INSERT OR IGNORE before it is deleted, so a
+    run cut short, or workers starting together, leave each notification in
+    exactly one place; the backfill is recorded only once all have moved.
+    """
+    with engine.connect() as conn:
+        if conn.execute(select(Backfill.name).where(Backfill.name == "user_notifications")).first():
+            return
+    notifications = Notification.__table__
+    for shard, shard_engine in enumerate(shard_router.engines):
+        after = 0
+        while True:
+            with shard_engine.connect() as conn:
+                rows = conn.execute(
+                    select(notifications).where(notifications.c.id > after)
+                    .order_by(notifications.c.id).limit(NOTIFICATION_MOVE_CHUNK_SIZE)
+                ).all()
+            if not rows:
+                break
+            after = rows[-1].id
+            moving = defaultdict(list)
+            for row in rows:
+                target = shard_router.shard_for_user(row.user_id)
+                if target != shard:
+                    moving[target].append(dict(row._mapping))
+            for target, target_rows in moving.items():
+                with shard_router.engines[target].begin() as target_conn:
+                    target_conn.execute(insert(notifications).prefix_with("OR IGNORE"), target_rows)
+                with shard_engine.begin() as conn:
+                    conn.execute(delete(notifications).where(notifications.c.id.in_([row["id"] for row in target_rows])))
+    with engine.begin() as conn:
+        claim_backfill(conn, "user_notifications")
+
+def take_write_lock(conn):
+    """Start a write transaction on ``conn`` without changing anything."""
+    conn.execute(update(Auction.__table__).where(literal(False)).values(status=Auction.status))
+
+def iter_raw_rows(db: Session, stmt):
+    """Yield a Core select's rows as plain tuples from a DBAPI cursor, skipping Row construction.
+    
+    The cursor is closed once the rows run out, or when the generator is
+    closed or dropped by a consumer that stops early.
+    """
+    compiled = stmt.compile(dialect=engine.dialect)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.execute(str(compiled), [compiled.params[name] for name in compiled.positiontup])
+        yield from cursor
+    finally:
+        cursor.close()
@@ -0,0 +1,32 @@
+# draw.py
+"""Seeded weighted random selection for contest draws."""
+import heapq
+import math
+import random
+
+
+def weighted_sample(entries, k, seed):
+    """Pick ``k`` distinct items from an iterable of ``(item, weight)`` pairs.
+
+    Single streaming pass with O(k) memory (Efraimidis-Spirakis A-Res): every
+    item gets the key ``log(u) / weight`` and the ``k`` largest keys win. The
+    winners are returned largest key first, which is the order a sequential
+    weighted draw without replacement would have picked them in. The same
+    entries in the same order with the same seed give the same result.
+    """
+    if k <= 0:
+        return []
+    rng = random.Random(seed)
+    heap = []
+    for index, (item, weight) in enumerate(entries):
+        # Draw for every entry so skipped ones don't shift later keys
+        u = 1.0 - rng.random()
+        if weight <= 0:
+            continue
+        key = math.log(u) / weight
+        if len(heap) < k:
+            heapq.heappush(heap, (key, index, item))
+        elif key > heap[0][0]:
+            heapq.heapreplace(heap, (key, index, item))
+    heap.sort(key=lambda entry: (-entry[0], entry[1]))
+    return [item for _, _, item in heap]
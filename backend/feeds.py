@@ -0,0 +1,156 @@
+# feeds.py
+"""In-memory ranked indexes behind the homepage auction feeds.
+
+Both indexes are kept up to date from bid and lifecycle events and answer
+top-K queries without touching the database.
+"""
+import bisect
+import heapq
+import math
+import threading
+import time
+
+# Bid-rate scores halve roughly every 7 minutes
+HOT_DECAY_SECONDS = 600.0
+# Rebase scores before exp() of the offset could overflow
+HOT_REBASE_SECONDS = HOT_DECAY_SECONDS * 500
+
+
+class EndingSoonIndex:
+    """Active auctions sorted by end time."""
+
+    def __init__(self):
+        self._keys = []  # sorted (end_time, auction_id)
+        self._by_id = {}
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def upsert(self, auction_id, end_time):
+        self.remove(auction_id)
+        key = (end_time, auction_id)
+        bisect.insort(self._keys, key)
+        self._by_id[auction_id] = key
+
+    def remove(self, auction_id):
+        key = self._by_id.pop(auction_id, None)
+        if key is not None:
+            del self._keys[bisect.bisect_left(self._keys, key)]
+
+    def ending_between(self, start, end, limit):
+        """Up to ``limit`` auction ids with start < end_time <= end, soonest first."""
+        first = bisect.bisect_right(self._keys, (start, math.inf))
+        result = []
+        for end_time, auction_id in self._keys[first:first + limit]:
+            if end_time > end:
+                break
+            result.append(auction_id)
+        return result
+
+
+class DecayingRank:
+    """Exponentially decaying event counts with top-K retrieval.
+
+    Every score is stored relative to a shared reference time, so decay never
+    has to be applied to all entries at once and relative order only changes
+    when an auction receives a new event. The max-heap holds lazily
+    invalidated entries and is compacted when stale ones pile up.
+    """
+
+    def __init__(self, decay_seconds=HOT_DECAY_SECONDS):
+        self.decay_seconds = decay_seconds
+        self._reference = time.time()
+        self._scores = {}
+        self._heap = []
+
+    def __len__(self):
+        return len(self._scores)
+
+    def record(self, key, at=None):
+        at = time.time() if at is None else at
+        if at - self._reference > HOT_REBASE_SECONDS:
+            self._rebase(at)
+        score = self._scores.get(key, 0.0) + math.exp((at - self._reference) / self.decay_seconds)
+        self._scores[key] = score
+        heapq.heappush(self._heap, (-score, key))
+        if len(self._heap) > 2 * len(self._scores) + 64:
+            self._compact()
+
+    def remove(self, key):
+        self._scores.pop(key, None)
+
+    def top(self, k, now=None):
+        """The ``k`` highest-scoring keys with their decayed rate (events per minute)."""
+        now = time.time() if now is None else now
+        decay = math.exp(-(now - self._reference) / self.decay_seconds)
+        picked = []
+        while self._heap and len(picked) < k:
+            entry = heapq.heappop(self._heap)
+            if self._scores.get(entry[1]) == -entry[0]:
+                picked.append(entry)
+        for entry in picked:
+            heapq.heappush(self._heap, entry)
+        return [(key, -neg_score * decay * 60.0 / self.decay_seconds) for neg_score, key in picked]
+
+    def _rebase(self, at):
+        factor = math.exp(-(at - self._reference) / self.decay_seconds)
+        self._reference = at
+        self._scores = {key: score * factor for key, score in self._scores.items() if score * factor > 1e-9}
+        self._compact()
+
+    def _compact(self):
+        self._heap = [(-score, key) for key, score in self._scores.items()]
+        heapq.heapify(self._heap)
+
+
+class FeedIndex:
+    """Auction cards plus the ending-soon and hot rankings over them."""
+
+    def __init__(self):
+        self.ending = EndingSoonIndex()
+        self.hot = DecayingRank()
+        self._cards = {}
+        self._lock = threading.Lock()
+
+    def reset(self, cards, bids):
+        """Replace the indexes with ``cards`` and replay recent ``(auction_id, epoch)`` bids."""
+        with self._lock:
+            self.ending = EndingSoonIndex()
+            self.hot = DecayingRank()
+            self._cards = {}
+            for card in cards:
+                self._add(card)
+            for auction_id, at in sorted(bids, key=lambda bid: bid[1]):
+                if auction_id in self._cards:
+                    self.hot.record(auction_id, at)
+
+    def add(self, card):
+        with self._lock:
+            self._add(card)
+
+    def remove(self, auction_id):
+        with self._lock:
+            self._cards.pop(auction_id, None)
+            self.ending.remove(auction_id)
+            self.hot.remove(auction_id)
+
+    def record_bid(self, auction_id, amount, at=None):
+        with self._lock:
+            card = self._cards.get(auction_id)
+            if card is None:
+                return
+            card["current_highest_bid"] = max(card["current_highest_bid"], amount)
+            self.hot.record(auction_id, at)
+
+    def ending_soon(self, now, until, limit):
+        with self._lock:
+            ids = self.ending.ending_between(now, until, limit)
+            return [dict(self._cards[auction_id]) for auction_id in ids]
+
+    def hottest(self, limit):
+        with self._lock:
+            return [dict(self._cards[auction_id], bids_per_minute=rate) for auction_id, rate in self.hot.top(limit)]
+
+    def _add(self, card):
+        self._cards[card["id"]] = card
+        self.ending.upsert(card["id"], card["end_time"])
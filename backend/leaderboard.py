@@ -0,0 +1,156 @@
+# leaderboard.py
+"""Incrementally maintained leaderboards over rolling day windows."""
+import bisect
+import threading
+from collections import defaultdict
+
+# Sublists are split once they grow past twice this size
+SUBLIST_SIZE = 512
+# Scores at or below this are float residue from expired buckets
+SCORE_EPSILON = 1e-9
+
+
+class RankedSet:
+    """Members ordered by descending score, with top-K and rank lookups.
+
+    Keys ``(-score, member)`` live in sorted sublists of bounded length, so an
+    update shifts at most a sublist instead of the whole ranking, and a rank is
+    a bisect plus a sum over sublist lengths.
+    """
+
+    def __init__(self):
+        self._scores = {}
+        self._lists = []
+        self._maxes = []
+
+    def __len__(self):
+        return len(self._scores)
+
+    def score(self, member):
+        return self._scores.get(member)
+
+    def add(self, member, delta):
+        old = self._scores.pop(member, None)
+        if old is not None:
+            self._remove((-old, member))
+        new = (old or 0.0) + delta
+        if new > SCORE_EPSILON:
+            self._scores[member] = new
+            self._insert((-new, member))
+
+    def top(self, k):
+        """The ``k`` highest ``(member, score)`` pairs, ties broken by member."""
+        result = []
+        for sub in self._lists:
+            for neg_score, member in sub[:k - len(result)]:
+                result.append((member, -neg_score))
+            if len(result) >= k:
+                break
+        return result
+
+    def rank(self, member):
+        """1-based position of ``member``, or None if it has no score."""
+        score = self._scores.get(member)
+        if score is None:
+            return None
+        key = (-score, member)
+        index = bisect.bisect_left(self._maxes, key)
+        return sum(len(sub) for sub in self._lists[:index]) + bisect.bisect_left(self._lists[index], key) + 1
+
+    def _insert(self, key):
+        if not self._lists:
+            self._lists.append([key])
+            self._maxes.append(key)
+            return
+        index = bisect.bisect_left(self._maxes, key)
+        if index == len(self._maxes):
+            index -= 1
+            self._lists[index].append(key)
+            self._maxes[index] = key
+        else:
+            bisect.insort(self._lists[index], key)
+        sub = self._lists[index]
+        if len(sub) > 2 * SUBLIST_SIZE:
+            upper = sub[SUBLIST_SIZE:]
+            del sub[SUBLIST_SIZE:]
+            self._lists.insert(index + 1, upper)
+            self._maxes[index] = sub[-1]
+            self._maxes.insert(index + 1, upper[-1])
+
+    def _remove(self, key):
+        index = bisect.bisect_left(self._maxes, key)
+        sub = self._lists[index]
+        del sub[bisect.bisect_left(sub, key)]
+        if sub:
+            self._maxes[index] = sub[-1]
+        else:
+            del self._lists[index]
+            del self._maxes[index]
+
+
+class Leaderboard:
+    """One ranking per window; windowed rankings keep per-day buckets.
+
+    ``windows`` maps a window name to its length in days, or None for all
+    time. A bucket is subtracted from its ranking lazily, on the first update
+    or query after its day leaves the window.
+    """
+
+    def __init__(self, windows):
+        self.windows = dict(windows)
+        self._lock = threading.Lock()
+        self._reset()
+
+    def load(self, totals, buckets, today):
+        """Replace all rankings: ``totals`` are all-time ``(member, amount)``
+        pairs and ``buckets`` ``(member, day, amount)`` rows for the windows."""
+        with self._lock:
+            self._reset()
+            for name, days in self.windows.items():
+                if days is None:
+                    for member, amount in totals:
+                        self._sets[name].add(member, amount)
+            for member, day, amount in buckets:
+                self._record_windows(member, amount, day, today)
+
+    def record(self, member, amount, day, today):
+        with self._lock:
+            for name, days in self.windows.items():
+                if days is None:
+                    self._sets[name].add(member, amount)
+            self._record_windows(member, amount, day, today)
+
+    def top(self, window, k, today):
+        with self._lock:
+            self._expire(window, today)
+            return self._sets[window].top(k), len(self._sets[window])
+
+    def rank(self, window, member, today):
+        """``(rank, score, size)`` of a member in a window; rank is None when unranked."""
+        with self._lock:
+            self._expire(window, today)
+            ranking = self._sets[window]
+            return ranking.rank(member), ranking.score(member) or 0.0, len(ranking)
+
+    def _reset(self):
+        self._sets = {name: RankedSet() for name in self.windows}
+        self._days = {name: defaultdict(lambda: defaultdict(float)) for name, days in self.windows.items() if days}
+
+    def _record_windows(self, member, amount, day, today):
+        for name, days in self.windows.items():
+            if days is None:
+                continue
+            self._expire(name, today)
+            if day <= today - days:
+                continue
+            self._days[name][day][member] += amount
+            self._sets[name].add(member, amount)
+
+    def _expire(self, name, today):
+        days = self.windows[name]
+        if days is None:
+            return
+        buckets = self._days[name]
+        for day in [day for day in buckets if day <= today - days]:
+            for member, amount in buckets.pop(day).items():
+                self._sets[name].add(member, -amount)
@@ -0,0 +1,54 @@
+# merkle.py
+"""Hash chaining and Merkle trees for the bid audit log."""
+import hashlib
+
+GENESIS_HASH = "0" * 64
+
+
+def chain_hash(prev_hash, payload):
+    """Hash of an audit entry: links the entry's payload to its predecessor."""
+    return hashlib.sha256((prev_hash + payload).encode("utf-8")).hexdigest()
+
+
+def _leaf(entry_hash):
+    return hashlib.sha256(b"\x00" + bytes.fromhex(entry_hash)).digest()
+
+
+def _node(left, right):
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def _levels(entry_hashes):
+    level = [_leaf(h) for h in entry_hashes]
+    levels = [level]
+    while len(level) > 1:
+        # An odd node at the end is carried up unchanged
+        level = [_node(level[i], level[i + 1]) if i + 1 < len(level) else level[i]
+                 for i in range(0, len(level), 2)]
+        levels.append(level)
+    return levels
+
+
+def merkle_root(entry_hashes):
+    if not entry_hashes:
+        return None
+    return _levels(entry_hashes)[-1][0].hex()
+
+
+def merkle_proof(entry_hashes, index):
+    """Sibling path proving entry_hashes[index] is included under merkle_root."""
+    proof = []
+    for level in _levels(entry_hashes)[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append({"hash": level[sibling].hex(), "position": "left" if sibling < index else "right"})
+        index //= 2
+    return proof
+
+
+def verify_proof(entry_hash, proof, root):
+    node = _leaf(entry_hash)
+    for step in proof:
+        sibling = bytes.fromhex(step["hash"])
+        node = _node(sibling, node) if step["position"] == "left" else _node(node, sibling)
+    return node.hex() == root
@@ -0,0 +1,396 @@
+# models.py
+"""Database models.
+
+Tables in SHARDED_TABLES are created in every auction shard, partitioned by
+auction id; every other table lives in auction.db only.
+"""
+import enum
+
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, Enum as SQLEnum, Index
+from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy.sql import func
+
+Base = declarative_base()
+
+# Enums
+class UserType(str, enum.Enum):
+    BUYER = "buyer"
+    SELLER = "seller"
+    ADMIN = "admin"
+
+class AuctionStatus(str, enum.Enum):
+    CREATED = "created"
+    ACTIVE = "active"
+    ENDED = "ended"
+    WINNER_SELECTED = "winner_selected"
+
+# Database Models
+class User(Base):
+    __tablename__ = "users"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    email = Column(String, unique=True, index=True)
+    hashed_password = Column(String)
+    user_type = Column(SQLEnum(UserType))
+    created_at = Column(DateTime, default=func.now())
+    is_active = Column(Boolean, default=True)
+    
+    # Relationships
+    auctions_created = relationship("Auction", back_populates="seller", foreign_keys="Auction.seller_id")
+    bids = relationship("Bid", back_populates="bidder")
+    won_auctions = relationship("Auction", back_populates="winner", foreign_keys="Auction.winner_id")
+
+class Auction(Base):
+    __tablename__ = "auctions"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    product_name = Column(String, index=True)
+    description = Column(Text)
+    base_price = Column(Float)
+    current_highest_bid = Column(Float, default=0)
+    start_time = Column(DateTime)
+    end_time = Column(DateTime)
+    status = Column(SQLEnum(AuctionStatus), default=AuctionStatus.CREATED)
+    image_url = Column(String, nullable=True)
+    created_at = Column(DateTime, default=func.now())
+    
+    # Foreign keys
+    seller_id = Column(Integer, ForeignKey("users.id"))
+    winner_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    
+    # Relationships
+    seller = relationship("User", back_populates="auctions_created", foreign_keys=[seller_id])
+    winner = relationship("User", back_populates="won_auctions", foreign_keys=[winner_id])
+    bids = relationship("Bid", back_populates="auction")
+    
+    # The lifecycle sweep looks for due auctions by status and start/end time
+    __table_args__ = (
+        Index("ix_auctions_status_start", "status", "start_time"),
+        Index("ix_auctions_status_end", "status", "end_time"),
+    )
+
+class Bid(Base):
+    __tablename__ = "bids"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    amount = Column(Float)
+    bid_time = Column(DateTime, default=func.now())
+    
+    # Foreign keys
+    bidder_id = Column(Integer, ForeignKey("users.id"))
+    auction_id = Column(Integer, ForeignKey("auctions.id"))
+    
+    # Relationships
+    bidder = relationship("User", back_populates="bids")
+    auction = relationship("Auction", back_populates="bids")
+    
+    # Winner selection ranks bids per auction by amount
+    __table_args__ = (Index("ix_bids_auction_amount", "auction_id", "amount"),)
+
+class Notification(Base):
+    __tablename__ = "notifications"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"))
+    message = Column(Text)
+    is_read = Column(Boolean, default=False)
+    created_at = Column(DateTime, default=func.now())
+
+class ContestStatus(str, enum.Enum):
+    OPEN = "open"
+    ANNOUNCED = "announced"
+
+class Contest(Base):
+    __tablename__ = "contests"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String)
+    description = Column(Text, nullable=True)
+    status = Column(SQLEnum(ContestStatus), default=ContestStatus.OPEN)
+    seed = Column(String, nullable=True)
+    created_at = Column(DateTime, default=func.now())
+    announced_at = Column(DateTime, nullable=True)
+
+class ContestEntry(Base):
+    __tablename__ = "contest_entries"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    contest_id = Column(Integer, ForeignKey("contests.id"))
+    user_id = Column(Integer, ForeignKey("users.id"))
+    seat_number = Column(Integer)
+    weight = Column(Float, default=1.0)
+    created_at = Column(DateTime, default=func.now())
+    
+    __table_args__ = (Index("ix_contest_entries_seat", "contest_id", "seat_number", unique=True),)
+
+class ContestPrize(Base):
+    __tablename__ = "contest_prizes"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    contest_id = Column(Integer, ForeignKey("contests.id"), index=True)
+    prize_rank = Column(Integer)
+    prize_amount = Column(Float)
+    number_of_winners = Column(Integer)
+    prize_description = Column(String, nullable=True)
+    winners_seat_numbers = Column(Text, nullable=True)  # JSON list of guaranteed seats
+
+class ContestWinner(Base):
+    __tablename__ = "contest_winners"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    contest_id = Column(Integer, ForeignKey("contests.id"), index=True)
+    prize_rank = Column(Integer)
+    prize_amount = Column(Float)
+    entry_id = Column(Integer, ForeignKey("contest_entries.id"))
+    user_id = Column(Integer, ForeignKey("users.id"))
+    seat_number = Column(Integer)
+
+class LedgerEntryType(str, enum.Enum):
+    SETTLEMENT_CREDIT = "settlement_credit"
+    PRIZE_CREDIT = "prize_credit"
+    FEE = "fee"
+    WITHDRAWAL = "withdrawal"
+    WITHDRAWAL_REVERSAL = "withdrawal_reversal"
+    SETTLEMENT_REVERSAL = "settlement_reversal"
+
+class WithdrawalStatus(str, enum.Enum):
+    PENDING = "pending"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    REJECTED = "rejected"
+
+class LedgerEntry(Base):
+    """Append-only wallet movements; a balance is the sum of a user's amounts."""
+    __tablename__ = "ledger_entries"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"))
+    entry_type = Column(SQLEnum(LedgerEntryType))
+    amount = Column(Float)  # positive credits, negative debits
+    reference = Column(String)  # e.g. "auction:12", "withdrawal:3"
+    created_at = Column(DateTime, default=func.now())
+    
+    __table_args__ = (
+        Index("ix_ledger_entries_user", "user_id", "id"),
+        # The same auction/prize/withdrawal never posts the same entry twice
+        Index("ix_ledger_entries_reference", "entry_type", "reference", "user_id", unique=True),
+    )
+
+class BalanceSnapshot(Base):
+    __tablename__ = "balance_snapshots"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    balance = Column(Float)
+    last_entry_id = Column(Integer)  # ledger entries after this id are not included
+    taken_at = Column(DateTime)
+
+class Withdrawal(Base):
+    __tablename__ = "withdrawals"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    amount = Column(Float)
+    status = Column(SQLEnum(WithdrawalStatus), default=WithdrawalStatus.PENDING, index=True)
+    bank_name = Column(String, nullable=True)
+    account_number = Column(String, nullable=True)
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now())
+
+class BidAuditEntry(Base):
+    """Hash-chained record of every accepted bid.
+    
+    Rows are appended with the bid; entry_hash and window_id are filled in
+    later by the background anchoring job.
+    """
+    __tablename__ = "bid_audit_log"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    bid_id = Column(Integer, ForeignKey("bids.id"), unique=True)
+    auction_id = Column(Integer, ForeignKey("auctions.id"))
+    payload = Column(Text)  # canonical JSON of the bid
+    prev_hash = Column(String, nullable=True)
+    entry_hash = Column(String, nullable=True)
+    window_id = Column(Integer, ForeignKey("audit_windows.id"), nullable=True, index=True)
+
+class AuditWindow(Base):
+    __tablename__ = "audit_windows"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    first_entry_id = Column(Integer)
+    last_entry_id = Column(Integer)
+    leaf_count = Column(Integer)
+    merkle_root = Column(String)
+    created_at = Column(DateTime, default=func.now())
+
+class WorkerLease(Base):
+    __tablename__ = "worker_leases"
+    
+    name = Column(String, primary_key=True)
+    holder = Column(String)
+    expires_at = Column(DateTime)
+
+class EventLogEntry(Base):
+    __tablename__ = "event_log"
+    # Workers poll by id, so an id must never be handed out again
+    __table_args__ = {"sqlite_autoincrement": True}
+    
+    id = Column(Integer, primary_key=True, index=True)
+    topic = Column(String)
+    payload = Column(Text)
+    origin = Column(String)
+    created_at = Column(DateTime, default=func.now(), index=True)
+
+class IdempotencyRecord(Base):
+    __tablename__ = "idempotency_keys"
+    
+    scope = Column(String, primary_key=True)
+    key = Column(String, primary_key=True)
+    request_hash = Column(String)
+    response = Column(Text, nullable=True)  # NULL while the first request is in flight
+    locked_until = Column(DateTime)
+    expires_at = Column(DateTime, index=True)
+
+class SettlementRun(Base):
+    __tablename__ = "settlement_runs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    started_at = Column(DateTime)
+    heartbeat_at = Column(DateTime)
+    finished_at = Column(DateTime, nullable=True)
+    cutoff = Column(DateTime)
+    chunks = Column(Integer, default=0)
+    settled = Column(Integer, default=0)
+    winners = Column(Integer, default=0)
+    max_lag_seconds = Column(Float, default=0)
+
+class ShardLayout(Base):
+    """Shard count in effect for auction ids from first_auction_id onwards."""
+    __tablename__ = "shard_layouts"
+
+    first_auction_id = Column(Integer, primary_key=True)
+    shard_count = Column(Integer)
+    created_at = Column(DateTime, default=func.now())
+
+class UserShardLayout(Base):
+    """Shard count in effect for the notifications of user ids from first_user_id onwards."""
+    __tablename__ = "user_shard_layouts"
+
+    first_user_id = Column(Integer, primary_key=True)
+    shard_count = Column(Integer)
+    created_at = Column(DateTime, default=func.now())
+
+class IdSequence(Base):
+    """Next free id of a table whose rows are spread over several shards."""
+    __tablename__ = "id_sequences"
+
+    name = Column(String, primary_key=True)
+    next_id = Column(Integer)
+
+class LeaderboardRollup(Base):
+    """A user's daily total on one leaderboard: spend, sales volume or bids placed."""
+    __tablename__ = "leaderboard_rollups"
+
+    board = Column(String, primary_key=True)
+    user_id = Column(Integer, primary_key=True)
+    day = Column(Integer, primary_key=True)  # days since the Unix epoch
+    amount = Column(Float)
+
+    __table_args__ = (Index("ix_leaderboard_rollups_day", "board", "day"),)
+
+class ChangeLogEntry(Base):
+    """An auction, user or notification that was written; ids are the /changes cursor."""
+    __tablename__ = "change_log"
+
+    id = Column(Integer, primary_key=True)
+    entity = Column(String)
+    entity_id = Column(Integer)
+    user_id = Column(Integer, nullable=True)  # owner of a notification
+    created_at = Column(DateTime, default=func.now(), index=True)
+
+    # Ids never go back, even once pruning has emptied the table
+    __table_args__ = {"sqlite_autoincrement": True}
+
+class UserSummary(Base):
+    """Dashboard totals of one user that the summary rows below can't answer."""
+    __tablename__ = "user_summaries"
+
+    user_id = Column(Integer, primary_key=True)
+    total_bids = Column(Integer, default=0)
+    total_auctions = Column(Integer, default=0)  # in any status, not yet started included
+
+class AuctionSummary(Base):
+    """An auction as the buyer and seller dashboards show it, from the time it starts."""
+    __tablename__ = "auction_summaries"
+
+    auction_id = Column(Integer, primary_key=True)
+    seller_id = Column(Integer)
+    winner_id = Column(Integer, nullable=True)
+    status = Column(SQLEnum(AuctionStatus))
+    product_name = Column(String)
+    description = Column(Text, nullable=True)
+    image_url = Column(String, nullable=True)
+    base_price = Column(Float)
+    current_highest_bid = Column(Float)
+    end_time = Column(DateTime)
+    total_bids = Column(Integer, default=0)
+
+    __table_args__ = (
+        Index("ix_auction_summaries_seller", "seller_id", "status"),
+        Index("ix_auction_summaries_winner", "winner_id"),
+    )
+
+class ActiveBidSummary(Base):
+    """A bid on an auction that is still active, listed on its bidder's dashboard."""
+    __tablename__ = "active_bid_summaries"
+
+    bidder_id = Column(Integer, primary_key=True)
+    bid_id = Column(Integer, primary_key=True)
+    auction_id = Column(Integer, index=True)
+    amount = Column(Float)
+
+class RebuiltSummary(Base):
+    """A bid or auction a dashboard rebuild counted while its own summary may still be on the way."""
+    __tablename__ = "rebuilt_summaries"
+
+    entity = Column(String, primary_key=True)  # "bid" or "auction"
+    entity_id = Column(Integer, primary_key=True)
+
+class Backfill(Base):
+    """A one-time data backfill, recorded in the transaction that ran it."""
+    __tablename__ = "backfills"
+
+    name = Column(String, primary_key=True)
+    completed_at = Column(DateTime, default=func.now())
+
+class HomeSlider(Base):
+    """A homepage slider image; served from the site config snapshot."""
+    __tablename__ = "home_sliders"
+
+    id = Column(Integer, primary_key=True)
+    title = Column(String)
+    image_url = Column(String)
+    link_url = Column(String, nullable=True)
+    description = Column(Text, nullable=True)
+    order = Column(Integer, default=0)
+    is_active = Column(Boolean, default=True)
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now())
+
+class SiteSetting(Base):
+    """A site-wide setting such as the contact email; "version" counts site config edits."""
+    __tablename__ = "site_settings"
+
+    key = Column(String, primary_key=True)
+    value = Column(String, nullable=True)
+
+SHARDED_TABLES = [
+    Auction.__table__, Bid.__table__, Notification.__table__,
+    AuditWindow.__table__, BidAuditEntry.__table__, SettlementRun.__table__, IdempotencyRecord.__table__
+]
+
+def create_schema(bind, tables=None):
+    Base.metadata.create_all(bind=bind, tables=tables)
+    # create_all skips indexes on tables that already exist
+    for table in tables or Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
@@ -0,0 +1,208 @@
+# profiler.py
+"""Sampling profiler for a live worker process.
+
+Stacks of every Python thread are read with ``sys._current_frames()`` at a
+fixed interval, so the profiled code runs unmodified and the cost is paid by
+the sampling thread alone. Samples are aggregated per unique stack and can be
+rendered as collapsed stacks (flamegraph.pl, speedscope, inferno) or as a
+speedscope JSON document.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+# Innermost frames of threads that are blocked rather than running
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("socket.py", "accept"),
+    # An on-demand capture sleeping between its samples
+    ("profiler.py", "capture"),
+}
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+
+class Profile:
+    """Sample counts per stack; stacks are tuples of frame labels, outermost first."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.counts = Counter()
+
+    @property
+    def samples(self):
+        return sum(self.counts.values())
+
+    def add(self, stack, count=1):
+        self.counts[stack] += count
+
+    def merge(self, other):
+        self.counts.update(other.counts)
+        return self
+
+    def collapsed(self):
+        """One ``frame;frame;frame count`` line per stack, heaviest first."""
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in self.counts.most_common())
+
+    def speedscope(self, name):
+        frames = []
+        index = {}
+        samples = []
+        weights = []
+        for stack, count in self.counts.most_common():
+            sample = []
+            for label in stack:
+                if label not in index:
+                    index[label] = len(frames)
+                    frames.append({"name": label})
+                sample.append(index[label])
+            samples.append(sample)
+            weights.append(round(count * self.interval * 1000, 3))
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": name,
+            "exporter": "auction-profiler",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": round(sum(weights), 3),
+                "samples": samples,
+                "weights": weights
+            }]
+        }
+
+
+_labels = {}
+
+
+def frame_label(code):
+    label = _labels.get(code)
+    if label is None:
+        label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+        _labels[code] = label
+    return label
+
+
+def is_idle(frame):
+    code = frame.f_code
+    return (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES
+
+
+def walk(frame, markers=None):
+    """Labels of a frame's stack, outermost first, and the first marker value found on it."""
+    codes = []
+    marker = None
+    while frame is not None:
+        code = frame.f_code
+        codes.append(code)
+        if markers and marker is None:
+            marker = markers.get(code)
+        frame = frame.f_back
+    return tuple(frame_label(code) for code in reversed(codes)), marker
+
+
+def running_threads(skip, include_idle):
+    for thread_id, frame in sys._current_frames().items():
+        if thread_id in skip or (not include_idle and is_idle(frame)):
+            continue
+        yield thread_id, frame
+
+
+def capture(seconds, interval, include_idle=False):
+    """Sample all other threads from the calling thread for ``seconds``."""
+    profile = Profile(interval)
+    skip = {threading.get_ident()}
+    deadline = time.monotonic() + seconds
+    next_sample = time.monotonic()
+    while next_sample < deadline:
+        for _, frame in running_threads(skip, include_idle):
+            profile.add(walk(frame)[0])
+        next_sample += interval
+        delay = next_sample - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            # Fell behind; skip missed ticks rather than sampling in a burst
+            next_sample = time.monotonic()
+    return profile
+
+
+class RouteProfiler:
+    """Continuous low-rate sampling, aggregated per route into a ring of time slots.
+
+    ``markers`` maps endpoint code objects to route names: a sample is charged
+    to the first route whose endpoint is on the thread's stack, and to the
+    thread's name otherwise (background jobs, the event loop).
+    """
+
+    def __init__(self, interval, slot_seconds, slots, markers=None):
+        self.interval = interval
+        self.slot_seconds = slot_seconds
+        self.markers = markers or {}
+        self._slots = deque(maxlen=slots)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="route-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def routes(self, since):
+        """Sample counts per route over slots starting at or after ``since`` (epoch seconds)."""
+        totals = Counter()
+        with self._lock:
+            for slot_start, profiles in self._slots:
+                if slot_start >= since:
+                    totals.update({route: profile.samples for route, profile in profiles.items()})
+        return totals
+
+    def profile(self, route, since):
+        merged = Profile(self.interval)
+        with self._lock:
+            for slot_start, profiles in self._slots:
+                if slot_start >= since and route in profiles:
+                    merged.merge(profiles[route])
+        return merged
+
+    def _run(self):
+        skip = {threading.get_ident()}
+        names = {}
+        while not self._stop.wait(self.interval):
+            now = time.time()
+            slot_start = now - now % self.slot_seconds
+            samples = []
+            for thread_id, frame in running_threads(skip, False):
+                stack, route = walk(frame, self.markers)
+                if route is None:
+                    if thread_id not in names:
+                        names = {thread.ident: f"thread:{thread.name}" for thread in threading.enumerate()}
+                    route = names.get(thread_id, f"thread:{thread_id}")
+                samples.append((route, stack))
+            with self._lock:
+                if not self._slots or self._slots[-1][0] != slot_start:
+                    self._slots.append((slot_start, {}))
+                profiles = self._slots[-1][1]
+                for route, stack in samples:
+                    profile = profiles.get(route)
+                    if profile is None:
+                        profile = profiles[route] = Profile(self.interval)
+                    profile.add(stack)
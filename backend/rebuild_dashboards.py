@@ -0,0 +1,31 @@
+# rebuild_dashboards.py
+"""Recompute the buyer and seller dashboard summaries from auctions and bids.
+
+Run from the backend directory with the same AUCTION_* settings as the API,
+e.g. ``AUCTION_SHARDS=4 python rebuild_dashboards.py``. The API keeps the
+summaries current by itself and builds them on first start; this repairs them
+after auctions or bids were written behind its back.
+"""
+import time
+
+import database
+from models import UserSummary, AuctionSummary, ActiveBidSummary
+from services.dashboards import rebuild_dashboards
+from sqlalchemy import func, select
+
+
+def main() -> None:
+    database.init_database()
+    started = time.perf_counter()
+    rebuild_dashboards()
+    elapsed = time.perf_counter() - started
+    with database.engine.connect() as conn:
+        users, auctions, bids = (
+            conn.execute(select(func.count()).select_from(table)).scalar()
+            for table in (UserSummary, AuctionSummary, ActiveBidSummary)
+        )
+    print(f"Rebuilt dashboards in {elapsed:.2f}s: {users} users, {auctions} auctions, {bids} active bids")
+
+
+if __name__ == "__main__":
+    main()
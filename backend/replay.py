@@ -0,0 +1,243 @@
+# replay.py
+"""Re-drive captured traffic (see capture.py) and compare builds.
+
+    python replay.py run capture.jsonl --app-dir ../build-a/backend --speed 10 --out a.jsonl
+    python replay.py run capture.jsonl --app-dir ../build-b/backend --speed 10 --out b.jsonl
+    python replay.py diff a.jsonl b.jsonl
+
+``run`` seeds an empty database in a temporary directory with the build's
+own seed.py, serves that build in-process and sends every captured request at
+its original offset divided by ``--speed`` (0 sends them back to back), from a
+thread pool so requests that overlapped in production overlap again
+(``--workers 1`` keeps them strictly in capture order instead). With
+``--url`` it targets an already running, freshly seeded server instead.
+Requests captured with a bearer token are sent with a new token for the same
+user id. ``diff`` reports per-route latency percentiles, errors and status
+codes that changed between two runs.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import jwt
+
+TOKEN_LIFETIME_HOURS = 12
+
+
+def load_capture(path, limit=None):
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    records.sort(key=lambda record: record["t"])
+    return records[:limit] if limit else records
+
+
+def load_results(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+@contextlib.contextmanager
+def seeded_app(app_dir):
+    """A test client for the build in ``app_dir``, on a database seeded by its seed.py."""
+    sys.path.insert(0, os.path.abspath(app_dir))
+    os.chdir(tempfile.mkdtemp(prefix="auction-replay-"))
+    with contextlib.redirect_stdout(io.StringIO()):
+        import seed
+        seed.main()
+    import main
+    from fastapi.testclient import TestClient
+    try:
+        from services.auth import SECRET_KEY, ALGORITHM
+    except ImportError:  # builds from before main.py was split up
+        SECRET_KEY, ALGORITHM = main.SECRET_KEY, main.ALGORITHM
+    with TestClient(main.app, raise_server_exceptions=False) as client:
+        yield client, SECRET_KEY, ALGORITHM
+
+
+@contextlib.contextmanager
+def remote_app(url, secret, algorithm):
+    import httpx
+    with httpx.Client(base_url=url, timeout=60) as client:
+        yield client, secret, algorithm
+
+
+def replayable(record):
+    # Multipart uploads and oversized bodies were captured by size only
+    return not record.get("bs") or "b" in record
+
+
+class Replayer:
+    def __init__(self, client, secret, algorithm):
+        self.client = client
+        self.secret = secret
+        self.algorithm = algorithm
+        self._tokens = {}
+        self._lock = threading.Lock()
+
+    def token_for(self, user_id):
+        with self._lock:
+            token = self._tokens.get(user_id)
+            if token is None:
+                token = self._tokens[user_id] = jwt.encode(
+                    {"sub": str(user_id), "exp": datetime.utcnow() + timedelta(hours=TOKEN_LIFETIME_HOURS)},
+                    self.secret, algorithm=self.algorithm
+                )
+            return token
+
+    def send(self, index, record, lag_ms):
+        headers = {}
+        if record.get("u") is not None:
+            headers["Authorization"] = f"Bearer {self.token_for(record['u'])}"
+        url = record["p"] + (f"?{record['q']}" if record.get("q") else "")
+        result = {
+            "i": index,
+            "m": record["m"],
+            "r": record.get("r") or record["p"],
+            "cs": record["s"],
+            "lag": round(lag_ms, 3)
+        }
+        started = time.perf_counter()
+        try:
+            if "b" in record:
+                response = self.client.request(record["m"], url, json=record["b"], headers=headers)
+            else:
+                response = self.client.request(record["m"], url, headers=headers)
+            result["s"] = response.status_code
+            if response.status_code >= 500:
+                result["e"] = response.text[:500]
+        except Exception as exc:
+            result["s"] = None
+            result["e"] = repr(exc)[:500]
+        result["d"] = round((time.perf_counter() - started) * 1000, 3)
+        return result
+
+    def run(self, records, speed, workers):
+        """Send ``records`` on their captured schedule; results in capture order."""
+        results = [None] * len(records)
+        first = records[0]["t"] if records else 0
+        start = time.perf_counter()
+
+        def run_one(index, record, due):
+            results[index] = self.send(index, record, (time.perf_counter() - start - due) * 1000)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for index, record in enumerate(records):
+                if not replayable(record):
+                    results[index] = {"i": index, "m": record["m"], "r": record.get("r") or record["p"], "skipped": True}
+                    continue
+                due = (record["t"] - first) / speed if speed else 0.0
+                delay = due - (time.perf_counter() - start)
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(run_one, index, record, due)
+        return results
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def is_error(result):
+    return result.get("s") is None or result["s"] >= 500
+
+
+def summarize(results):
+    routes = defaultdict(lambda: {"latencies": [], "errors": 0})
+    for result in results:
+        if result.get("skipped"):
+            continue
+        route = routes[f"{result['m']} {result['r']}"]
+        route["latencies"].append(result["d"])
+        route["errors"] += is_error(result)
+    return routes
+
+
+def print_run(results):
+    sent = [result for result in results if not result.get("skipped")]
+    latencies = [result["d"] for result in sent]
+    lags = [result["lag"] for result in sent]
+    print(f"{len(sent)} requests sent, {len(results) - len(sent)} skipped, "
+          f"{sum(is_error(result) for result in sent)} errors, "
+          f"{sum(result['s'] != result['cs'] for result in sent)} statuses differ from the capture")
+    if latencies:
+        print(f"latency ms p50={percentile(latencies, 0.5):.2f} p95={percentile(latencies, 0.95):.2f} "
+              f"p99={percentile(latencies, 0.99):.2f}; schedule lag ms p99={percentile(lags, 0.99):.2f}")
+
+
+def diff(base, other):
+    """Per-route comparison of two runs of the same capture."""
+    base_routes = summarize(base)
+    other_routes = summarize(other)
+    print(f"{'route':<48}{'n':>7}{'p50 a':>9}{'p50 b':>9}{'p95 a':>9}{'p95 b':>9}{'p95 b/a':>9}{'err a':>7}{'err b':>7}")
+    for name in sorted(set(base_routes) | set(other_routes), key=lambda name: -len(base_routes[name]["latencies"])):
+        a = base_routes[name]
+        b = other_routes[name]
+        p95_a = percentile(a["latencies"], 0.95)
+        p95_b = percentile(b["latencies"], 0.95)
+        ratio = f"{p95_b / p95_a:.2f}" if p95_a and p95_b else "-"
+        print(f"{name[:47]:<48}{max(len(a['latencies']), len(b['latencies'])):>7}"
+              f"{percentile(a['latencies'], 0.5) or 0:>9.2f}{percentile(b['latencies'], 0.5) or 0:>9.2f}"
+              f"{p95_a or 0:>9.2f}{p95_b or 0:>9.2f}{ratio:>9}{a['errors']:>7}{b['errors']:>7}")
+
+    other_by_index = {result["i"]: result for result in other}
+    changed = [
+        (result, other_by_index[result["i"]]) for result in base
+        if not result.get("skipped") and result["i"] in other_by_index
+        and other_by_index[result["i"]].get("s") != result.get("s")
+    ]
+    print(f"\n{len(changed)} requests changed status")
+    for a, b in changed[:20]:
+        print(f"  #{a['i']} {a['m']} {a['r']}: {a.get('s')} -> {b.get('s')} {b.get('e', '')[:120]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="replay a capture and record the results")
+    run.add_argument("capture")
+    run.add_argument("--out", required=True, help="results file (JSON lines)")
+    run.add_argument("--app-dir", default=os.path.dirname(os.path.abspath(__file__)),
+                     help="backend directory of the build to replay against (default: this one)")
+    run.add_argument("--url", help="replay against a running server instead of an in-process build")
+    run.add_argument("--jwt-secret", help="token signing key of the server at --url")
+    run.add_argument("--speed", type=float, default=1.0, help="time acceleration; 0 sends requests back to back")
+    run.add_argument("--workers", type=int, default=16)
+    run.add_argument("--limit", type=int)
+    compare = commands.add_parser("diff", help="compare two result files")
+    compare.add_argument("base")
+    compare.add_argument("other")
+    args = parser.parse_args()
+
+    if args.command == "diff":
+        diff(load_results(args.base), load_results(args.other))
+        return
+    records = load_capture(args.capture, args.limit)
+    out = os.path.abspath(args.out)
+    if args.url:
+        if not args.jwt_secret:
+            parser.error("--url needs --jwt-secret to sign tokens for captured users")
+        target = remote_app(args.url, args.jwt_secret, "HS256")
+    else:
+        target = seeded_app(args.app_dir)
+    with target as (client, secret, algorithm):
+        results = Replayer(client, secret, algorithm).run(records, args.speed, args.workers)
+    with open(out, "w", encoding="utf-8") as f:
+        for result in results:
+            f.write(json.dumps(result, separators=(",", ":")) + "\n")
+    print_run(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# responses.py
+"""Query parameter parsing and response encoding shared by the routers."""
+from fastapi import HTTPException, Request, Response
+from typing import Optional, List
+
+import serialization
+
+# Auction list responses
+RESPONSE_COMPRESS_MIN_BYTES = 1024
+
+# Batch lookups
+BATCH_MAX_IDS = 500
+
+def projection(fields: Optional[str], allowed) -> List[str]:
+    """Column names for a comma-separated ``fields=`` parameter; id is always included."""
+    if not fields:
+        return list(allowed)
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}")
+    return ["id"] + [name for name in dict.fromkeys(names) if name != "id"]
+
+def encoded_response(request: Request, content) -> Response:
+    """JSON (or MessagePack when the Accept header asks for it), compressed when large."""
+    body, media_type = serialization.encode(content, request.headers.get("accept", ""))
+    body, content_encoding = serialization.compress(
+        body, request.headers.get("accept-encoding", ""), RESPONSE_COMPRESS_MIN_BYTES
+    )
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if content_encoding:
+        headers["Content-Encoding"] = content_encoding
+    return Response(content=body, media_type=media_type, headers=headers)
+
+def parse_ids(ids: str) -> List[int]:
+    try:
+        values = list(dict.fromkeys(int(value) for value in ids.split(",") if value.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be a comma-separated list of integers")
+    if not values:
+        raise HTTPException(status_code=400, detail="ids must not be empty")
+    if len(values) > BATCH_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_IDS} ids per request")
+    return values
+
+def parse_includes(include: Optional[str], allowed) -> List[str]:
+    names = [name.strip() for name in (include or "").split(",") if name.strip()]
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown include: {', '.join(unknown)}. Allowed: {', '.join(allowed)}")
+    return names
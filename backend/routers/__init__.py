@@ -0,0 +1,22 @@
+# routers/__init__.py
+"""API routes, one module per area; create_app mounts ``router``."""
+from fastapi import APIRouter
+from fastapi.routing import APIRoute
+
+from routers import (
+    auth, auctions, feeds, bids, analytics, dashboards, notifications, users, changes,
+    buyers, sellers, admin, leaderboards, profiling, exports, wallet, contests, site_config
+)
+
+AREAS = (
+    auth, auctions, feeds, bids, analytics, dashboards, notifications, users, changes,
+    buyers, sellers, admin, leaderboards, profiling, exports, wallet, contests, site_config
+)
+
+router = APIRouter()
+for area in AREAS:
+    router.include_router(area.router)
+
+def api_routes() -> list:
+    """Every endpoint's route; ``router.routes`` only lists the included areas."""
+    return [route for area in AREAS for route in area.router.routes if isinstance(route, APIRoute)]
@@ -0,0 +1,210 @@
+# routers/admin.py
+"""Admin views of auctions, settlement and disputes."""
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from typing import Optional
+from datetime import datetime, timedelta
+
+from models import UserType, AuctionStatus, LedgerEntryType, User, Auction, Bid, LedgerEntry, SettlementRun
+from database import (
+    get_db, ShardSessions, get_shards, scatter, scatter_count, commit_with_changes, notify, deliver_notifications
+)
+from responses import projection, encoded_response
+from services.auctions import ADMIN_AUCTION_FIELDS, auction_page
+from services.dashboards import refresh_auction_summaries
+from services.events import event_bus
+from services.feeds import auction_card
+from services.ledger import reverse_settlement
+from services.settlement import post_sales, reverse_rollups
+from services.auth import get_admin_user
+
+router = APIRouter()
+
+@router.get("/admin/auctions", dependencies=[Depends(get_admin_user)])
+def get_all_auctions_admin(
+    request: Request,
+    fields: Optional[str] = None,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    shards: ShardSessions = Depends(get_shards)
+):
+    names = projection(fields, ADMIN_AUCTION_FIELDS)
+    return encoded_response(request, auction_page(shards, names, skip=skip, limit=limit))
+
+@router.get("/admin/system-stats", dependencies=[Depends(get_admin_user)])
+def get_admin_system_stats(shards: ShardSessions = Depends(get_shards)):
+    """Comprehensive system statistics for admin"""
+    db = shards.db
+    
+    # User statistics
+    total_users = db.query(User).count()
+    buyers_count = db.query(User).filter(User.user_type == UserType.BUYER).count()
+    sellers_count = db.query(User).filter(User.user_type == UserType.SELLER).count()
+    
+    # Auction statistics
+    total_auctions = scatter_count(shards, lambda db: db.query(Auction))
+    active_auctions = scatter_count(shards, lambda db: db.query(Auction).filter(Auction.status == AuctionStatus.ACTIVE))
+    completed_auctions = scatter_count(shards, lambda db: db.query(Auction).filter(Auction.status == AuctionStatus.WINNER_SELECTED))
+    
+    # Bid statistics
+    total_bids = scatter_count(shards, lambda db: db.query(Bid))
+    
+    # Sales volume
+    completed_auction_records = scatter(shards, lambda db: db.query(Auction).filter(
+        Auction.status == AuctionStatus.WINNER_SELECTED
+    ))
+    total_sales_volume = sum(auction.current_highest_bid for auction in completed_auction_records)
+    average_sale_price = total_sales_volume / len(completed_auction_records) if completed_auction_records else 0
+    
+    # Recent activity (last 7 days)
+    from datetime import timedelta
+    week_ago = datetime.utcnow() - timedelta(days=7)
+    recent_users = db.query(User).filter(User.created_at >= week_ago).count()
+    recent_auctions = scatter_count(shards, lambda db: db.query(Auction).filter(Auction.created_at >= week_ago))
+    recent_bids = scatter_count(shards, lambda db: db.query(Bid).filter(Bid.bid_time >= week_ago))
+    
+    return {
+        "users": {
+            "total": total_users,
+            "buyers": buyers_count,
+            "sellers": sellers_count,
+            "new_this_week": recent_users
+        },
+        "auctions": {
+            "total": total_auctions,
+            "active": active_auctions,
+            "completed": completed_auctions,
+            "new_this_week": recent_auctions
+        },
+        "bids": {
+            "total": total_bids,
+            "this_week": recent_bids
+        },
+        "sales": {
+            "total_volume": total_sales_volume,
+            "average_price": average_sale_price,
+            "completed_transactions": len(completed_auction_records)
+        }
+    }
+
+@router.get("/admin/settlement-stats", dependencies=[Depends(get_admin_user)])
+def get_settlement_stats(limit: int = 20, shards: ShardSessions = Depends(get_shards)):
+    """Settlement backlog, lag and throughput of recent lifecycle runs"""
+    now = datetime.utcnow()
+    backlog = 0
+    oldest_due = None
+    runs = []
+    for shard, db in enumerate(shards.all()):
+        count, oldest = db.query(func.count(Auction.id), func.min(Auction.end_time)).filter(
+            Auction.status == AuctionStatus.ACTIVE,
+            Auction.end_time <= now
+        ).one()
+        backlog += count
+        if oldest and (oldest_due is None or oldest < oldest_due):
+            oldest_due = oldest
+        runs.extend((shard, run) for run in db.query(SettlementRun).order_by(SettlementRun.id.desc()).limit(limit))
+    runs = sorted(runs, key=lambda item: item[1].started_at, reverse=True)[:limit]
+    
+    return {
+        "backlog": backlog,
+        "current_lag_seconds": (now - oldest_due).total_seconds() if oldest_due else 0,
+        "runs": [
+            {
+                "id": run.id,
+                "shard": shard,
+                "started_at": run.started_at,
+                "finished_at": run.finished_at,
+                "chunks": run.chunks,
+                "settled": run.settled,
+                "winners": run.winners,
+                "max_lag_seconds": run.max_lag_seconds,
+                "auctions_per_second": (
+                    run.settled / max((run.finished_at - run.started_at).total_seconds(), 1e-6)
+                    if run.finished_at else None
+                )
+            } for shard, run in runs
+        ]
+    }
+
+@router.post("/admin/resolve-dispute/{auction_id}", dependencies=[Depends(get_admin_user)])
+def resolve_dispute(
+    auction_id: int,
+    action: str,  # "cancel", "extend", "force_winner"
+    winner_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    shards: ShardSessions = Depends(get_shards)
+):
+    """Admin tools to resolve disputes or manually intervene"""
+    shard = shards.for_auction(auction_id)
+    auction = shard.query(Auction).filter(Auction.id == auction_id).first()
+    if not auction:
+        raise HTTPException(status_code=404, detail="Auction not found")
+    # A reversed sale stays reversed: its credit is never posted again
+    if action in ("extend", "force_winner") and db.query(LedgerEntry.id).filter(
+        LedgerEntry.entry_type == LedgerEntryType.SETTLEMENT_REVERSAL,
+        LedgerEntry.reference == f"auction:{auction_id}"
+    ).first():
+        raise HTTPException(status_code=409, detail="Auction was cancelled after it was sold")
+    
+    credited = set()
+    cancelled_sale = None
+    notifications = []
+    if action == "cancel":
+        if auction.status == AuctionStatus.WINNER_SELECTED:
+            sale = (auction.id, auction.seller_id, auction.winner_id, auction.current_highest_bid, auction.end_time)
+            # The reversal is the marker: repeating the cancel after a failed
+            # shard commit does not take the rollups back twice
+            if reverse_settlement(db.connection(), auction.id, auction.seller_id):
+                reverse_rollups(db.connection(), shard.connection(), [sale])
+                cancelled_sale = sale
+        auction.status = AuctionStatus.ENDED
+        auction.winner_id = None
+        # Notify all bidders
+        bidders = shard.query(Bid).filter(Bid.auction_id == auction_id).all()
+        for bid in bidders:
+            notifications.append({
+                "user_id": bid.bidder_id,
+                "message": f"Auction '{auction.product_name}' has been cancelled by admin"
+            })
+        
+    elif action == "extend":
+        # Extend auction by 1 hour
+        auction.end_time = auction.end_time + timedelta(hours=1)
+        auction.status = AuctionStatus.ACTIVE
+        
+    elif action == "force_winner" and winner_id:
+        auction.winner_id = winner_id
+        auction.status = AuctionStatus.WINNER_SELECTED
+        
+        # Create notifications
+        notifications += [
+            {"user_id": winner_id, "message": f"You have been declared winner of '{auction.product_name}' by admin"},
+            {"user_id": auction.seller_id, "message": f"Winner declared for '{auction.product_name}' by admin intervention"}
+        ]
+        sale = (auction.id, auction.seller_id, winner_id, auction.current_highest_bid, auction.end_time)
+        credited = post_sales(db.connection(), shard.connection(), [sale])
+    
+    shard.flush()
+    changes = [("auction", auction.id, None)]
+    remote = notify(shard.connection(), notifications, changes)
+    # The ledger commits first; repeating the action after a failed shard commit
+    # does not credit the seller twice
+    db.commit()
+    commit_with_changes(
+        shard, changes, lambda conn, shard_conn: refresh_auction_summaries(conn, shard_conn, [auction_id])
+    )
+    deliver_notifications(remote)
+    event = {
+        "auction_id": auction.id,
+        "status": auction.status.value,
+        "winner_id": auction.winner_id,
+        "card": auction_card(auction)
+    }
+    if credited:
+        event.update(seller_id=auction.seller_id, amount=auction.current_highest_bid, end_time=auction.end_time)
+    elif cancelled_sale:
+        _, seller_id, former_winner_id, amount, end_time = cancelled_sale
+        event.update(seller_id=seller_id, former_winner_id=former_winner_id, amount=-amount, end_time=end_time)
+    event_bus.publish("auction.status", event)
+    return {"message": f"Dispute resolved with action: {action}"}
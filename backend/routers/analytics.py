@@ -0,0 +1,96 @@
+# routers/analytics.py
+"""Bid analytics (NumPy)."""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from typing import Optional
+import itertools
+
+from models import AuctionStatus, Auction, Bid
+from database import ShardSessions, get_shards, epoch_seconds, to_epoch, iter_raw_rows
+from services.cache import LRUCache
+from services.events import event_bus
+from services.auth import AuthUser, get_current_user, user_scope
+
+router = APIRouter()
+
+# Bid analytics
+ANALYTICS_CACHE_SIZE = 1024
+
+# Analytics of settled auctions never change, so they are computed once
+analytics_cache = LRUCache(ANALYTICS_CACHE_SIZE)
+event_bus.subscribe("auction.status", lambda event: analytics_cache.pop(event["auction_id"]))
+
+def require_analytics():
+    """The analytics module, imported on first use since NumPy is slow to load."""
+    try:
+        import analytics
+    except ImportError:  # NumPy is optional; analytics endpoints report 503 without it
+        raise HTTPException(status_code=503, detail="Analytics require NumPy to be installed")
+    return analytics
+
+@router.get("/auctions/{auction_id}/analytics")
+def get_auction_analytics(auction_id: int, buckets: int = 60, shards: ShardSessions = Depends(get_shards)):
+    """Price curve, bid velocity, bidder and sniping metrics for one auction"""
+    analytics = require_analytics()
+    if not 1 <= buckets <= 1000:
+        raise HTTPException(status_code=400, detail="buckets must be between 1 and 1000")
+    
+    cached = analytics_cache.get(auction_id, {})
+    if buckets in cached:
+        return cached[buckets]
+    
+    db = shards.for_auction(auction_id)
+    auction = db.query(Auction).filter(Auction.id == auction_id).first()
+    if not auction:
+        raise HTTPException(status_code=404, detail="Auction not found")
+    
+    bids = analytics.load(
+        iter_raw_rows(db, select(Bid.amount, epoch_seconds(Bid.bid_time), Bid.bidder_id).where(Bid.auction_id == auction_id)),
+        analytics.BID_DTYPE,
+        order="time"
+    )
+    result = analytics.auction_metrics(
+        bids,
+        base_price=auction.base_price,
+        start_time=to_epoch(auction.start_time),
+        end_time=to_epoch(auction.end_time),
+        buckets=buckets
+    )
+    result["auction_id"] = auction_id
+    result["status"] = auction.status.value
+    
+    if auction.status in (AuctionStatus.ENDED, AuctionStatus.WINNER_SELECTED):
+        analytics_cache.put(auction_id, {**cached, buckets: result})
+    return result
+
+@router.get("/seller/analytics")
+def get_seller_analytics(
+    user_id: Optional[int] = None,
+    current_user: AuthUser = Depends(get_current_user),
+    shards: ShardSessions = Depends(get_shards)
+):
+    """Bid velocity, bidder mix, sniping share and price-over-base ratios across a seller's auctions"""
+    user_id = user_scope(user_id, current_user)
+    analytics = require_analytics()
+    auctions = analytics.load(
+        itertools.chain.from_iterable(
+            iter_raw_rows(db, select(Auction.id, Auction.base_price, epoch_seconds(Auction.end_time))
+                          .where(Auction.seller_id == user_id))
+            for db in shards.all()
+        ),
+        analytics.AUCTION_DTYPE,
+        order="id"
+    )
+    bids = analytics.load(
+        itertools.chain.from_iterable(
+            iter_raw_rows(db, select(Bid.amount, epoch_seconds(Bid.bid_time), Bid.bidder_id, Bid.auction_id)
+                          .join(Auction, Auction.id == Bid.auction_id)
+                          .where(Auction.seller_id == user_id))
+            for db in shards.all()
+        ),
+        analytics.SELLER_BID_DTYPE,
+        order="time"
+    )
+    result = analytics.seller_metrics(bids, auctions)
+    result["seller_id"] = user_id
+    return result
@@ -0,0 +1,213 @@
+# routers/auctions.py
+"""Auction creation, import and reads."""
+from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Header, Request
+from pydantic import ValidationError
+from typing import Optional, List
+
+from models import UserType, AuctionStatus, Auction
+from database import ShardSessions, get_shards, commit_with_changes
+from responses import projection, encoded_response, parse_ids, parse_includes
+from schemas import AuctionCreate, AuctionResponse
+from services.auctions import (
+    insert_auction, iter_import_rows, insert_auction_chunk, AUCTION_FIELDS, auction_page, AUCTION_INCLUDES,
+    lookup_auctions
+)
+from services.auth import AuthUser, get_current_user, get_seller_user, acting_user_id
+from services.dashboards import refresh_auction_summaries
+from services import idempotency
+from services.uploads import save_upload
+
+router = APIRouter()
+
+# Bulk auction import
+IMPORT_CHUNK_SIZE = 1000
+IMPORT_MAX_REPORTED_ERRORS = 1000
+
+# Auction lists are encoded (and projected) by encoded_response, so the model
+# only documents them; a response_model would re-validate every row as JSON
+AUCTION_LIST_RESPONSES = {200: {"model": List[AuctionResponse], "content": {"application/msgpack": {}}}}
+
+@router.post("/auctions/create", response_model=AuctionResponse)
+def create_auction(
+    auction: AuctionCreate,
+    idempotency_key: Optional[str] = Header(None),
+    seller: AuthUser = Depends(get_seller_user),
+    shards: ShardSessions = Depends(get_shards)
+):
+    auction = auction.model_copy(update={"seller_id": acting_user_id(auction.seller_id, seller)})
+    if idempotency_key:
+        # Keys are the client's own, so each seller has a key space of their own
+        return idempotency.idempotency_store.execute(
+            f"auctions.create:{auction.seller_id}", idempotency_key, auction,
+            lambda claim: insert_auction(auction, shards, claim)
+        )
+    return insert_auction(auction, shards)
+
+@router.post("/auctions/import")
+def import_auctions(
+    seller_id: Optional[int] = None,
+    file: UploadFile = File(...),
+    file_format: Optional[str] = None,
+    seller: AuthUser = Depends(get_seller_user),
+    shards: ShardSessions = Depends(get_shards)
+):
+    """Bulk-create the caller's auctions from a streamed CSV or NDJSON upload"""
+    seller_id = acting_user_id(seller_id, seller)
+    if file_format is None:
+        filename = (file.filename or "").lower()
+        file_format = "csv" if filename.endswith(".csv") or file.content_type == "text/csv" else "ndjson"
+    if file_format not in ("csv", "ndjson"):
+        raise HTTPException(status_code=400, detail="file_format must be 'csv' or 'ndjson'")
+    
+    imported = 0
+    failed = 0
+    errors = []
+    chunk = []
+    
+    def report(row_number: int, error: str):
+        nonlocal failed
+        failed += 1
+        if len(errors) < IMPORT_MAX_REPORTED_ERRORS:
+            errors.append({"row": row_number, "error": error})
+    
+    def flush():
+        nonlocal imported
+        error = insert_auction_chunk([row for _, row in chunk], shards)
+        if error is None:
+            imported += len(chunk)
+        else:
+            for row_number, _ in chunk:
+                report(row_number, error)
+    
+    for row_number, row in iter_import_rows(file, file_format):
+        if isinstance(row, dict):
+            row.setdefault("seller_id", seller_id)
+            try:
+                auction = AuctionCreate(**row)
+            except ValidationError as e:
+                row = "; ".join(
+                    f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in e.errors()
+                )
+            else:
+                if auction.seller_id != seller_id:
+                    report(row_number, "Row is for another seller")
+                    continue
+                chunk.append((row_number, {
+                    "product_name": auction.product_name,
+                    "description": auction.description,
+                    "base_price": auction.base_price,
+                    "start_time": auction.start_time,
+                    "end_time": auction.end_time,
+                    "seller_id": auction.seller_id
+                }))
+                if len(chunk) >= IMPORT_CHUNK_SIZE:
+                    flush()
+                    chunk = []
+                continue
+        report(row_number, row)
+    if chunk:
+        flush()
+    
+    return {
+        "imported": imported,
+        "failed": failed,
+        "errors": errors,
+        "errors_truncated": failed > len(errors)
+    }
+
+@router.get("/auctions", responses=AUCTION_LIST_RESPONSES)
+def get_auctions(
+    request: Request,
+    fields: Optional[str] = None,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    shards: ShardSessions = Depends(get_shards)
+):
+    names = projection(fields, AUCTION_FIELDS)
+    return encoded_response(request, auction_page(shards, names, skip=skip, limit=limit))
+
+@router.get("/auctions/active", responses=AUCTION_LIST_RESPONSES)
+def get_active_auctions(
+    request: Request,
+    fields: Optional[str] = None,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    shards: ShardSessions = Depends(get_shards)
+):
+    names = projection(fields, AUCTION_FIELDS)
+    return encoded_response(request, auction_page(shards, names, [Auction.status == AuctionStatus.ACTIVE], skip, limit))
+
+@router.get("/auctions/past", responses=AUCTION_LIST_RESPONSES)
+def get_past_auctions(
+    request: Request,
+    fields: Optional[str] = None,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    shards: ShardSessions = Depends(get_shards)
+):
+    """Browse past auctions - available to all users"""
+    names = projection(fields, AUCTION_FIELDS)
+    return encoded_response(request, auction_page(
+        shards, names, [Auction.status.in_([AuctionStatus.ENDED, AuctionStatus.WINNER_SELECTED])], skip, limit
+    ))
+
+@router.get("/auctions/batch")
+def get_auctions_batch(
+    request: Request,
+    ids: str,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    shards: ShardSessions = Depends(get_shards)
+):
+    """Many auctions by id in one request, optionally with bid_count, top_bid and winner_email"""
+    auction_ids = parse_ids(ids)
+    found = lookup_auctions(shards, auction_ids, projection(fields, AUCTION_FIELDS), parse_includes(include, AUCTION_INCLUDES))
+    return encoded_response(request, {
+        "auctions": [found[auction_id] for auction_id in auction_ids if auction_id in found],
+        "missing": [auction_id for auction_id in auction_ids if auction_id not in found]
+    })
+
+@router.get("/auctions/{auction_id}")
+def get_auction(
+    request: Request,
+    auction_id: int,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    shards: ShardSessions = Depends(get_shards)
+):
+    found = lookup_auctions(shards, [auction_id], projection(fields, AUCTION_FIELDS), parse_includes(include, AUCTION_INCLUDES))
+    if auction_id not in found:
+        raise HTTPException(status_code=404, detail="Auction not found")
+    return encoded_response(request, found[auction_id])
+
+@router.post("/auctions/{auction_id}/upload-image")
+async def upload_auction_image(
+    auction_id: int,
+    file: UploadFile = File(...),
+    current_user: AuthUser = Depends(get_current_user),
+    shards: ShardSessions = Depends(get_shards)
+):
+    """Upload product images for auctions"""
+    if current_user.user_type != UserType.SELLER:
+        raise HTTPException(status_code=403, detail="Only sellers can upload images")
+    
+    # Check if auction belongs to current seller
+    db = shards.for_auction(auction_id)
+    auction = db.query(Auction).filter(
+        Auction.id == auction_id,
+        Auction.seller_id == current_user.id
+    ).first()
+    
+    if not auction:
+        raise HTTPException(status_code=404, detail="Auction not found or access denied")
+    
+    file_path = await save_upload(file)
+    
+    # Update auction with image URL
+    auction.image_url = file_path
+    commit_with_changes(
+        db, [("auction", auction_id, None)],
+        lambda conn, shard_conn: refresh_auction_summaries(conn, shard_conn, [auction_id])
+    )
+    
+    return {"message": "Image uploaded successfully", "image_url": file_path}
@@ -0,0 +1,71 @@
+# routers/auth.py
+"""Registration and login."""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from models import User
+from database import get_db, commit_with_changes
+from schemas import UserCreate, UserLogin, Token
+from services.auth import hash_password, verify_password, create_access_token
+
+router = APIRouter()
+
+@router.get("/")
+def root():
+    return {"message": "Auction System API", "version": "1.0.0"}
+
+@router.post("/auth/register", response_model=Token)
+def register(user: UserCreate, db: Session = Depends(get_db)):
+    # Check if user exists
+    db_user = db.query(User).filter(User.email == user.email).first()
+    if db_user:
+        raise HTTPException(status_code=400, detail="Email already registered")
+    
+    # Create new user
+    hashed_password = hash_password(user.password)
+    db_user = User(
+        email=user.email,
+        hashed_password=hashed_password,
+        user_type=user.user_type
+    )
+    db.add(db_user)
+    db.flush()
+    commit_with_changes(db, [("user", db_user.id, None)])
+    db.refresh(db_user)
+    
+    # Create token
+    access_token = create_access_token(
+        data={"sub": str(db_user.id), "user_type": db_user.user_type.value}
+    )
+    
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "user_type": db_user.user_type.value,
+        "user_id": db_user.id
+    }
+
+@router.post("/auth/login", response_model=Token)
+def login(user: UserLogin, db: Session = Depends(get_db)):
+    # Find user
+    db_user = db.query(User).filter(User.email == user.email).first()
+    if not db_user or not verify_password(user.password, db_user.hashed_password):
+        raise HTTPException(status_code=401, detail="Incorrect email or password")
+    
+    # Verify user type
+    if db_user.user_type != user.user_type:
+        raise HTTPException(status_code=401, detail="Invalid user type")
+    if not db_user.is_active:
+        raise HTTPException(status_code=403, detail="Account is deactivated")
+    
+    # Create token
+    access_token = create_access_token(
+        data={"sub": str(db_user.id), "user_type": db_user.user_type.value}
+    )
+    
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "user_type": db_user.user_type.value,
+        "user_id": db_user.id
+    }
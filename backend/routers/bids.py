@@ -0,0 +1,82 @@
+# routers/bids.py
+"""Bids and their audit proofs."""
+from fastapi import APIRouter, Depends, HTTPException, Header
+from sqlalchemy import select
+from typing import Optional, List
+import json
+import bisect
+
+from models import Bid, BidAuditEntry, AuditWindow
+import merkle
+from database import ShardSessions, get_shards, iter_raw_rows
+from schemas import BidCreate, BidResponse
+from services.bids import submit_bid
+from services.auth import AuthUser, get_current_user, acting_user_id
+from services import idempotency
+
+router = APIRouter()
+
+@router.post("/bids/place", response_model=BidResponse)
+def place_bid(
+    bid: BidCreate,
+    idempotency_key: Optional[str] = Header(None),
+    current_user: AuthUser = Depends(get_current_user),
+    shards: ShardSessions = Depends(get_shards)
+):
+    bid = bid.model_copy(update={"bidder_id": acting_user_id(bid.bidder_id, current_user)})
+    if idempotency_key:
+        return idempotency.idempotency_store.execute(
+            f"bids.place:{bid.bidder_id}", idempotency_key, bid,
+            lambda claim: submit_bid(bid, shards, claim)
+        )
+    return submit_bid(bid, shards)
+
+@router.get("/auctions/{auction_id}/proof/{bid_id}")
+def get_bid_proof(auction_id: int, bid_id: int, shards: ShardSessions = Depends(get_shards)):
+    """Hash-chain link and Merkle inclusion proof for an accepted bid"""
+    db = shards.for_auction(auction_id)
+    entry = db.query(BidAuditEntry).filter(
+        BidAuditEntry.bid_id == bid_id,
+        BidAuditEntry.auction_id == auction_id
+    ).first()
+    if not entry:
+        raise HTTPException(status_code=404, detail="Bid not found in audit log")
+    if entry.window_id is None:
+        raise HTTPException(status_code=409, detail="Bid has not been anchored yet; retry after the current audit window closes")
+    
+    window = db.query(AuditWindow).filter(AuditWindow.id == entry.window_id).first()
+    rows = list(iter_raw_rows(
+        db,
+        select(BidAuditEntry.id, BidAuditEntry.entry_hash).where(BidAuditEntry.window_id == window.id).order_by(BidAuditEntry.id)
+    ))
+    leaves = [row[1] for row in rows]
+    index = bisect.bisect_left(rows, (entry.id,))
+    return {
+        "bid_id": bid_id,
+        "payload": json.loads(entry.payload),
+        "canonical_payload": entry.payload,
+        "prev_hash": entry.prev_hash,
+        "entry_hash": entry.entry_hash,
+        "window_id": window.id,
+        "leaf_index": index,
+        "leaf_count": window.leaf_count,
+        "merkle_root": window.merkle_root,
+        "anchored_at": window.created_at,
+        "proof": merkle.merkle_proof(leaves, index)
+    }
+
+@router.get("/auctions/{auction_id}/bids", response_model=List[BidResponse])
+def get_auction_bids(
+    auction_id: int,
+    shards: ShardSessions = Depends(get_shards)
+):
+    bids = shards.for_auction(auction_id).query(Bid).filter(Bid.auction_id == auction_id).order_by(Bid.bid_time.desc(), Bid.id.desc()).all()
+    return [
+        BidResponse(
+            id=bid.id,
+            amount=bid.amount,
+            bid_time=bid.bid_time,
+            bidder_id=bid.bidder_id,
+            auction_id=bid.auction_id
+        ) for bid in bids
+    ]
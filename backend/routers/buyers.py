@@ -0,0 +1,92 @@
+# routers/buyers.py
+"""Buyer history."""
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from models import AuctionStatus, Auction, Bid, AuctionSummary
+from database import get_db, ShardSessions, get_shards, scatter
+from responses import encoded_response
+from services.auth import AuthUser, get_current_user, user_scope
+
+router = APIRouter()
+
+@router.get("/buyer/bidding-history")
+def get_buyer_bidding_history(
+    user_id: Optional[int] = None,
+    current_user: AuthUser = Depends(get_current_user),
+    shards: ShardSessions = Depends(get_shards)
+):
+    """View personal bidding history for buyers"""
+    user_id = user_scope(user_id, current_user)
+    bids = scatter(shards, lambda db: db.query(Bid).join(Auction).filter(Bid.bidder_id == user_id))
+    
+    return [
+        {
+            "bid_id": bid.id,
+            "amount": bid.amount,
+            "bid_time": bid.bid_time,
+            "auction_name": bid.auction.product_name,
+            "auction_status": bid.auction.status.value,
+            "is_winning": bid.amount == bid.auction.current_highest_bid and bid.auction.status == AuctionStatus.ACTIVE
+        } for bid in bids
+    ]
+
+@router.get("/buyer/won-items")
+def get_buyer_won_items(
+    request: Request,
+    user_id: Optional[int] = None,
+    current_user: AuthUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get complete list of won items for buyers"""
+    user_id = user_scope(user_id, current_user)
+    won_auctions = db.query(
+        AuctionSummary.auction_id, AuctionSummary.product_name, AuctionSummary.description,
+        AuctionSummary.current_highest_bid, AuctionSummary.seller_id, AuctionSummary.end_time, AuctionSummary.image_url
+    ).filter(AuctionSummary.winner_id == user_id).order_by(AuctionSummary.auction_id).all()
+    
+    return encoded_response(request, [
+        {
+            "auction_id": auction.auction_id,
+            "product_name": auction.product_name,
+            "description": auction.description,
+            "winning_amount": auction.current_highest_bid,
+            "seller_id": auction.seller_id,
+            "end_time": auction.end_time,
+            "image_url": auction.image_url
+        } for auction in won_auctions
+    ])
+
+@router.get("/buyer/transaction-history")
+def get_buyer_transaction_history(
+    user_id: Optional[int] = None,
+    current_user: AuthUser = Depends(get_current_user),
+    shards: ShardSessions = Depends(get_shards)
+):
+    """Complete transaction history for buyers"""
+    user_id = user_scope(user_id, current_user)
+    
+    # Get all auctions where user participated
+    user_bids = scatter(shards, lambda db: db.query(Bid).filter(Bid.bidder_id == user_id))
+    auction_ids = list(set([bid.auction_id for bid in user_bids]))
+    
+    auctions = scatter(shards, lambda db: db.query(Auction).filter(Auction.id.in_(auction_ids)))
+    
+    transactions = []
+    for auction in auctions:
+        user_bids_for_auction = [bid for bid in user_bids if bid.auction_id == auction.id]
+        highest_bid = max([bid.amount for bid in user_bids_for_auction])
+        
+        transactions.append({
+            "auction_id": auction.id,
+            "product_name": auction.product_name,
+            "your_highest_bid": highest_bid,
+            "winning_bid": auction.current_highest_bid,
+            "won": auction.winner_id == user_id,
+            "auction_status": auction.status.value,
+            "end_time": auction.end_time,
+            "total_bids_placed": len(user_bids_for_auction)
+        })
+    
+    return sorted(transactions, key=lambda x: x['end_time'], reverse=True)
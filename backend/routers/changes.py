@@ -0,0 +1,94 @@
+# routers/changes.py
+"""Change feed for polling clients."""
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import select, or_
+from sqlalchemy.sql import func
+from typing import Optional
+from collections import defaultdict
+
+from models import User, Notification, ChangeLogEntry
+import database
+from database import ShardSessions, get_shards
+from responses import projection, encoded_response
+from services.auth import AuthUser, get_optional_user, user_scope
+from services.auctions import AUCTION_FIELDS, ADMIN_AUCTION_FIELDS, lookup_auctions
+
+router = APIRouter()
+
+CHANGES_MAX_LIMIT = 1000
+
+CHANGE_AUCTION_FIELDS = tuple(dict.fromkeys(ADMIN_AUCTION_FIELDS + AUCTION_FIELDS))
+
+@router.get("/changes")
+def get_changes(
+    request: Request,
+    since: Optional[int] = None,
+    user_id: Optional[int] = None,
+    fields: Optional[str] = None,
+    limit: int = CHANGES_MAX_LIMIT,
+    current_user: Optional[AuthUser] = Depends(get_optional_user),
+    shards: ShardSessions = Depends(get_shards)
+):
+    """Auctions, users and (for a signed-in caller) their notifications written after cursor ``since``.
+    
+    Without ``since``, or with a cursor older than the retained change log,
+    the response only carries ``reset``: reload the full lists, then poll with
+    the returned cursor. ``more`` means another page is waiting right away.
+    Admins may pass ``user_id`` to follow another user's notifications.
+    """
+    if current_user is not None:
+        user_id = user_scope(user_id, current_user)
+    elif user_id is not None:
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+    db = shards.db
+    log = ChangeLogEntry.__table__
+    first_id, last_id = db.execute(select(func.min(log.c.id), func.max(log.c.id))).one()
+    last_id = last_id or 0
+    if since is None or since > last_id or (first_id is not None and since < first_id - 1):
+        return encoded_response(request, {"cursor": last_id, "reset": True})
+    names = projection(fields, CHANGE_AUCTION_FIELDS)
+    limit = max(1, min(limit, CHANGES_MAX_LIMIT))
+    
+    owned = log.c.entity != "notification"
+    if user_id is not None:
+        owned = or_(owned, log.c.user_id == user_id)
+    entries = db.execute(
+        select(log.c.id, log.c.entity, log.c.entity_id)
+        .where(log.c.id > since, log.c.id <= last_id, owned)
+        .order_by(log.c.id)
+        .limit(limit + 1)
+    ).all()
+    more = len(entries) > limit
+    entries = entries[:limit]
+    changed = defaultdict(dict)
+    for entry in entries:
+        changed[entry.entity][entry.entity_id] = None
+    
+    auction_ids = list(changed["auction"])
+    found = lookup_auctions(shards, auction_ids, names, []) if auction_ids else {}
+    users = db.execute(
+        select(User.id, User.email, User.user_type, User.created_at, User.is_active)
+        .where(User.id.in_(list(changed["user"])))
+    ).all() if changed["user"] else []
+    content = {
+        "cursor": entries[-1].id if more else last_id,
+        "more": more,
+        "auctions": [found[auction_id] for auction_id in auction_ids if auction_id in found],
+        "users": [
+            {
+                "id": user.id,
+                "email": user.email,
+                "user_type": user.user_type.value,
+                "created_at": user.created_at,
+                "is_active": user.is_active
+            } for user in users
+        ]
+    }
+    if user_id is not None:
+        notification_ids = list(changed["notification"])
+        notifications = shards.get(database.shard_router.shard_for_user(user_id)).execute(
+            select(Notification.id, Notification.message, Notification.is_read, Notification.created_at)
+            .where(Notification.id.in_(notification_ids))
+        ).all() if notification_ids else []
+        content["notifications"] = [dict(notification._mapping) for notification in notifications]
+    return encoded_response(request, content)
@@ -0,0 +1,259 @@
+# routers/contests.py
+"""Contests, their entries, prizes and draws."""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select, insert, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from sqlalchemy.exc import IntegrityError
+from typing import Optional, List
+from datetime import datetime
+import json
+import secrets
+
+from models import ContestStatus, LedgerEntryType, Contest, ContestEntry, ContestPrize, ContestWinner
+from draw import weighted_sample
+from database import get_db, log_changes, notify, deliver_notifications, iter_raw_rows
+from schemas import ContestCreate, ContestEntryCreate, PrizeTier
+from services.ledger import post_ledger_entries
+from services.auth import get_admin_user
+
+router = APIRouter()
+
+# Contest draws
+CONTEST_BATCH_SIZE = 1000
+
+def get_contest_or_404(contest_id: int, db: Session) -> Contest:
+    contest = db.query(Contest).filter(Contest.id == contest_id).first()
+    if not contest:
+        raise HTTPException(status_code=404, detail="Contest not found")
+    return contest
+
+def contest_to_dict(contest: Contest, db: Session) -> dict:
+    entries, tickets = db.query(func.count(ContestEntry.id), func.sum(ContestEntry.weight)).filter(
+        ContestEntry.contest_id == contest.id
+    ).one()
+    return {
+        "id": contest.id,
+        "name": contest.name,
+        "description": contest.description,
+        "status": contest.status.value,
+        "entries": entries,
+        "total_weight": tickets or 0,
+        "created_at": contest.created_at,
+        "announced_at": contest.announced_at
+    }
+
+def contest_result(contest: Contest, db: Session) -> dict:
+    winners = db.query(ContestWinner).filter(
+        ContestWinner.contest_id == contest.id
+    ).order_by(ContestWinner.prize_rank, ContestWinner.id).all()
+    return {
+        "contestId": contest.id,
+        "announceTime": contest.announced_at,
+        "seed": contest.seed,
+        "totalPrizeAmount": sum(w.prize_amount for w in winners),
+        "winners": [
+            {
+                "prizeRank": w.prize_rank,
+                "prizeAmount": w.prize_amount,
+                "userId": w.user_id,
+                "seatNumber": w.seat_number
+            } for w in winners
+        ]
+    }
+
+@router.post("/admin/contests", dependencies=[Depends(get_admin_user)])
+def create_contest(contest: ContestCreate, db: Session = Depends(get_db)):
+    db_contest = Contest(name=contest.name, description=contest.description)
+    db.add(db_contest)
+    db.commit()
+    db.refresh(db_contest)
+    return contest_to_dict(db_contest, db)
+
+@router.get("/admin/contests", dependencies=[Depends(get_admin_user)])
+def get_contests(db: Session = Depends(get_db)):
+    return [contest_to_dict(contest, db) for contest in db.query(Contest).order_by(Contest.id.desc()).all()]
+
+@router.get("/admin/contests/{contest_id}", dependencies=[Depends(get_admin_user)])
+def get_contest(contest_id: int, db: Session = Depends(get_db)):
+    return contest_to_dict(get_contest_or_404(contest_id, db), db)
+
+@router.post("/contests/{contest_id}/entries", dependencies=[Depends(get_admin_user)])
+def add_contest_entries(contest_id: int, entries: List[ContestEntryCreate], db: Session = Depends(get_db)):
+    """Add one or many entries; seats are numbered sequentially unless given"""
+    contest = get_contest_or_404(contest_id, db)
+    if contest.status != ContestStatus.OPEN:
+        raise HTTPException(status_code=400, detail="Contest is closed for entries")
+    if any(entry.weight <= 0 for entry in entries):
+        raise HTTPException(status_code=400, detail="Entry weight must be positive")
+    
+    next_seat = (db.query(func.max(ContestEntry.seat_number)).filter(
+        ContestEntry.contest_id == contest_id
+    ).scalar() or 0) + 1
+    rows = []
+    for entry in entries:
+        seat = entry.seat_number
+        if seat is None:
+            seat = next_seat
+        next_seat = max(next_seat, seat) + 1
+        rows.append({"contest_id": contest_id, "user_id": entry.user_id, "seat_number": seat, "weight": entry.weight})
+    try:
+        for start in range(0, len(rows), CONTEST_BATCH_SIZE):
+            db.execute(insert(ContestEntry.__table__), rows[start:start + CONTEST_BATCH_SIZE])
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Seat number already taken")
+    
+    return {"added": len(rows), "seat_numbers": [row["seat_number"] for row in rows]}
+
+@router.get("/admin/contests/{contest_id}/prize-structure", dependencies=[Depends(get_admin_user)])
+def get_prize_structure(contest_id: int, db: Session = Depends(get_db)):
+    get_contest_or_404(contest_id, db)
+    prizes = db.query(ContestPrize).filter(ContestPrize.contest_id == contest_id).order_by(ContestPrize.prize_rank).all()
+    return {
+        "items": [
+            {
+                "prizeRank": prize.prize_rank,
+                "prizeAmount": prize.prize_amount,
+                "numberOfWinners": prize.number_of_winners,
+                "prizeDescription": prize.prize_description,
+                "winnersSeatNumbers": json.loads(prize.winners_seat_numbers) if prize.winners_seat_numbers else []
+            } for prize in prizes
+        ]
+    }
+
+@router.post("/admin/contests/{contest_id}/prize-structure", dependencies=[Depends(get_admin_user)])
+def set_prize_structure(contest_id: int, tiers: List[PrizeTier], db: Session = Depends(get_db)):
+    """Replace the prize tiers of a contest that has not been drawn yet"""
+    contest = get_contest_or_404(contest_id, db)
+    if contest.status != ContestStatus.OPEN:
+        raise HTTPException(status_code=400, detail="Prizes have already been announced")
+    
+    seen_ranks = set()
+    seen_seats = set()
+    for tier in tiers:
+        if tier.prizeRank in seen_ranks:
+            raise HTTPException(status_code=400, detail=f"Duplicate prize rank {tier.prizeRank}")
+        seen_ranks.add(tier.prizeRank)
+        seats = tier.winnersSeatNumbers or []
+        if tier.numberOfWinners < 1 or len(seats) > tier.numberOfWinners:
+            raise HTTPException(status_code=400, detail=f"Invalid number of winners for rank {tier.prizeRank}")
+        if seen_seats.intersection(seats) or len(set(seats)) != len(seats):
+            raise HTTPException(status_code=400, detail="A seat can win only one prize")
+        seen_seats.update(seats)
+    
+    db.query(ContestPrize).filter(ContestPrize.contest_id == contest_id).delete()
+    for tier in tiers:
+        db.add(ContestPrize(
+            contest_id=contest_id,
+            prize_rank=tier.prizeRank,
+            prize_amount=tier.prizeAmount,
+            number_of_winners=tier.numberOfWinners,
+            prize_description=tier.prizeDescription,
+            winners_seat_numbers=json.dumps(tier.winnersSeatNumbers) if tier.winnersSeatNumbers else None
+        ))
+    db.commit()
+    return get_prize_structure(contest_id, db)
+
+@router.post("/admin/contests/{contest_id}/announce-prize", dependencies=[Depends(get_admin_user)])
+def announce_contest_prizes(contest_id: int, seed: Optional[str] = None, db: Session = Depends(get_db)):
+    """Draw winners for every prize tier and notify them.
+    
+    Guaranteed seats win their tier first; the remaining places are filled by
+    one seeded weighted draw over all other entries, so the same seed always
+    reproduces the same winners.
+    """
+    contest = get_contest_or_404(contest_id, db)
+    if contest.status == ContestStatus.ANNOUNCED:
+        return contest_result(contest, db)
+    
+    prizes = db.query(ContestPrize).filter(ContestPrize.contest_id == contest_id).order_by(ContestPrize.prize_rank).all()
+    if not prizes:
+        raise HTTPException(status_code=400, detail="Contest has no prize structure")
+    
+    fixed_seats = {}
+    for prize in prizes:
+        for seat in json.loads(prize.winners_seat_numbers or "[]"):
+            fixed_seats[seat] = prize
+    fixed_entries = {
+        row.seat_number: row for row in db.query(ContestEntry.id, ContestEntry.user_id, ContestEntry.seat_number).filter(
+            ContestEntry.contest_id == contest_id,
+            ContestEntry.seat_number.in_(list(fixed_seats))
+        )
+    } if fixed_seats else {}
+    missing = set(fixed_seats) - set(fixed_entries)
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Guaranteed seats without an entry: {sorted(missing)}")
+    
+    open_places = sum(prize.number_of_winners for prize in prizes) - len(fixed_seats)
+    seed = seed or str(secrets.randbits(64))
+    # Claiming the contest takes the write lock; a concurrent announce that got
+    # there first leaves nothing to claim, and its winners are returned instead
+    contests = Contest.__table__
+    claimed = db.execute(
+        update(contests)
+        .where(contests.c.id == contest_id, contests.c.status != ContestStatus.ANNOUNCED)
+        .values(status=ContestStatus.ANNOUNCED, seed=seed, announced_at=datetime.utcnow())
+    ).rowcount
+    if not claimed:
+        db.rollback()
+        return contest_result(contest, db)
+    entries_stmt = select(ContestEntry.id, ContestEntry.user_id, ContestEntry.seat_number, ContestEntry.weight).where(
+        ContestEntry.contest_id == contest_id
+    ).order_by(ContestEntry.id)
+    drawn = iter(weighted_sample(
+        (((row[0], row[1], row[2]), row[3]) for row in iter_raw_rows(db, entries_stmt) if row[2] not in fixed_seats),
+        open_places,
+        seed
+    ))
+    
+    winners = []
+    for prize in prizes:
+        tier_seats = [seat for seat, tier in fixed_seats.items() if tier is prize]
+        picks = [(fixed_entries[seat].id, fixed_entries[seat].user_id, seat) for seat in tier_seats]
+        for _ in range(prize.number_of_winners - len(picks)):
+            pick = next(drawn, None)
+            if pick is None:
+                break
+            picks.append(pick)
+        for entry_id, user_id, seat in picks:
+            winners.append({
+                "contest_id": contest_id,
+                "prize_rank": prize.prize_rank,
+                "prize_amount": prize.prize_amount,
+                "entry_id": entry_id,
+                "user_id": user_id,
+                "seat_number": seat
+            })
+    
+    changes = []
+    remote = []
+    for start in range(0, len(winners), CONTEST_BATCH_SIZE):
+        batch = winners[start:start + CONTEST_BATCH_SIZE]
+        db.execute(insert(ContestWinner.__table__), batch)
+        post_ledger_entries(db.connection(), [
+            {
+                "user_id": winner["user_id"],
+                "entry_type": LedgerEntryType.PRIZE_CREDIT,
+                "amount": winner["prize_amount"],
+                "reference": f"contest:{contest_id}:seat:{winner['seat_number']}"
+            } for winner in batch
+        ])
+        remote += notify(db.connection(), [
+            {
+                "user_id": winner["user_id"],
+                "message": f"Congratulations! Seat {winner['seat_number']} won prize #{winner['prize_rank']} "
+                           f"(${winner['prize_amount']}) in '{contest.name}'"
+            } for winner in batch
+        ], changes)
+    log_changes(db.connection(), changes)
+    db.commit()
+    deliver_notifications(remote)
+    db.refresh(contest)
+    
+    return contest_result(contest, db)
+
+@router.get("/admin/contests/{contest_id}/winners", dependencies=[Depends(get_admin_user)])
+def get_contest_winners(contest_id: int, db: Session = Depends(get_db)):
+    return contest_result(get_contest_or_404(contest_id, db), db)
@@ -0,0 +1,125 @@
+# routers/dashboards.py
+"""Buyer, seller and admin dashboards."""
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from models import AuctionStatus, User, Auction, Bid, UserSummary, AuctionSummary, ActiveBidSummary
+from database import get_db, ShardSessions, get_shards, scatter, scatter_count
+from responses import encoded_response
+from schemas import DashboardStats
+from services.auth import AuthUser, get_current_user, get_admin_user, user_scope
+
+router = APIRouter()
+
+@router.get("/dashboard/buyer")
+def buyer_dashboard(
+    request: Request,
+    user_id: Optional[int] = None,
+    current_user: AuthUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    user_id = user_scope(user_id, current_user)
+    # Three indexed reads on auction.db. The lists stay in the summary rows they
+    # come from: copying them into user_summaries would make every bid and
+    # settlement rewrite each bidder's row as well
+    # Active bids
+    active_bids = db.query(
+        ActiveBidSummary.bid_id, ActiveBidSummary.amount, AuctionSummary.product_name, AuctionSummary.end_time
+    ).join(AuctionSummary, AuctionSummary.auction_id == ActiveBidSummary.auction_id).filter(
+        ActiveBidSummary.bidder_id == user_id
+    ).order_by(ActiveBidSummary.bid_id).all()
+    
+    # Won items
+    won_auctions = db.query(
+        AuctionSummary.auction_id, AuctionSummary.product_name, AuctionSummary.current_highest_bid
+    ).filter(AuctionSummary.winner_id == user_id).order_by(AuctionSummary.auction_id).all()
+    
+    totals = db.get(UserSummary, user_id)
+    
+    return encoded_response(request, {
+        "active_bids": len(active_bids),
+        "won_items": len(won_auctions),
+        "total_bids": totals.total_bids if totals else 0,
+        "active_bids_details": [
+            {
+                "bid_id": bid.bid_id,
+                "amount": bid.amount,
+                "auction_name": bid.product_name,
+                "auction_end_time": bid.end_time
+            } for bid in active_bids
+        ],
+        "won_items_details": [
+            {
+                "auction_id": auction.auction_id,
+                "product_name": auction.product_name,
+                "winning_bid": auction.current_highest_bid
+            } for auction in won_auctions
+        ]
+    })
+
+@router.get("/dashboard/seller")
+def seller_dashboard(
+    request: Request,
+    user_id: Optional[int] = None,
+    current_user: AuthUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    user_id = user_scope(user_id, current_user)
+    # Seller's started and sold auctions
+    auctions = db.query(
+        AuctionSummary.auction_id, AuctionSummary.status, AuctionSummary.product_name,
+        AuctionSummary.current_highest_bid, AuctionSummary.end_time, AuctionSummary.winner_id
+    ).filter(
+        AuctionSummary.seller_id == user_id,
+        AuctionSummary.status.in_([AuctionStatus.ACTIVE, AuctionStatus.WINNER_SELECTED])
+    ).order_by(AuctionSummary.auction_id).all()
+    active_auctions = [a for a in auctions if a.status == AuctionStatus.ACTIVE]
+    completed_auctions = [a for a in auctions if a.status == AuctionStatus.WINNER_SELECTED]
+    
+    # Calculate earnings
+    total_earnings = sum(a.current_highest_bid for a in completed_auctions)
+    totals = db.get(UserSummary, user_id)
+    
+    return encoded_response(request, {
+        "total_auctions": totals.total_auctions if totals else 0,
+        "active_auctions": len(active_auctions),
+        "completed_auctions": len(completed_auctions),
+        "total_earnings": total_earnings,
+        "active_auctions_details": [
+            {
+                "auction_id": auction.auction_id,
+                "product_name": auction.product_name,
+                "current_highest_bid": auction.current_highest_bid,
+                "end_time": auction.end_time
+            } for auction in active_auctions
+        ],
+        "completed_auctions_details": [
+            {
+                "auction_id": auction.auction_id,
+                "product_name": auction.product_name,
+                "final_price": auction.current_highest_bid,
+                "winner_id": auction.winner_id
+            } for auction in completed_auctions
+        ]
+    })
+
+@router.get("/dashboard/admin", dependencies=[Depends(get_admin_user)], response_model=DashboardStats)
+def admin_dashboard(shards: ShardSessions = Depends(get_shards)):
+    # System statistics
+    active_auctions = scatter_count(shards, lambda db: db.query(Auction).filter(Auction.status == AuctionStatus.ACTIVE))
+    total_users = shards.db.query(User).count()
+    total_bids = scatter_count(shards, lambda db: db.query(Bid))
+    
+    # Calculate total sales volume
+    completed_auctions = scatter(shards, lambda db: db.query(Auction).filter(
+        Auction.status == AuctionStatus.WINNER_SELECTED
+    ))
+    total_sales_volume = sum(auction.current_highest_bid for auction in completed_auctions)
+    
+    return DashboardStats(
+        active_auctions=active_auctions,
+        total_users=total_users,
+        total_sales_volume=total_sales_volume,
+        total_bids=total_bids
+    )
@@ -0,0 +1,115 @@
+# routers/exports.py
+"""Streaming admin exports."""
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from typing import Optional, List
+from datetime import datetime
+import enum
+import json
+import csv
+import io
+import zlib
+import heapq
+import itertools
+from contextlib import ExitStack
+
+from models import SHARDED_TABLES, User, Auction, Bid, Notification
+import database
+from services.auth import get_admin_user
+
+router = APIRouter()
+
+# Streaming admin exports
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_TABLES = {
+    "users": (User, ["id", "email", "user_type", "created_at", "is_active"], "created_at"),
+    "auctions": (Auction, ["id", "product_name", "description", "base_price", "current_highest_bid",
+                           "start_time", "end_time", "status", "image_url", "seller_id", "winner_id",
+                           "created_at"], "created_at"),
+    "bids": (Bid, ["id", "amount", "bid_time", "bidder_id", "auction_id"], "bid_time"),
+    "notifications": (Notification, ["id", "user_id", "message", "is_read", "created_at"], "created_at"),
+}
+
+def export_value(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def iter_export(stmt, columns: List[str], file_format: str, compress: bool, engines):
+    """Encode rows from server-side cursors in batches, optionally gzipped.
+    
+    Rows of a sharded table are merged from every shard in id order.
+    """
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    
+    def emit(text: str):
+        data = text.encode("utf-8")
+        return compressor.compress(data) if compressor else data
+    
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if file_format == "csv":
+        writer.writerow(columns)
+        yield emit(buffer.getvalue())
+    
+    with ExitStack() as stack:
+        results = [
+            stack.enter_context(export_engine.connect()).execution_options(stream_results=True).execute(stmt)
+            for export_engine in engines
+        ]
+        merged = results[0] if len(results) == 1 else heapq.merge(*results, key=lambda row: row[0])
+        while True:
+            rows = list(itertools.islice(merged, EXPORT_BATCH_SIZE))
+            if not rows:
+                break
+            buffer.seek(0)
+            buffer.truncate()
+            if file_format == "csv":
+                writer.writerows([export_value(v) for v in row] for row in rows)
+            else:
+                for row in rows:
+                    buffer.write(json.dumps(dict(zip(columns, (export_value(v) for v in row)))))
+                    buffer.write("\n")
+            chunk = emit(buffer.getvalue())
+            if chunk:
+                yield chunk
+    
+    if compressor:
+        yield compressor.flush()
+
+@router.get("/admin/export/{entity}", dependencies=[Depends(get_admin_user)])
+def export_admin_data(
+    entity: str,
+    file_format: str = "csv",
+    gzip: bool = False,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None
+):
+    """Stream a full table export as CSV or NDJSON with constant memory"""
+    if entity not in EXPORT_TABLES:
+        raise HTTPException(status_code=404, detail=f"Unknown export '{entity}'")
+    if file_format not in ("csv", "ndjson"):
+        raise HTTPException(status_code=400, detail="file_format must be 'csv' or 'ndjson'")
+    
+    model, columns, date_column = EXPORT_TABLES[entity]
+    stmt = select(*[getattr(model, name) for name in columns]).order_by(model.id)
+    if since:
+        stmt = stmt.where(getattr(model, date_column) >= since)
+    if until:
+        stmt = stmt.where(getattr(model, date_column) < until)
+    
+    filename = f"{entity}.{file_format}"
+    media_type = "text/csv" if file_format == "csv" else "application/x-ndjson"
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+    engines = database.shard_router.engines if model.__table__ in SHARDED_TABLES else [database.engine]
+    return StreamingResponse(
+        iter_export(stmt, columns, file_format, gzip, engines),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
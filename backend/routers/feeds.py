@@ -0,0 +1,22 @@
+# routers/feeds.py
+"""Homepage feeds."""
+from fastapi import APIRouter
+from datetime import datetime, timedelta
+
+from services.feeds import feed_index
+
+router = APIRouter()
+
+# Homepage feeds
+FEED_MAX_LIMIT = 100
+
+@router.get("/feeds/ending-soon")
+def get_ending_soon_feed(within_minutes: int = 60, limit: int = 20):
+    """Active auctions ending within the next window, soonest first (served from memory)"""
+    now = datetime.utcnow()
+    return feed_index.ending_soon(now, now + timedelta(minutes=within_minutes), min(limit, FEED_MAX_LIMIT))
+
+@router.get("/feeds/hot")
+def get_hot_feed(limit: int = 20):
+    """Active auctions with the highest recent bid rate (served from memory)"""
+    return feed_index.hottest(min(limit, FEED_MAX_LIMIT))
@@ -0,0 +1,44 @@
+# routers/leaderboards.py
+"""Admin leaderboards."""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from datetime import datetime
+
+from models import User
+from leaderboard import Leaderboard
+from database import get_db, day_number
+from services.leaderboards import LEADERBOARD_WINDOWS, leaderboards
+from services.auth import get_admin_user
+
+router = APIRouter()
+
+LEADERBOARD_MAX_LIMIT = 100
+
+def leaderboard_for(board: str, window: str) -> Leaderboard:
+    if board not in leaderboards:
+        raise HTTPException(status_code=404, detail="Leaderboard not found")
+    if window not in LEADERBOARD_WINDOWS:
+        raise HTTPException(status_code=400, detail=f"window must be one of: {', '.join(LEADERBOARD_WINDOWS)}")
+    return leaderboards[board]
+
+@router.get("/admin/leaderboards/{board}", dependencies=[Depends(get_admin_user)])
+def get_leaderboard(board: str, window: str = "all", limit: int = 10, db: Session = Depends(get_db)):
+    """Top buyers by spend, sellers by sales volume or bidders by bids placed"""
+    leaderboard = leaderboard_for(board, window)
+    entries, size = leaderboard.top(window, max(0, min(limit, LEADERBOARD_MAX_LIMIT)), day_number(datetime.utcnow()))
+    emails = dict(db.query(User.id, User.email).filter(User.id.in_([user_id for user_id, _ in entries])).all())
+    return {
+        "board": board,
+        "window": window,
+        "size": size,
+        "entries": [
+            {"rank": rank, "user_id": user_id, "email": emails.get(user_id), "score": round(score, 2)}
+            for rank, (user_id, score) in enumerate(entries, start=1)
+        ]
+    }
+
+@router.get("/admin/leaderboards/{board}/users/{user_id}", dependencies=[Depends(get_admin_user)])
+def get_leaderboard_rank(board: str, user_id: int, window: str = "all"):
+    """A user's rank and score on a leaderboard; rank is null for users without a score"""
+    rank, score, size = leaderboard_for(board, window).rank(window, user_id, day_number(datetime.utcnow()))
+    return {"board": board, "window": window, "user_id": user_id, "rank": rank, "score": round(score, 2), "size": size}
@@ -0,0 +1,54 @@
+# routers/notifications.py
+"""User notifications."""
+from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from models import Notification
+import database
+from database import ShardSessions, get_shards, commit_with_changes
+from services.auth import AuthUser, get_current_user, user_scope, acting_user_id
+
+router = APIRouter()
+
+@router.get("/notifications")
+def get_notifications(
+    user_id: Optional[int] = None,
+    current_user: AuthUser = Depends(get_current_user),
+    shards: ShardSessions = Depends(get_shards)
+):
+    user_id = user_scope(user_id, current_user)
+    notifications = shards.get(database.shard_router.shard_for_user(user_id)).query(Notification).filter(
+        Notification.user_id == user_id
+    ).order_by(Notification.created_at.desc())
+    
+    return [
+        {
+            "id": notification.id,
+            "message": notification.message,
+            "is_read": notification.is_read,
+            "created_at": notification.created_at
+        } for notification in notifications
+    ]
+
+@router.put("/notifications/{notification_id}/read")
+def mark_notification_read(
+    notification_id: int,
+    user_id: Optional[int] = None,
+    current_user: AuthUser = Depends(get_current_user),
+    shards: ShardSessions = Depends(get_shards)
+):
+    user_id = acting_user_id(user_id, current_user)
+    # Notifications are stored on their user's shard
+    db = shards.get(database.shard_router.shard_for_user(user_id))
+    notification = db.query(Notification).filter(
+        Notification.id == notification_id,
+        Notification.user_id == user_id
+    ).first()
+    
+    if not notification:
+        raise HTTPException(status_code=404, detail="Notification not found")
+    
+    notification.is_read = True
+    commit_with_changes(db, [("notification", notification.id, user_id)])
+    
+    return {"message": "Notification marked as read"}
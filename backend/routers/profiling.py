@@ -0,0 +1,73 @@
+# routers/profiling.py
+"""Sampling profiles of the worker, on demand or per route."""
+from fastapi import APIRouter, Depends, HTTPException, Response
+from typing import Optional
+import threading
+import time
+
+import profiler
+from services.auth import AuthUser, get_admin_user
+from services.events import worker_id
+
+router = APIRouter()
+
+# Sampling profiler (settings.profile_continuous also keeps per-route profiles
+# of the last PROFILE_SLOTS minutes)
+PROFILE_MAX_SECONDS = 10
+PROFILE_INTERVAL_MS = 5
+PROFILE_CONTINUOUS_INTERVAL_MS = 50
+PROFILE_SLOT_SECONDS = 60
+PROFILE_SLOTS = 60
+
+route_profiler = profiler.RouteProfiler(
+    PROFILE_CONTINUOUS_INTERVAL_MS / 1000, PROFILE_SLOT_SECONDS, PROFILE_SLOTS
+)
+
+_profile_lock = threading.Lock()
+
+def profile_response(profile: profiler.Profile, name: str, format: str):
+    if format == "collapsed":
+        return Response(profile.collapsed(), media_type="text/plain")
+    if format == "speedscope":
+        return profile.speedscope(name)
+    raise HTTPException(status_code=400, detail="format must be 'collapsed' or 'speedscope'")
+
+@router.get("/admin/profile")
+def profile_worker(
+    seconds: float = 5,
+    format: str = "collapsed",
+    include_idle: bool = False,
+    admin: AuthUser = Depends(get_admin_user)
+):
+    """Sample every thread of this worker for a few seconds and return the aggregated stacks"""
+    if not 0 < seconds <= PROFILE_MAX_SECONDS:
+        raise HTTPException(status_code=400, detail=f"seconds must be between 0 and {PROFILE_MAX_SECONDS}")
+    if format not in ("collapsed", "speedscope"):
+        raise HTTPException(status_code=400, detail="format must be 'collapsed' or 'speedscope'")
+    # One capture at a time keeps the profiler's own cost bounded
+    if not _profile_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A profile is already being captured on this worker")
+    try:
+        profile = profiler.capture(seconds, PROFILE_INTERVAL_MS / 1000, include_idle)
+    finally:
+        _profile_lock.release()
+    return profile_response(profile, f"{worker_id()} {seconds}s", format)
+
+@router.get("/admin/profile/routes")
+def profile_routes(
+    minutes: int = 10,
+    route: Optional[str] = None,
+    format: str = "collapsed",
+    admin: AuthUser = Depends(get_admin_user)
+):
+    """Continuous per-route profiles: sample counts per route, or one route's stacks"""
+    if not route_profiler.running:
+        raise HTTPException(status_code=503, detail="Continuous profiling is off; start the worker with AUCTION_PROFILE_CONTINUOUS=1")
+    since = time.time() - minutes * 60
+    if route is None:
+        counts = route_profiler.routes(since)
+        return {
+            "interval_ms": PROFILE_CONTINUOUS_INTERVAL_MS,
+            "routes": [{"route": name, "samples": samples} for name, samples in counts.most_common()]
+        }
+    return profile_response(route_profiler.profile(route, since), f"{worker_id()} {route}", format)
@@ -0,0 +1,112 @@
+# routers/sellers.py
+"""Seller auctions and earnings."""
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from models import AuctionStatus, Auction, Bid, AuctionSummary
+from database import get_db, ShardSessions, get_shards, scatter
+from responses import encoded_response
+from services.auth import AuthUser, get_current_user, user_scope
+
+router = APIRouter()
+
+@router.get("/seller/live-auctions")
+def get_seller_live_auctions(
+    user_id: Optional[int] = None,
+    current_user: AuthUser = Depends(get_current_user),
+    shards: ShardSessions = Depends(get_shards)
+):
+    """Track live auctions for sellers with real-time bid info"""
+    user_id = user_scope(user_id, current_user)
+    live_auctions = scatter(shards, lambda db: db.query(Auction).filter(
+        Auction.seller_id == user_id,
+        Auction.status == AuctionStatus.ACTIVE
+    ))
+    
+    result = []
+    for auction in live_auctions:
+        # Get latest bids
+        db = shards.for_auction(auction.id)
+        latest_bids = db.query(Bid).filter(Bid.auction_id == auction.id).order_by(Bid.bid_time.desc(), Bid.id.desc()).limit(5).all()
+        
+        result.append({
+            "auction_id": auction.id,
+            "product_name": auction.product_name,
+            "current_highest_bid": auction.current_highest_bid,
+            "base_price": auction.base_price,
+            "end_time": auction.end_time,
+            "total_bids": len(auction.bids),
+            "recent_bids": [
+                {
+                    "amount": bid.amount,
+                    "bid_time": bid.bid_time,
+                    "bidder_id": bid.bidder_id
+                } for bid in latest_bids
+            ]
+        })
+    
+    return result
+
+@router.get("/seller/completed-auctions")
+def get_seller_completed_auctions(
+    request: Request,
+    user_id: Optional[int] = None,
+    current_user: AuthUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """View completed auctions with winners and earnings"""
+    user_id = user_scope(user_id, current_user)
+    completed_auctions = db.query(
+        AuctionSummary.auction_id, AuctionSummary.product_name, AuctionSummary.current_highest_bid,
+        AuctionSummary.base_price, AuctionSummary.winner_id, AuctionSummary.end_time, AuctionSummary.total_bids
+    ).filter(
+        AuctionSummary.seller_id == user_id,
+        AuctionSummary.status == AuctionStatus.WINNER_SELECTED
+    ).order_by(AuctionSummary.auction_id).all()
+    
+    return encoded_response(request, [
+        {
+            "auction_id": auction.auction_id,
+            "product_name": auction.product_name,
+            "final_price": auction.current_highest_bid,
+            "base_price": auction.base_price,
+            "winner_id": auction.winner_id,
+            "end_time": auction.end_time,
+            "total_bids": auction.total_bids,
+            "profit": auction.current_highest_bid - auction.base_price
+        } for auction in completed_auctions
+    ])
+
+@router.get("/seller/earnings-summary")
+def get_seller_earnings_summary(
+    user_id: Optional[int] = None,
+    current_user: AuthUser = Depends(get_current_user),
+    shards: ShardSessions = Depends(get_shards)
+):
+    """Earnings summary and analytics for sellers"""
+    user_id = user_scope(user_id, current_user)
+    auctions = scatter(shards, lambda db: db.query(Auction).filter(Auction.seller_id == user_id))
+    completed_auctions = [a for a in auctions if a.status == AuctionStatus.WINNER_SELECTED]
+    
+    total_earnings = sum(auction.current_highest_bid for auction in completed_auctions)
+    total_investment = sum(auction.base_price for auction in completed_auctions)
+    total_profit = total_earnings - total_investment
+    
+    # Monthly breakdown (last 6 months)
+    monthly_earnings = {}
+    for auction in completed_auctions:
+        month_key = auction.end_time.strftime("%Y-%m")
+        if month_key not in monthly_earnings:
+            monthly_earnings[month_key] = 0
+        monthly_earnings[month_key] += auction.current_highest_bid
+    
+    return {
+        "total_auctions": len(auctions),
+        "completed_auctions": len(completed_auctions),
+        "total_earnings": total_earnings,
+        "total_profit": total_profit,
+        "average_sale_price": total_earnings / len(completed_auctions) if completed_auctions else 0,
+        "success_rate": (len(completed_auctions) / len(auctions)) * 100 if auctions else 0,
+        "monthly_breakdown": monthly_earnings
+    }
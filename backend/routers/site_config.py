@@ -0,0 +1,117 @@
+# routers/site_config.py
+"""Site config: homepage sliders and contact settings."""
+from fastapi import APIRouter, Depends, HTTPException, File, Form, UploadFile, Request, Response
+from sqlalchemy import select, insert, update, delete
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import Optional
+from datetime import datetime
+
+from models import HomeSlider, SiteSetting
+import serialization
+import siteconfig
+from schemas import SliderUpdate, ContactUpdate
+from services.site_config import reload_site_config, editing_site_config, site_config
+from services.uploads import save_upload
+from services.auth import get_admin_user
+
+router = APIRouter()
+
+# Site config (homepage sliders and contact settings). GET /site-config is
+# revalidated after SITE_CONFIG_MAX_AGE_SECONDS; with ?v=<current version> the
+# response never changes and is cached for a year
+SITE_CONFIG_MAX_AGE_SECONDS = 60
+SITE_CONFIG_STALE_SECONDS = 86400
+SITE_CONFIG_IMMUTABLE_MAX_AGE_SECONDS = 31536000
+
+# Site config: homepage sliders and contact settings
+def get_slider_or_404(slider_id: int, conn):
+    row = conn.execute(select(HomeSlider.id).where(HomeSlider.id == slider_id)).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Slider not found")
+
+def slider_from_snapshot(snapshot: siteconfig.Snapshot, slider_id: int) -> dict:
+    return next((slider for slider in snapshot.sliders if slider["id"] == slider_id), None)
+
+@router.get("/site-config")
+def get_site_config(request: Request, v: Optional[int] = None):
+    """Active homepage sliders and contact settings, served from memory.
+    
+    Clients that pass the current version as ``v`` may cache the response forever.
+    """
+    snapshot = site_config.current
+    if v is not None and v == snapshot.version:
+        cache_control = f"public, max-age={SITE_CONFIG_IMMUTABLE_MAX_AGE_SECONDS}, immutable"
+    else:
+        cache_control = (
+            f"public, max-age={SITE_CONFIG_MAX_AGE_SECONDS}, "
+            f"stale-while-revalidate={SITE_CONFIG_STALE_SECONDS}"
+        )
+    headers = {"ETag": snapshot.etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+    if siteconfig.etag_matches(request.headers.get("if-none-match"), snapshot.etag):
+        return Response(status_code=304, headers=headers)
+    body, content_encoding = snapshot.body_for(request.headers.get("accept-encoding", ""))
+    if content_encoding:
+        headers["Content-Encoding"] = content_encoding
+    return Response(content=body, media_type=serialization.JSON_MEDIA_TYPE, headers=headers)
+
+@router.get("/admin/home-sliders", dependencies=[Depends(get_admin_user)])
+def get_home_sliders():
+    # Read through, so an edit made on another worker shows up straight away
+    return {"sliders": list(reload_site_config().sliders)}
+
+@router.post("/admin/home-sliders", dependencies=[Depends(get_admin_user)])
+async def create_home_slider(
+    title: str = Form(...),
+    image: Optional[UploadFile] = File(None),
+    image_url: Optional[str] = Form(None),
+    link_url: Optional[str] = Form(None),
+    description: Optional[str] = Form(None),
+    order: int = Form(0)
+):
+    if image is not None:
+        image_url = await save_upload(image)
+    if not image_url:
+        raise HTTPException(status_code=400, detail="An image or image_url is required")
+    now = datetime.utcnow()
+    with editing_site_config() as conn:
+        slider_id = conn.execute(
+            insert(HomeSlider.__table__).values(
+                title=title, image_url=image_url, link_url=link_url, description=description,
+                order=order, is_active=True, created_at=now, updated_at=now
+            )
+        ).inserted_primary_key[0]
+    return slider_from_snapshot(site_config.current, slider_id)
+
+@router.put("/admin/home-sliders/{slider_id}", dependencies=[Depends(get_admin_user)])
+def update_home_slider(slider_id: int, update_request: SliderUpdate):
+    values = update_request.model_dump(exclude_unset=True)
+    with editing_site_config() as conn:
+        get_slider_or_404(slider_id, conn)
+        conn.execute(
+            update(HomeSlider.__table__).where(HomeSlider.id == slider_id)
+            .values(**values, updated_at=datetime.utcnow())
+        )
+    return slider_from_snapshot(site_config.current, slider_id)
+
+@router.delete("/admin/home-sliders/{slider_id}", dependencies=[Depends(get_admin_user)])
+def delete_home_slider(slider_id: int):
+    with editing_site_config() as conn:
+        get_slider_or_404(slider_id, conn)
+        conn.execute(delete(HomeSlider.__table__).where(HomeSlider.id == slider_id))
+    return {"message": "Slider deleted"}
+
+@router.get("/admin/contact", dependencies=[Depends(get_admin_user)])
+def get_contact():
+    return reload_site_config().contact
+
+@router.put("/admin/contact", dependencies=[Depends(get_admin_user)])
+def update_contact(contact: ContactUpdate):
+    settings_table = SiteSetting.__table__
+    values = contact.model_dump(exclude_unset=True)
+    with editing_site_config() as conn:
+        for key, value in values.items():
+            conn.execute(
+                sqlite_insert(settings_table).values(key=key, value=value)
+                .on_conflict_do_update(index_elements=[settings_table.c.key], set_={"value": value})
+            )
+    return site_config.current.contact
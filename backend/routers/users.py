@@ -0,0 +1,107 @@
+# routers/users.py
+"""User profiles and account status."""
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from typing import Optional, List
+
+from models import User, LedgerEntry, BalanceSnapshot
+from database import get_db, commit_with_changes
+from responses import encoded_response, parse_ids
+from services.auth import AuthUser, get_current_user, get_admin_user
+from services.events import event_bus
+
+router = APIRouter()
+
+@router.get("/users/me")
+def get_current_user_info(current_user: AuthUser = Depends(get_current_user), db: Session = Depends(get_db)):
+    user = db.query(User).filter(User.id == current_user.id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return {
+        "id": user.id,
+        "email": user.email,
+        "user_type": user.user_type.value,
+        "created_at": user.created_at,
+        "is_active": user.is_active
+    }
+
+def lookup_users(db: Session, user_ids: List[int]) -> dict:
+    """Users by id with their wallet balances, in one query."""
+    snapshots = BalanceSnapshot.__table__
+    ledger = LedgerEntry.__table__
+    tail = (
+        select(func.coalesce(func.sum(ledger.c.amount), 0.0))
+        .where(ledger.c.user_id == User.id, ledger.c.id > func.coalesce(snapshots.c.last_entry_id, 0))
+        .scalar_subquery()
+    )
+    rows = db.execute(
+        select(
+            User.id, User.email, User.user_type, User.is_active, User.created_at,
+            (func.coalesce(snapshots.c.balance, 0.0) + tail).label("balance")
+        )
+        .select_from(User.__table__.outerjoin(snapshots, snapshots.c.user_id == User.id))
+        .where(User.id.in_(user_ids))
+    )
+    return {row.id: user_to_dict(row) for row in rows}
+
+# Field names follow the admin UI's user profile
+def user_to_dict(row) -> dict:
+    return {
+        "userId": str(row.id),
+        "userName": row.email,
+        "email": row.email,
+        "phoneNumber": "",
+        "userType": row.user_type.value,
+        "isActive": row.is_active,
+        "walletBalance": round(row.balance, 2),
+        "createdAt": row.created_at
+    }
+
+@router.get("/users/batch")
+def get_users_batch(request: Request, ids: str, db: Session = Depends(get_db)):
+    """Many user profiles by id in one request"""
+    user_ids = parse_ids(ids)
+    found = lookup_users(db, user_ids)
+    return encoded_response(request, {
+        "users": [found[user_id] for user_id in user_ids if user_id in found],
+        "missing": [user_id for user_id in user_ids if user_id not in found]
+    })
+
+@router.get("/users/{user_id}")
+def get_user(request: Request, user_id: int, db: Session = Depends(get_db)):
+    found = lookup_users(db, [user_id])
+    if user_id not in found:
+        raise HTTPException(status_code=404, detail="User not found")
+    return encoded_response(request, found[user_id])
+
+# Admin endpoints
+@router.get("/admin/users", dependencies=[Depends(get_admin_user)])
+def get_all_users(db: Session = Depends(get_db)):
+    users = db.query(User).all()
+    return [
+        {
+            "id": user.id,
+            "email": user.email,
+            "user_type": user.user_type.value,
+            "created_at": user.created_at,
+            "is_active": user.is_active
+        } for user in users
+    ]
+
+@router.put("/admin/users/{user_id}/status")
+def set_user_status(
+    user_id: int,
+    is_active: bool,
+    admin: AuthUser = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Activate or deactivate a user; cached logins see the change on their next request"""
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    user.is_active = is_active
+    commit_with_changes(db, [("user", user_id, None)])
+    event_bus.publish("user.updated", {"user_id": user_id, "is_active": is_active})
+    return {"id": user.id, "is_active": user.is_active}
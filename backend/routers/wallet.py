@@ -0,0 +1,165 @@
+# routers/wallet.py
+"""Wallet balances, ledger and withdrawals."""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import Optional, List
+from datetime import datetime
+
+from models import LedgerEntryType, WithdrawalStatus, User, LedgerEntry, Withdrawal
+from database import get_db
+from schemas import WithdrawalCreate, WithdrawalStatusUpdate
+from services.ledger import post_ledger_entries, wallet_balance
+from services.settlement import SETTLEMENT_CHUNK_SIZE
+from services.auth import AuthUser, get_current_user, get_admin_user, user_scope, acting_user_id
+
+router = APIRouter()
+
+WITHDRAWAL_PAGE_SIZE = 50
+
+WITHDRAWAL_TRANSITIONS = {
+    WithdrawalStatus.PENDING: {WithdrawalStatus.PROCESSING, WithdrawalStatus.REJECTED},
+    WithdrawalStatus.PROCESSING: {WithdrawalStatus.COMPLETED, WithdrawalStatus.REJECTED},
+    WithdrawalStatus.COMPLETED: set(),
+    WithdrawalStatus.REJECTED: set(),
+}
+
+def withdrawal_to_dict(withdrawal: Withdrawal, email: Optional[str]) -> dict:
+    return {
+        "id": str(withdrawal.id),
+        "amount": withdrawal.amount,
+        "status": withdrawal.status.value,
+        "user": {"userId": str(withdrawal.user_id), "userName": email or "", "phoneNumber": ""},
+        "bankDetails": {"bankName": withdrawal.bank_name, "accountNumber": withdrawal.account_number},
+        "createdAt": withdrawal.created_at,
+        "updatedAt": withdrawal.updated_at
+    }
+
+@router.get("/wallet/balance")
+def get_wallet_balance(user_id: Optional[int] = None, current_user: AuthUser = Depends(get_current_user), db: Session = Depends(get_db)):
+    user_id = user_scope(user_id, current_user)
+    return {"user_id": user_id, "balance": wallet_balance(db.connection(), user_id)}
+
+@router.get("/wallet/ledger")
+def get_wallet_ledger(
+    user_id: Optional[int] = None,
+    before_id: Optional[int] = None,
+    limit: int = 50,
+    current_user: AuthUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Newest-first ledger page; pass next_cursor as before_id for the next page"""
+    user_id = user_scope(user_id, current_user)
+    query = db.query(LedgerEntry).filter(LedgerEntry.user_id == user_id)
+    if before_id:
+        query = query.filter(LedgerEntry.id < before_id)
+    limit = min(limit, 500)
+    entries = query.order_by(LedgerEntry.id.desc()).limit(limit).all()
+    return {
+        "entries": [
+            {
+                "id": entry.id,
+                "type": entry.entry_type.value,
+                "amount": entry.amount,
+                "reference": entry.reference,
+                "created_at": entry.created_at
+            } for entry in entries
+        ],
+        "next_cursor": entries[-1].id if len(entries) == limit else None
+    }
+
+@router.post("/wallet/withdrawals")
+def request_withdrawal(
+    withdrawal: WithdrawalCreate,
+    current_user: AuthUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    withdrawal = withdrawal.model_copy(update={"user_id": acting_user_id(withdrawal.user_id, current_user)})
+    if withdrawal.amount <= 0:
+        raise HTTPException(status_code=400, detail="Withdrawal amount must be positive")
+    
+    db_withdrawal = Withdrawal(
+        user_id=withdrawal.user_id,
+        amount=withdrawal.amount,
+        bank_name=withdrawal.bank_name,
+        account_number=withdrawal.account_number
+    )
+    db.add(db_withdrawal)
+    db.flush()
+    # The debit is written before the balance check so the check runs under
+    # the write lock and concurrent withdrawals cannot overdraw the wallet
+    post_ledger_entries(db.connection(), [{
+        "user_id": withdrawal.user_id,
+        "entry_type": LedgerEntryType.WITHDRAWAL,
+        "amount": -withdrawal.amount,
+        "reference": f"withdrawal:{db_withdrawal.id}"
+    }])
+    if wallet_balance(db.connection(), withdrawal.user_id) < 0:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Insufficient wallet balance")
+    db.commit()
+    db.refresh(db_withdrawal)
+    return withdrawal_to_dict(db_withdrawal, None)
+
+@router.get("/admin/withdrawals", dependencies=[Depends(get_admin_user)])
+def get_withdrawals(
+    status: Optional[WithdrawalStatus] = None,
+    after_id: Optional[int] = None,
+    limit: int = WITHDRAWAL_PAGE_SIZE,
+    db: Session = Depends(get_db)
+):
+    """Oldest-first withdrawal queue, paginated by id"""
+    query = db.query(Withdrawal, User.email).outerjoin(User, User.id == Withdrawal.user_id)
+    if status:
+        query = query.filter(Withdrawal.status == status)
+    if after_id:
+        query = query.filter(Withdrawal.id > after_id)
+    limit = min(limit, 500)
+    rows = query.order_by(Withdrawal.id).limit(limit).all()
+    return {
+        "withdrawals": [withdrawal_to_dict(withdrawal, email) for withdrawal, email in rows],
+        "next_cursor": rows[-1][0].id if len(rows) == limit else None
+    }
+
+def transition_withdrawals(ids: List[int], new_status: WithdrawalStatus, db: Session) -> List[int]:
+    """Move withdrawals to new_status where allowed; rejected ones are refunded."""
+    allowed_from = [old for old, targets in WITHDRAWAL_TRANSITIONS.items() if new_status in targets]
+    movable = [row.id for row in db.query(Withdrawal.id).filter(
+        Withdrawal.id.in_(ids),
+        Withdrawal.status.in_(allowed_from)
+    )]
+    if not movable:
+        return []
+    db.query(Withdrawal).filter(
+        Withdrawal.id.in_(movable),
+        Withdrawal.status.in_(allowed_from)
+    ).update({Withdrawal.status: new_status, Withdrawal.updated_at: datetime.utcnow()}, synchronize_session=False)
+    if new_status == WithdrawalStatus.REJECTED:
+        post_ledger_entries(db.connection(), [
+            {
+                "user_id": row.user_id,
+                "entry_type": LedgerEntryType.WITHDRAWAL_REVERSAL,
+                "amount": row.amount,
+                "reference": f"withdrawal:{row.id}"
+            } for row in db.query(Withdrawal.id, Withdrawal.user_id, Withdrawal.amount).filter(Withdrawal.id.in_(movable))
+        ])
+    db.commit()
+    return movable
+
+@router.put("/admin/withdrawals/status", dependencies=[Depends(get_admin_user)])
+def bulk_update_withdrawal_status(update_request: WithdrawalStatusUpdate, db: Session = Depends(get_db)):
+    updated = []
+    for start in range(0, len(update_request.ids), SETTLEMENT_CHUNK_SIZE):
+        updated.extend(transition_withdrawals(update_request.ids[start:start + SETTLEMENT_CHUNK_SIZE], update_request.status, db))
+    return {"updated": updated, "skipped": sorted(set(update_request.ids) - set(updated))}
+
+@router.put("/admin/withdrawals/{withdrawal_id}/status", dependencies=[Depends(get_admin_user)])
+def update_withdrawal_status(withdrawal_id: int, status: WithdrawalStatus, db: Session = Depends(get_db)):
+    withdrawal = db.query(Withdrawal).filter(Withdrawal.id == withdrawal_id).first()
+    if not withdrawal:
+        raise HTTPException(status_code=404, detail="Withdrawal not found")
+    if not transition_withdrawals([withdrawal_id], status, db):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot move withdrawal from {withdrawal.status.value} to {status.value}"
+        )
+    return {"message": f"Withdrawal marked as {status.value}"}
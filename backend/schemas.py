@@ -0,0 +1,104 @@
+# schemas.py
+"""Request and response bodies of the API."""
+from pydantic import BaseModel, EmailStr
+from typing import Optional, List
+from datetime import datetime
+
+from models import UserType, AuctionStatus, WithdrawalStatus
+
+# Pydantic Models
+class UserCreate(BaseModel):
+    email: EmailStr
+    password: str
+    user_type: UserType
+
+class UserLogin(BaseModel):
+    email: EmailStr
+    password: str
+    user_type: UserType
+
+class Token(BaseModel):
+    access_token: str
+    token_type: str
+    user_type: str
+    user_id: int
+
+class AuctionCreate(BaseModel):
+    product_name: str
+    description: str
+    base_price: float
+    start_time: datetime
+    end_time: datetime
+    seller_id: Optional[int] = None
+
+class AuctionResponse(BaseModel):
+    id: int
+    product_name: str
+    description: str
+    base_price: float
+    current_highest_bid: float
+    start_time: datetime
+    end_time: datetime
+    status: AuctionStatus
+    image_url: Optional[str]
+    seller_id: int
+
+class BidCreate(BaseModel):
+    auction_id: int
+    amount: float
+    bidder_id: Optional[int] = None
+
+class BidResponse(BaseModel):
+    id: int
+    amount: float
+    bid_time: datetime
+    bidder_id: int
+    auction_id: int
+
+class DashboardStats(BaseModel):
+    active_auctions: int
+    total_users: int
+    total_sales_volume: float
+    total_bids: int
+
+class ContestCreate(BaseModel):
+    name: str
+    description: Optional[str] = None
+
+class ContestEntryCreate(BaseModel):
+    user_id: int
+    weight: float = 1.0
+    seat_number: Optional[int] = None
+
+class WithdrawalCreate(BaseModel):
+    user_id: Optional[int] = None
+    amount: float
+    bank_name: Optional[str] = None
+    account_number: Optional[str] = None
+
+class WithdrawalStatusUpdate(BaseModel):
+    ids: List[int]
+    status: WithdrawalStatus
+
+# Field names follow the admin UI's prize structure payload
+class PrizeTier(BaseModel):
+    prizeRank: int
+    prizeAmount: float
+    numberOfWinners: int
+    prizeDescription: Optional[str] = None
+    winnersSeatNumbers: Optional[List[int]] = None
+
+# Fields left out of an update keep their current value
+class SliderUpdate(BaseModel):
+    title: Optional[str] = None
+    image_url: Optional[str] = None
+    link_url: Optional[str] = None
+    description: Optional[str] = None
+    order: Optional[int] = None
+    is_active: Optional[bool] = None
+
+# Field names follow the admin UI's contact settings form
+class ContactUpdate(BaseModel):
+    contactNo: Optional[str] = None
+    email: Optional[str] = None
+    website: Optional[str] = None
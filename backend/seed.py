@@ -1,24 +1,29 @@
 from datetime import datetime, timedelta
 from typing import List
 
-from main import (
-    SessionLocal,
+import database
+from models import (
     Base,
-    engine,
     User,
     Auction,
     Bid,
     Notification,
     UserType,
     AuctionStatus,
-    hash_password,
+    SHARDED_TABLES,
 )
+from services.auth import hash_password
 
 
 def reset_database() -> None:
-    """Drop and recreate all tables for a clean seed."""
-    Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
+    """Drop and recreate all tables, on auction.db and every shard, for a clean seed."""
+    database.init_database()
+    for shard_engine in database.shard_router.engines:
+        if shard_engine is not database.engine:
+            Base.metadata.drop_all(bind=shard_engine, tables=SHARDED_TABLES)
+    Base.metadata.drop_all(bind=database.engine)
+    # Opening again recreates the tables and records a fresh shard layout
+    database.init_database()
 
 
 def seed_users(db) -> dict:
@@ -251,7 +256,7 @@ def seed_auctions_and_bids(db, sellers: List[User], buyers: List[User], total_ta
 
 def main() -> None:
     reset_database()
-    db = SessionLocal()
+    db = database.SessionLocal()
     try:
         users = seed_users(db)
         auctions = seed_auctions_and_bids(db, users["sellers"], users["buyers"], total_target=20)
@@ -0,0 +1,100 @@
+# serialization.py
+"""Response body encoding and compression for the list endpoints.
+
+orjson, msgpack and brotli are optional: without them JSON is encoded by the
+standard library, MessagePack requests get JSON and brotli requests get gzip.
+"""
+import enum
+import gzip
+import json
+from datetime import datetime
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+
+GZIP_LEVEL = 6
+# Brotli's high qualities are meant for static assets; 5 is a good on-the-fly tradeoff
+BROTLI_QUALITY = 5
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+
+def dumps_json(content):
+    """JSON bytes in the same shape FastAPI's default response would produce."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_msgpack(content):
+    # Datetimes are sent as the same ISO strings the JSON responses use
+    return msgpack.packb(content, default=_default, use_bin_type=True)
+
+
+def _accepted(header, tokens):
+    """First of ``tokens`` listed in an Accept-style header with a non-zero q-value."""
+    offered = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        offered[name.strip().lower()] = quality
+    for token in tokens:
+        if offered.get(token, 0.0) > 0:
+            return token
+    return None
+
+
+def encode(content, accept=""):
+    """Encode ``content`` for an Accept header; returns (body, media_type)."""
+    if msgpack is not None and accept:
+        media_type = _accepted(accept, MSGPACK_MEDIA_TYPES)
+        if media_type:
+            return dumps_msgpack(content), media_type
+    return dumps_json(content), JSON_MEDIA_TYPE
+
+
+def content_coding(accept_encoding=""):
+    """The compression to use for an Accept-Encoding header, or None."""
+    if not accept_encoding:
+        return None
+    return _accepted(accept_encoding, ("br", "gzip") if brotli is not None else ("gzip",))
+
+
+def compress(body, accept_encoding="", min_size=1024):
+    """Compress ``body`` for an Accept-Encoding header; returns (body, content_encoding or None)."""
+    if len(body) < min_size:
+        return body, None
+    coding = content_coding(accept_encoding)
+    if coding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY), coding
+    if coding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL), coding
+    return body, None
@@ -0,0 +1,2 @@
+# services/__init__.py
+"""The work behind the API, shared by the routers, the background jobs and the scripts."""
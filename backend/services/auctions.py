@@ -0,0 +1,209 @@
+# services/auctions.py
+"""Creating, importing and reading auctions."""
+from fastapi import UploadFile
+from sqlalchemy import select, insert
+from sqlalchemy.sql import func
+from sqlalchemy.exc import SQLAlchemyError
+from typing import Optional, List
+from datetime import datetime
+import json
+import logging
+import csv
+import io
+from collections import defaultdict
+
+from models import AuctionStatus, User, Auction, Bid
+import database
+from database import ShardSessions, scatter_page, commit_with_changes
+from schemas import AuctionCreate, AuctionResponse
+from services.dashboards import count_auctions, summarize_imported_auctions
+from services.events import event_bus
+from services.idempotency import IdempotencyClaim
+
+logger = logging.getLogger("auction")
+
+def insert_auction(auction: AuctionCreate, shards: ShardSessions, claim: Optional[IdempotencyClaim] = None) -> AuctionResponse:
+    auction_id = database.shard_router.allocate("auctions")
+    db = shards.for_auction(auction_id)
+    db_auction = Auction(
+        id=auction_id,
+        product_name=auction.product_name,
+        description=auction.description,
+        base_price=auction.base_price,
+        start_time=auction.start_time,
+        end_time=auction.end_time,
+        seller_id=auction.seller_id,
+        current_highest_bid=auction.base_price
+    )
+    db.add(db_auction)
+    db.flush()
+    response = AuctionResponse(
+        id=db_auction.id,
+        product_name=db_auction.product_name,
+        description=db_auction.description,
+        base_price=db_auction.base_price,
+        current_highest_bid=db_auction.current_highest_bid,
+        start_time=db_auction.start_time,
+        end_time=db_auction.end_time,
+        status=db_auction.status,
+        image_url=db_auction.image_url,
+        seller_id=db_auction.seller_id
+    )
+    if claim is not None:
+        claim.save(db.connection(), response)
+    commit_with_changes(
+        db, [("auction", db_auction.id, None)],
+        lambda conn, shard_conn: count_auctions(conn, [{"id": db_auction.id, "seller_id": db_auction.seller_id}])
+    )
+    return response
+
+def is_utf8(values) -> bool:
+    """False if any of the strings kept bytes that did not decode (see iter_import_rows)."""
+    try:
+        for value in values:
+            value.encode("utf-8")
+    except UnicodeEncodeError:
+        return False
+    return True
+
+def iter_import_rows(file: UploadFile, file_format: str):
+    """Yield (row_number, dict or error message) from a CSV/NDJSON upload, one line at a time.
+    
+    Bytes that are not UTF-8 are carried through as surrogates, so a bad row
+    is reported on its own instead of failing the whole upload.
+    """
+    text = io.TextIOWrapper(file.file, encoding="utf-8", errors="surrogateescape", newline="")
+    if file_format == "csv":
+        reader = csv.DictReader(text)
+        row_number = 0
+        while True:
+            row_number += 1
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                yield row_number, f"Invalid CSV: {e}"
+                continue
+            extra = row.pop(None, None)
+            if extra:
+                yield row_number, f"Row has {len(extra)} more fields than the header"
+            elif not is_utf8(text for pair in row.items() for text in pair if text is not None):
+                yield row_number, "Row is not valid UTF-8"
+            else:
+                yield row_number, {k: v for k, v in row.items() if v not in (None, "")}
+    else:
+        for row_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield row_number, f"Invalid JSON: {e}"
+                continue
+            if not isinstance(row, dict):
+                yield row_number, "Row must be a JSON object"
+            elif not is_utf8(text for pair in row.items() for text in pair if isinstance(text, str)):
+                yield row_number, "Row is not valid UTF-8"
+            else:
+                yield row_number, row
+
+def insert_auction_chunk(rows: List[dict], shards: ShardSessions) -> Optional[str]:
+    """Insert validated rows in one transaction on one shard and announce the new auctions.
+    
+    The chunk's ids are reserved so that they all fall on the same shard,
+    which makes it all or nothing. Returns None, or why the rows were refused.
+    """
+    now = datetime.utcnow()
+    ids = database.shard_router.reserve_colocated("auctions", len(rows))
+    for offset, row in enumerate(rows):
+        if ids is not None:
+            row["id"] = ids[offset]
+        # Register with the lifecycle up front instead of waiting for the next sweep
+        row["status"] = AuctionStatus.ACTIVE if row["start_time"] <= now < row["end_time"] else AuctionStatus.CREATED
+        row["current_highest_bid"] = row["base_price"]
+        row["created_at"] = now
+    shard = database.shard_router.shard_for(rows[0].get("id"))
+    db = shards.get(shard)
+    try:
+        db.execute(insert(Auction.__table__), rows)
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.warning("Import chunk of %d auctions failed: %s", len(rows), e)
+        return f"Not imported: {getattr(e, 'orig', None) or e}"
+    if ids is None:
+        # SQLite holds the write lock for the whole transaction, so the ids are contiguous
+        last_id = db.execute(select(func.max(Auction.id))).scalar()
+        for offset, row in enumerate(rows, start=last_id - len(rows) + 1):
+            row["id"] = offset
+    commit_with_changes(
+        db, [("auction", row["id"], None) for row in rows],
+        lambda conn, shard_conn: summarize_imported_auctions(conn, rows)
+    )
+    event_bus.publish("auctions.imported", {
+        "shard": shard,
+        "first_id": rows[0]["id"],
+        "last_id": rows[-1]["id"],
+        "count": len(rows)
+    })
+    return None
+
+AUCTION_FIELDS = (
+    "id", "product_name", "description", "base_price", "current_highest_bid",
+    "start_time", "end_time", "status", "image_url", "seller_id"
+)
+ADMIN_AUCTION_FIELDS = (
+    "id", "product_name", "base_price", "current_highest_bid", "status",
+    "seller_id", "winner_id", "start_time", "end_time"
+)
+
+def auction_page(shards: ShardSessions, names: List[str], criteria=(), skip: int = 0, limit: Optional[int] = None) -> List[dict]:
+    """Selected auction columns as plain dicts, without building ORM objects or models."""
+    columns = [getattr(Auction, name) for name in names]
+    rows = scatter_page(shards, lambda db: db.query(*columns).filter(*criteria), skip, limit)
+    return [dict(zip(names, row)) for row in rows]
+
+AUCTION_INCLUDES = ("bid_count", "top_bid", "winner_email")
+
+def lookup_auctions(shards: ShardSessions, auction_ids: List[int], names: List[str], includes: List[str]) -> dict:
+    """Auctions by id with one IN query per shard; bid aggregates come from a join in the same statement."""
+    by_shard = defaultdict(list)
+    for auction_id in auction_ids:
+        by_shard[database.shard_router.shard_for(auction_id)].append(auction_id)
+    
+    found = {}
+    winner_ids = {}
+    for shard, ids in by_shard.items():
+        source = Auction.__table__
+        extra = []
+        if "bid_count" in includes or "top_bid" in includes:
+            stats = (
+                select(Bid.auction_id, func.count(Bid.id).label("bid_count"), func.max(Bid.amount).label("top_bid"))
+                .where(Bid.auction_id.in_(ids))
+                .group_by(Bid.auction_id)
+                .subquery()
+            )
+            source = source.outerjoin(stats, stats.c.auction_id == Auction.id)
+            extra += [func.coalesce(stats.c.bid_count, 0).label("bid_count"), stats.c.top_bid.label("top_bid")]
+        if "winner_email" in includes:
+            extra.append(Auction.winner_id.label("winner_ref"))
+        rows = shards.get(shard).execute(
+            select(*[getattr(Auction, name) for name in names], *extra).select_from(source).where(Auction.id.in_(ids))
+        )
+        for row in rows:
+            item = dict(zip(names, row))
+            values = row._mapping
+            for name in ("bid_count", "top_bid"):
+                if name in includes:
+                    item[name] = values[name]
+            if "winner_email" in includes:
+                winner_ids[item["id"]] = values["winner_ref"]
+            found[item["id"]] = item
+    
+    if winner_ids:
+        emails = dict(shards.db.execute(
+            select(User.id, User.email).where(User.id.in_({user_id for user_id in winner_ids.values() if user_id}))
+        ).all())
+        for auction_id, winner_id in winner_ids.items():
+            found[auction_id]["winner_email"] = emails.get(winner_id)
+    return found
@@ -0,0 +1,89 @@
+# services/audit.py
+"""The tamper-evident bid audit log: hash chains and Merkle windows per shard."""
+from sqlalchemy import select, insert, update, bindparam
+from datetime import datetime
+from typing import Callable, Optional
+import json
+
+from models import Bid, BidAuditEntry, AuditWindow
+import merkle
+from database import main_db_connection
+
+# Bid audit log
+AUDIT_HASH_BATCH_SIZE = 5000
+
+def bid_audit_payload(bid: Bid) -> str:
+    return json.dumps({
+        "bid_id": bid.id,
+        "auction_id": bid.auction_id,
+        "bidder_id": bid.bidder_id,
+        "amount": bid.amount,
+        "bid_time": bid.bid_time.isoformat()
+    }, sort_keys=True, separators=(",", ":"))
+
+def hash_bid_audit_log(shard_engine, fence: Optional[Callable] = None) -> int:
+    """Extend a shard's hash chain over entries appended since the last run.
+    
+    ``fence``, given a connection on auction.db, raises to roll a batch back
+    once this worker is no longer the leader.
+    """
+    log = BidAuditEntry.__table__
+    hashed = 0
+    while True:
+        with shard_engine.begin() as conn:
+            pending = conn.execute(
+                select(log.c.id, log.c.payload).where(log.c.entry_hash.is_(None)).order_by(log.c.id).limit(AUDIT_HASH_BATCH_SIZE)
+            ).all()
+            if not pending:
+                return hashed
+            prev_hash = conn.execute(
+                select(log.c.entry_hash).where(log.c.entry_hash.isnot(None)).order_by(log.c.id.desc()).limit(1)
+            ).scalar() or merkle.GENESIS_HASH
+            updates = []
+            for row in pending:
+                entry_hash = merkle.chain_hash(prev_hash, row.payload)
+                updates.append({"b_id": row.id, "b_prev": prev_hash, "b_hash": entry_hash})
+                prev_hash = entry_hash
+            conn.execute(
+                update(log).where(log.c.id == bindparam("b_id")).values(prev_hash=bindparam("b_prev"), entry_hash=bindparam("b_hash")),
+                updates
+            )
+            if fence:
+                with main_db_connection(conn) as main_conn:
+                    fence(main_conn)
+        hashed += len(pending)
+
+def anchor_bid_audit_log(shard_engine, fence: Optional[Callable] = None):
+    """Close a shard's current audit window: hash new entries and record their Merkle root.
+    
+    Every shard keeps its own chain and windows, so bids on different shards
+    never have to be ordered against each other.
+    """
+    hash_bid_audit_log(shard_engine, fence)
+    log = BidAuditEntry.__table__
+    with shard_engine.begin() as conn:
+        leaves = conn.execute(
+            select(log.c.id, log.c.entry_hash)
+            .where(log.c.window_id.is_(None), log.c.entry_hash.isnot(None))
+            .order_by(log.c.id)
+        ).all()
+        if not leaves:
+            return None
+        window_id = conn.execute(
+            insert(AuditWindow.__table__).values(
+                first_entry_id=leaves[0].id,
+                last_entry_id=leaves[-1].id,
+                leaf_count=len(leaves),
+                merkle_root=merkle.merkle_root([row.entry_hash for row in leaves]),
+                created_at=datetime.utcnow()
+            )
+        ).inserted_primary_key[0]
+        conn.execute(
+            update(log)
+            .where(log.c.id.between(leaves[0].id, leaves[-1].id), log.c.window_id.is_(None))
+            .values(window_id=window_id)
+        )
+        if fence:
+            with main_db_connection(conn) as main_conn:
+                fence(main_conn)
+    return window_id
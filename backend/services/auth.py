@@ -0,0 +1,137 @@
+# services/auth.py
+"""Passwords, access tokens and the dependencies that authenticate a request.
+
+Endpoints that need the caller's identity depend on get_current_user,
+admin-only ones on get_admin_user; the rest still take user ids as parameters.
+"""
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
+from typing import Optional
+from datetime import datetime, timedelta
+import jwt
+import bcrypt
+import time
+from collections import namedtuple
+
+from models import UserType, User
+import database
+from services.cache import TTLCache
+from services.events import event_bus
+
+# JWT Configuration
+SECRET_KEY = "your-secret-key-change-in-production"
+ALGORITHM = "HS256"
+ACCESS_TOKEN_EXPIRE_MINUTES = 30
+# Verified tokens are cached until they expire; user records for this long
+AUTH_CACHE_SIZE = 10000
+AUTH_USER_TTL_SECONDS = 60
+
+# Utility functions
+def hash_password(password: str) -> str:
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+
+def verify_password(password: str, hashed_password: str) -> bool:
+    return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
+    to_encode = data.copy()
+    if expires_delta:
+        expire = datetime.utcnow() + expires_delta
+    else:
+        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    to_encode.update({"exp": expire})
+    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    return encoded_jwt
+
+def token_subject(token: str) -> Optional[int]:
+    """User id a token was issued to, expired or not; None for forged or malformed tokens."""
+    try:
+        return int(jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM], options={"verify_exp": False})["sub"])
+    except (jwt.InvalidTokenError, KeyError, ValueError):
+        return None
+
+AuthUser = namedtuple("AuthUser", "id email user_type is_active")
+
+class TokenAuthenticator:
+    """Verifies bearer tokens from create_access_token, caching tokens and users.
+    
+    A token is decoded once and its claims cached until it expires; the user
+    it names is cached for AUTH_USER_TTL_SECONDS. Activating or deactivating a
+    user publishes user.updated, which drops the cached record on every
+    worker. A request whose token and user are both cached does no JWT work
+    and no query.
+    """
+    
+    def __init__(self, cache_size: int, user_ttl: float):
+        self.user_ttl = user_ttl
+        self._tokens = TTLCache(cache_size)
+        self._users = TTLCache(cache_size)
+    
+    def authenticate(self, token: str) -> AuthUser:
+        user_id = self._tokens.get(token)
+        if user_id is None:
+            user_id = self._verify(token)
+        user = self._users.get(user_id)
+        if user is None:
+            with database.SessionLocal() as db:
+                row = db.execute(
+                    select(User.id, User.email, User.user_type, User.is_active).where(User.id == user_id)
+                ).first()
+            if row is None:
+                raise HTTPException(status_code=401, detail="User not found", headers={"WWW-Authenticate": "Bearer"})
+            user = self._users.put(user_id, AuthUser(*row), self.user_ttl)
+        if not user.is_active:
+            raise HTTPException(status_code=403, detail="Account is deactivated")
+        return user
+    
+    def invalidate_user(self, user_id: int):
+        self._users.pop(user_id)
+    
+    def _verify(self, token: str) -> int:
+        try:
+            claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM], options={"require": ["exp", "sub"]})
+            user_id = int(claims["sub"])
+        except jwt.ExpiredSignatureError:
+            raise HTTPException(status_code=401, detail="Token has expired", headers={"WWW-Authenticate": "Bearer"})
+        except (jwt.InvalidTokenError, ValueError):
+            raise HTTPException(status_code=401, detail="Invalid token", headers={"WWW-Authenticate": "Bearer"})
+        self._tokens.put(token, user_id, claims["exp"] - time.time())
+        return user_id
+
+authenticator = TokenAuthenticator(AUTH_CACHE_SIZE, AUTH_USER_TTL_SECONDS)
+event_bus.subscribe("user.updated", lambda event: authenticator.invalidate_user(event["user_id"]))
+bearer_scheme = HTTPBearer(auto_error=False)
+
+def get_current_user(credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)) -> AuthUser:
+    if credentials is None:
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+    return authenticator.authenticate(credentials.credentials)
+
+def get_optional_user(credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)) -> Optional[AuthUser]:
+    return authenticator.authenticate(credentials.credentials) if credentials else None
+
+def get_admin_user(current_user: AuthUser = Depends(get_current_user)) -> AuthUser:
+    if current_user.user_type != UserType.ADMIN:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user
+
+def get_seller_user(current_user: AuthUser = Depends(get_current_user)) -> AuthUser:
+    # The admin panel lists auctions of its own as contests
+    if current_user.user_type not in (UserType.SELLER, UserType.ADMIN):
+        raise HTTPException(status_code=403, detail="Seller access required")
+    return current_user
+
+def user_scope(user_id: Optional[int], current_user: AuthUser) -> int:
+    """The user a read is for: the caller, or any ``user_id`` when the caller is an admin."""
+    if user_id is None or user_id == current_user.id:
+        return current_user.id
+    if current_user.user_type != UserType.ADMIN:
+        raise HTTPException(status_code=403, detail="Cannot access another user's data")
+    return user_id
+
+def acting_user_id(user_id: Optional[int], current_user: AuthUser) -> int:
+    """The caller's id for a write; a user id sent along with it must be the caller's own."""
+    if user_id is not None and user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Cannot act for another user")
+    return current_user.id
@@ -0,0 +1,296 @@
+# services/bids.py
+"""Placing bids, one at a time or group-committed by the BidWriter."""
+from fastapi import HTTPException
+from sqlalchemy import select, insert, update, bindparam
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from typing import Optional, List
+from datetime import datetime
+import logging
+import threading
+import time
+import queue
+from collections import defaultdict
+from concurrent.futures import Future
+
+from models import AuctionStatus, Auction, Bid, BidAuditEntry
+import database
+from database import tracer, ShardSessions, commit_with_changes, notify, deliver_notifications
+from schemas import BidCreate, BidResponse
+from services.audit import bid_audit_payload
+from services.dashboards import summarize_bids
+from services.events import event_bus
+from services.idempotency import IdempotencyClaim
+
+logger = logging.getLogger("auction")
+
+# Set by start_app when settings.bid_flush_window_ms turns on group commit
+bid_writer = None
+
+def submit_bid(bid: BidCreate, shards: ShardSessions, claim: Optional[IdempotencyClaim] = None) -> BidResponse:
+    writer = bid_writer
+    if writer is not None:
+        return writer.submit(bid, claim)
+    
+    # The auction and its bids share a shard, so a bid is a single-file
+    # transaction; the seller's notification joins it when the seller lives there too
+    db = shards.for_auction(bid.auction_id)
+    
+    # Check if auction exists and is active
+    auction = db.query(Auction).filter(Auction.id == bid.auction_id).first()
+    check_bid(auction, bid)
+    
+    # The id is taken before the flush below locks the shard
+    bid_id = database.shard_router.allocate("bids")
+    
+    db_bid, notification = add_bid(db, auction, bid, bid_id)
+    response = bid_response(db_bid)
+    event = bid_placed_event(db_bid)
+    changes = [("auction", auction.id, None)]
+    remote = notify(db.connection(), [notification], changes)
+    if claim is not None:
+        claim.save(db.connection(), response)
+    with tracer.span("bid.commit"):
+        commit_with_changes(db, changes, lambda conn, shard_conn: summarize_bids(conn, [db_bid]))
+    deliver_notifications(remote)
+    
+    event_bus.publish("bid.placed", event)
+    return response
+
+def check_bid(auction, bid: BidCreate, current_highest_bid: Optional[float] = None):
+    """Reject a bid on a missing or inactive auction or below its highest bid.
+    
+    ``current_highest_bid`` overrides the auction's, for bids checked together.
+    """
+    if current_highest_bid is None and auction:
+        current_highest_bid = auction.current_highest_bid
+    if not auction:
+        raise HTTPException(status_code=404, detail="Auction not found")
+    
+    if auction.status != AuctionStatus.ACTIVE:
+        raise HTTPException(status_code=400, detail="Auction is not active")
+    # The lifecycle sweep settles it shortly; until then it takes no more bids
+    if auction.end_time <= datetime.utcnow():
+        raise HTTPException(status_code=400, detail="Auction has ended")
+    
+    # Check if bid is higher than current highest bid
+    if bid.amount <= current_highest_bid:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Bid must be higher than current highest bid of ${current_highest_bid}"
+        )
+
+def add_bid(db: Session, auction: Auction, bid: BidCreate, bid_id: Optional[int]):
+    """Write an accepted bid and its audit entry; returns the bid and the seller's notification, for notify."""
+    db_bid = Bid(
+        id=bid_id,
+        amount=bid.amount,
+        bidder_id=bid.bidder_id,
+        auction_id=bid.auction_id,
+        bid_time=datetime.utcnow()
+    )
+    db.add(db_bid)
+    db.flush()
+    
+    # Audit entry is appended unhashed; chaining happens in the background
+    db.add(BidAuditEntry(bid_id=db_bid.id, auction_id=db_bid.auction_id, payload=bid_audit_payload(db_bid)))
+    
+    # Update auction's current highest bid
+    auction.current_highest_bid = bid.amount
+    
+    db.flush()
+    
+    # Notification for seller
+    notification = {
+        "user_id": auction.seller_id,
+        "message": f"New bid of ${bid.amount} placed on your auction '{auction.product_name}'"
+    }
+    return db_bid, notification
+
+def bid_response(bid) -> BidResponse:
+    return BidResponse(
+        id=bid.id,
+        amount=bid.amount,
+        bid_time=bid.bid_time,
+        bidder_id=bid.bidder_id,
+        auction_id=bid.auction_id
+    )
+
+def bid_placed_event(bid) -> dict:
+    return {
+        "bid_id": bid.id,
+        "auction_id": bid.auction_id,
+        "bidder_id": bid.bidder_id,
+        "amount": bid.amount,
+        "bid_time": bid.bid_time.isoformat()
+    }
+
+def write_bid_batch(shard: int, items: list) -> List[dict]:
+    """Check and write queued (bid, future, bid_time, claim, trace context) items in one transaction on a shard.
+    
+    Bids are checked in queue order against the auctions as the batch leaves
+    them and keep the time they were queued at. A rejected bid's future gets
+    its HTTPException straight away, the others their BidResponse once the
+    transaction has committed. Bids, audit entries, auction updates and
+    notifications are written with one bulk statement each; idempotent
+    requests have their responses stored in the same transaction. Returns the
+    bid.placed events for the caller to publish.
+    """
+    auctions = Auction.__table__
+    bids = Bid.__table__
+    ids = [database.shard_router.allocate("bids") for _ in items]
+    db = database.shard_router.sessionmakers[shard]()
+    try:
+        conn = db.connection()
+        found = {
+            row.id: row for row in conn.execute(
+                select(auctions.c.id, auctions.c.status, auctions.c.end_time, auctions.c.current_highest_bid, auctions.c.seller_id, auctions.c.product_name)
+                .where(auctions.c.id.in_({item[0].auction_id for item in items}))
+            )
+        }
+        highest = {auction_id: row.current_highest_bid for auction_id, row in found.items()}
+        accepted = []
+        for (bid, future, bid_time, claim, _), bid_id in zip(items, ids):
+            auction = found.get(bid.auction_id)
+            try:
+                check_bid(auction, bid, highest.get(bid.auction_id))
+            except HTTPException as exc:
+                future.set_exception(exc)
+                continue
+            highest[bid.auction_id] = bid.amount
+            accepted.append((future, bid, auction, bid_id, bid_time, claim))
+        if not accepted:
+            return []
+        
+        bid_rows = [
+            {"amount": bid.amount, "bidder_id": bid.bidder_id, "auction_id": bid.auction_id, "bid_time": bid_time}
+            for _, bid, _, _, bid_time, _ in accepted
+        ]
+        notification_rows = [
+            {
+                "user_id": auction.seller_id,
+                "message": f"New bid of ${bid.amount} placed on your auction '{auction.product_name}'"
+            } for _, bid, auction, _, _, _ in accepted
+        ]
+        if database.shard_router.sharded:
+            for (_, _, _, bid_id, _, _), bid_row in zip(accepted, bid_rows):
+                bid_row["id"] = bid_id
+        conn.execute(insert(bids), bid_rows)
+        if not database.shard_router.sharded:
+            # The batch holds the write lock, so the ids SQLite gave them are contiguous
+            last_id = conn.execute(select(func.max(bids.c.id))).scalar()
+            for row_id, row in enumerate(bid_rows, start=last_id - len(bid_rows) + 1):
+                row["id"] = row_id
+        responses = [BidResponse(**row) for row in bid_rows]
+        
+        # Audit entries are appended unhashed; chaining happens in the background
+        conn.execute(insert(BidAuditEntry.__table__), [
+            {"bid_id": response.id, "auction_id": response.auction_id, "payload": bid_audit_payload(response)}
+            for response in responses
+        ])
+        conn.execute(
+            update(auctions).where(auctions.c.id == bindparam("b_id")).values(current_highest_bid=bindparam("b_amount")),
+            [{"b_id": auction_id, "b_amount": highest[auction_id]} for auction_id in {bid.auction_id for bid in responses}]
+        )
+        changes = [("auction", auction_id, None) for auction_id in {bid.auction_id for bid in responses}]
+        remote = notify(conn, notification_rows, changes)
+        for (_, _, _, _, _, claim), response in zip(accepted, responses):
+            if claim is not None:
+                claim.save(conn, response)
+        with tracer.span("bid.batch_commit", attributes={"bids": len(responses), "db.shard": shard}):
+            commit_with_changes(db, changes, lambda conn, shard_conn: summarize_bids(conn, responses))
+    finally:
+        db.close()
+    for (future, _, _, _, _, _), response in zip(accepted, responses):
+        future.set_result(response)
+    deliver_notifications(remote)
+    return [bid_placed_event(response) for response in responses]
+
+class BidWriter:
+    """Group commit for bids (settings.bid_flush_window_ms > 0).
+    
+    Requests queue their bid and wait. The writer thread takes the oldest bid,
+    gathers more for up to the flush window or until it holds max_bids, and
+    writes them with one transaction per shard, so a burst of bids shares one
+    fsync. Each request returns once the transaction holding its bid has
+    committed.
+    """
+    
+    def __init__(self, window_seconds: float, max_bids: int):
+        self.window_seconds = window_seconds
+        self.max_bids = max_bids
+        self._queue = queue.Queue()
+        self._submit_lock = threading.Lock()
+        self._stopped = False
+        self._thread = None
+    
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="bid-writer", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Write the bids already queued, then stop; later submits fail straight away."""
+        with self._submit_lock:
+            self._stopped = True
+            self._queue.put(None)
+        self._thread.join()
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not None:
+                item[1].set_exception(HTTPException(status_code=503, detail="Server is shutting down"))
+    
+    def submit(self, bid: BidCreate, claim: Optional[IdempotencyClaim] = None) -> BidResponse:
+        future = Future()
+        # Stamped under the lock, so bid times never run backwards in the queue
+        with self._submit_lock:
+            if self._stopped:
+                raise HTTPException(status_code=503, detail="Server is shutting down")
+            self._queue.put((bid, future, datetime.utcnow(), claim, tracer.current()))
+        return future.result()
+    
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.window_seconds
+            while len(batch) < self.max_bids:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    break
+                batch.append(item)
+            self._flush(batch)
+            if item is None:
+                return
+    
+    def _flush(self, batch: list):
+        # The batch joins the first sampled request's trace and links the others
+        contexts = [item[4] for item in batch if item[4] is not None]
+        sampled = [context for context in contexts if context.sampled]
+        parent = sampled[0] if sampled else (contexts[0] if contexts else None)
+        with tracer.span("bid.batch", attributes={"bids": len(batch)}, parent=parent, links=sampled[1:]):
+            by_shard = defaultdict(list)
+            for item in batch:
+                by_shard[database.shard_router.shard_for(item[0].auction_id)].append(item)
+            # auction.db first: the other shards write their change log entries there
+            for shard, items in sorted(by_shard.items()):
+                try:
+                    events = write_bid_batch(shard, items)
+                except Exception as exc:
+                    logger.exception("Bid batch failed on shard %s", shard)
+                    for _, future, _, _, _ in items:
+                        if not future.done():
+                            future.set_exception(exc)
+                    continue
+                # The bids are committed and answered; a failed publish only loses the events
+                try:
+                    event_bus.publish_many("bid.placed", events)
+                except Exception:
+                    logger.exception("Publishing bid batch failed on shard %s", shard)
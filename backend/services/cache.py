@@ -0,0 +1,57 @@
+# services/cache.py
+"""In-memory caches."""
+import threading
+import time
+from collections import OrderedDict
+
+class LRUCache:
+    """Thread-safe least-recently-used mapping with a fixed number of entries."""
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._data.get(key, default)
+            if key in self._data:
+                self._data.move_to_end(key)
+            return value
+    
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+    
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+    
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+class TTLCache(LRUCache):
+    """LRUCache whose entries also expire after their own time to live."""
+    
+    def get(self, key, default=None):
+        entry = super().get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            super().pop(key)
+            return default
+        return value
+    
+    def put(self, key, value, ttl: float):
+        super().put(key, (time.monotonic() + ttl, value))
+        return value
+    
+    def pop(self, key, default=None):
+        entry = super().pop(key)
+        return default if entry is None else entry[1]
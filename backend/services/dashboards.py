@@ -0,0 +1,249 @@
+# services/dashboards.py
+"""Per-user and per-auction summaries behind the buyer and seller dashboards."""
+from sqlalchemy import Integer, Float, literal, select, insert, update, delete, bindparam
+from sqlalchemy.sql import func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import Optional, List
+from datetime import datetime, timedelta
+from collections import Counter
+import time
+from contextlib import nullcontext, ExitStack
+
+from models import AuctionStatus, Auction, Bid, UserSummary, AuctionSummary, ActiveBidSummary, RebuiltSummary
+import database
+from database import claim_backfill, take_write_lock
+
+# Buyer and seller dashboards read per-user summaries in auction.db; the write
+# paths keep them current and rebuild_dashboards.py recomputes them
+DASHBOARD_REBUILD_CHUNK_SIZE = 500
+# A bid or auction committed this recently may still have its summary on the way
+# when a rebuild counts it (see rebuild_dashboards)
+DASHBOARD_PENDING_SUMMARY_MINUTES = 10
+# A summary queued behind a rebuild waits at most sqlite3's default lock
+# timeout for it; after that it has been applied or has given up
+DASHBOARD_SUMMARY_WAIT_SECONDS = 5
+
+# Dashboard summaries
+SUMMARY_AUCTION_COLUMNS = (
+    Auction.id, Auction.seller_id, Auction.winner_id, Auction.status, Auction.product_name,
+    Auction.description, Auction.image_url, Auction.base_price, Auction.current_highest_bid, Auction.end_time
+)
+
+def auction_summary(values, total_bids: int = 0, **overrides) -> dict:
+    """An auction_summaries row from an auction's column values."""
+    summary = {
+        "auction_id": values["id"],
+        "seller_id": values["seller_id"],
+        "winner_id": values.get("winner_id"),
+        "status": values["status"],
+        "product_name": values["product_name"],
+        "description": values.get("description"),
+        "image_url": values.get("image_url"),
+        "base_price": values["base_price"],
+        "current_highest_bid": values["current_highest_bid"],
+        "end_time": values["end_time"],
+        "total_bids": total_bids
+    }
+    summary.update(overrides)
+    return summary
+
+def upsert_auction_summaries(conn, rows: List[dict]):
+    if not rows:
+        return
+    summaries = AuctionSummary.__table__
+    stmt = sqlite_insert(summaries)
+    conn.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[summaries.c.auction_id],
+            set_={name: stmt.excluded[name] for name in rows[0] if name != "auction_id"}
+        ),
+        rows
+    )
+
+def add_user_totals(conn, column: str, totals: dict):
+    """Add per-user amounts to one of the user_summaries counters."""
+    if not totals:
+        return
+    users = UserSummary.__table__
+    stmt = sqlite_insert(users)
+    conn.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[users.c.user_id],
+            set_={column: users.c[column] + stmt.excluded[column]}
+        ),
+        [{"user_id": user_id, column: amount} for user_id, amount in totals.items()]
+    )
+
+def counted_by_rebuild(conn, entity: str, ids: List[int]) -> set:
+    """The ids a dashboard rebuild already counted, so their own summary must not count them again."""
+    rebuilt = RebuiltSummary.__table__
+    return set(conn.execute(
+        delete(rebuilt).where(rebuilt.c.entity == entity, rebuilt.c.entity_id.in_(ids)).returning(rebuilt.c.entity_id)
+    ).scalars())
+
+def summarize_bids(conn, bids: list):
+    """Count placed bids (Bid rows or BidResponses) on the dashboards; ``conn`` is on auction.db."""
+    summaries = AuctionSummary.__table__
+    rebuilt = counted_by_rebuild(conn, "bid", [bid.id for bid in bids])
+    bids = [bid for bid in bids if bid.id not in rebuilt]
+    if not bids:
+        return
+    add_user_totals(conn, "total_bids", Counter(bid.bidder_id for bid in bids))
+    per_auction = {}
+    for bid in bids:
+        count, highest = per_auction.get(bid.auction_id, (0, bid.amount))
+        per_auction[bid.auction_id] = (count + 1, max(highest, bid.amount))
+    # On other shards bids are summarized after they commit, not necessarily in order
+    conn.execute(
+        update(summaries).where(summaries.c.auction_id == bindparam("b_id")).values(
+            current_highest_bid=func.max(summaries.c.current_highest_bid, bindparam("b_amount")),
+            total_bids=summaries.c.total_bids + bindparam("b_count")
+        ),
+        [
+            {"b_id": auction_id, "b_amount": highest, "b_count": count}
+            for auction_id, (count, highest) in per_auction.items()
+        ]
+    )
+    # ...and the auction may have been settled in the meantime
+    conn.execute(
+        insert(ActiveBidSummary.__table__).prefix_with("OR IGNORE").from_select(
+            ["bidder_id", "bid_id", "auction_id", "amount"],
+            select(
+                bindparam("b_bidder", type_=Integer), bindparam("b_bid", type_=Integer),
+                summaries.c.auction_id, bindparam("b_amount", type_=Float)
+            ).where(summaries.c.auction_id == bindparam("b_auction"), summaries.c.status == AuctionStatus.ACTIVE)
+        ),
+        [
+            {"b_bidder": bid.bidder_id, "b_bid": bid.id, "b_auction": bid.auction_id, "b_amount": bid.amount}
+            for bid in bids
+        ]
+    )
+
+def count_auctions(conn, rows: List[dict]):
+    """Add new auctions (dicts with id and seller_id) to their sellers' total_auctions."""
+    rebuilt = counted_by_rebuild(conn, "auction", [row["id"] for row in rows])
+    add_user_totals(conn, "total_auctions", Counter(row["seller_id"] for row in rows if row["id"] not in rebuilt))
+
+def summarize_imported_auctions(conn, rows: List[dict]):
+    count_auctions(conn, rows)
+    upsert_auction_summaries(conn, [auction_summary(row) for row in rows if row["status"] == AuctionStatus.ACTIVE])
+
+def summarize_settlement(conn, auction_ids: List[int], winners: dict):
+    """Close settled auctions on the dashboards; ``winners`` maps auction ids to winning bids."""
+    summaries = AuctionSummary.__table__
+    if winners:
+        conn.execute(
+            update(summaries)
+            .where(summaries.c.auction_id == bindparam("b_id"))
+            .values(
+                status=AuctionStatus.WINNER_SELECTED,
+                winner_id=bindparam("b_winner"),
+                current_highest_bid=bindparam("b_amount")
+            ),
+            [
+                {"b_id": auction_id, "b_winner": bid.bidder_id, "b_amount": bid.amount}
+                for auction_id, bid in winners.items()
+            ]
+        )
+    unsold = [auction_id for auction_id in auction_ids if auction_id not in winners]
+    if unsold:
+        conn.execute(update(summaries).where(summaries.c.auction_id.in_(unsold)).values(status=AuctionStatus.ENDED))
+    conn.execute(delete(ActiveBidSummary.__table__).where(ActiveBidSummary.auction_id.in_(auction_ids)))
+
+def refresh_auction_summaries(conn, shard_conn, auction_ids: List[int]):
+    """Recompute some auctions' summaries and active bids from ``shard_conn``, their shard."""
+    rows = shard_conn.execute(select(*SUMMARY_AUCTION_COLUMNS).where(Auction.id.in_(auction_ids))).all()
+    bid_counts = dict(shard_conn.execute(
+        select(Bid.auction_id, func.count()).where(Bid.auction_id.in_(auction_ids)).group_by(Bid.auction_id)
+    ).all())
+    started = [row for row in rows if row.status != AuctionStatus.CREATED]
+    conn.execute(delete(AuctionSummary.__table__).where(
+        AuctionSummary.auction_id.in_(set(auction_ids) - {row.id for row in started})
+    ))
+    upsert_auction_summaries(conn, [auction_summary(row._mapping, bid_counts.get(row.id, 0)) for row in started])
+    conn.execute(delete(ActiveBidSummary.__table__).where(ActiveBidSummary.auction_id.in_(auction_ids)))
+    active = [row.id for row in started if row.status == AuctionStatus.ACTIVE]
+    if active:
+        bids = shard_conn.execute(
+            select(Bid.bidder_id, Bid.id.label("bid_id"), Bid.auction_id, Bid.amount).where(Bid.auction_id.in_(active))
+        ).all()
+        if bids:
+            conn.execute(insert(ActiveBidSummary.__table__), [dict(row._mapping) for row in bids])
+
+def build_dashboards(conn, shard_conns: Optional[dict] = None, pending_since: Optional[datetime] = None):
+    """Fill the empty summary tables from every shard; ``conn`` is on auction.db.
+    
+    ``shard_conns`` maps shard engines to the connections to read them with.
+    Bids and auctions created from ``pending_since`` on are recorded in
+    rebuilt_summaries, so their own summaries skip what is counted here.
+    """
+    shard_conns = shard_conns or {}
+    bid_totals = Counter()
+    auction_totals = Counter()
+    for shard_engine in database.shard_router.engines:
+        if shard_engine is database.engine:
+            reader = nullcontext(conn)
+        elif shard_engine in shard_conns:
+            reader = nullcontext(shard_conns[shard_engine])
+        else:
+            reader = shard_engine.connect()
+        with reader as shard_conn:
+            auction_totals.update(dict(shard_conn.execute(
+                select(Auction.seller_id, func.count()).group_by(Auction.seller_id)
+            ).all()))
+            bid_totals.update(dict(shard_conn.execute(
+                select(Bid.bidder_id, func.count()).group_by(Bid.bidder_id)
+            ).all()))
+            # auction.db's summaries are written with its rows, so none are ever pending
+            if pending_since is not None and shard_engine is not database.engine:
+                recent = shard_conn.execute(
+                    select(literal("auction"), Auction.id).where(Auction.created_at >= pending_since)
+                    .union_all(select(literal("bid"), Bid.id).where(Bid.bid_time >= pending_since))
+                ).all()
+                if recent:
+                    conn.execute(insert(RebuiltSummary.__table__), [
+                        {"entity": entity, "entity_id": entity_id} for entity, entity_id in recent
+                    ])
+            started = shard_conn.execute(
+                select(Auction.id).where(Auction.status != AuctionStatus.CREATED).order_by(Auction.id)
+            ).scalars().all()
+            for start in range(0, len(started), DASHBOARD_REBUILD_CHUNK_SIZE):
+                refresh_auction_summaries(conn, shard_conn, started[start:start + DASHBOARD_REBUILD_CHUNK_SIZE])
+    add_user_totals(conn, "total_auctions", auction_totals)
+    add_user_totals(conn, "total_bids", bid_totals)
+
+def backfill_dashboards():
+    """Build the dashboard summaries once, for auctions and bids from before they existed."""
+    with database.engine.begin() as conn:
+        if not claim_backfill(conn, "dashboards"):
+            return
+        # Builds before the backfills table marked themselves with a user_id 0 summary
+        legacy = conn.execute(delete(UserSummary.__table__).where(UserSummary.user_id == 0)).rowcount
+        if not legacy:
+            build_dashboards(conn)
+
+def rebuild_dashboards():
+    """Recompute every dashboard summary from the auctions and bids.
+    
+    Writes wait while it runs: it holds the write lock of every other shard
+    and then of auction.db, in the order the settlement sweep takes them, so
+    each shard is read as of one moment. A bid or auction committed on its
+    shard just before may still have its summary queued behind the rebuild;
+    recent ones are recorded in rebuilt_summaries so that summary does not
+    count them a second time. Once those summaries have had their chance to
+    run, the records left over are deleted.
+    """
+    pending_since = datetime.utcnow() - timedelta(minutes=DASHBOARD_PENDING_SUMMARY_MINUTES)
+    with ExitStack() as stack:
+        shard_conns = {}
+        for shard_engine in database.shard_router.engines:
+            if shard_engine is not database.engine:
+                shard_conns[shard_engine] = stack.enter_context(shard_engine.begin())
+                take_write_lock(shard_conns[shard_engine])
+        with database.engine.begin() as conn:
+            for table in (UserSummary, AuctionSummary, ActiveBidSummary, RebuiltSummary):
+                conn.execute(delete(table.__table__))
+            build_dashboards(conn, shard_conns, pending_since)
+    time.sleep(DASHBOARD_SUMMARY_WAIT_SECONDS)
+    with database.engine.begin() as conn:
+        conn.execute(delete(RebuiltSummary.__table__))
@@ -0,0 +1,180 @@
+# services/events.py
+"""Events between the parts of a worker and, in multi-worker mode, between workers."""
+from sqlalchemy import select, insert, update, delete, or_
+from sqlalchemy.sql import func
+from typing import List
+from datetime import datetime, timedelta
+import os
+import json
+import socket
+import logging
+import threading
+from collections import defaultdict
+
+from models import WorkerLease, EventLogEntry
+import tracing
+import database
+from database import tracer
+
+logger = logging.getLogger("auction")
+
+# Multi-worker event log (settings.workers > 1)
+EVENT_LOG_RETENTION_MINUTES = 10
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+class LeaseLost(Exception):
+    """Another worker holds the lease now; the leader's pending writes are rolled back."""
+
+class LeaderLease:
+    """Database lease row electing one worker to run singleton jobs.
+    
+    The lease is taken over only once the previous holder stops renewing it,
+    so at most one worker holds it at any time. ``is_leader`` is only this
+    worker's last view; writes that must not be repeated by a new leader go
+    through ``fence``.
+    """
+    
+    def __init__(self, name: str, ttl_seconds: float):
+        self.name = name
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.is_leader = False
+    
+    def try_acquire(self) -> bool:
+        me = worker_id()
+        now = datetime.utcnow()
+        leases = WorkerLease.__table__
+        with database.engine.begin() as conn:
+            result = conn.execute(
+                update(leases)
+                .where(leases.c.name == self.name, or_(leases.c.holder == me, leases.c.expires_at < now))
+                .values(holder=me, expires_at=now + self.ttl)
+            )
+            if result.rowcount == 0:
+                result = conn.execute(
+                    insert(leases)
+                    .prefix_with("OR IGNORE")
+                    .values(name=self.name, holder=me, expires_at=now + self.ttl)
+                )
+            self.is_leader = result.rowcount == 1
+        return self.is_leader
+    
+    def fence(self, conn):
+        """Renew the lease in ``conn``'s transaction on auction.db, or raise LeaseLost.
+        
+        The holder check is the fencing token: the transaction only commits
+        while this worker still holds an unexpired lease, and the renewal
+        takes the write lock, so no one can take the lease over before then.
+        """
+        now = datetime.utcnow()
+        leases = WorkerLease.__table__
+        renewed = conn.execute(
+            update(leases)
+            .where(leases.c.name == self.name, leases.c.holder == worker_id(), leases.c.expires_at >= now)
+            .values(expires_at=now + self.ttl)
+        ).rowcount
+        if not renewed:
+            self.is_leader = False
+            raise LeaseLost(self.name)
+    
+    def release(self):
+        if not self.is_leader:
+            return
+        leases = WorkerLease.__table__
+        with database.engine.begin() as conn:
+            conn.execute(
+                delete(leases).where(leases.c.name == self.name, leases.c.holder == worker_id())
+            )
+        self.is_leader = False
+
+class EventBus:
+    """Fan-out of bid and auction status events.
+    
+    Subscribers in this process are called right after publish. In multi-worker
+    mode events are also appended to the shared event log, which every worker
+    polls to deliver events published by the others.
+    """
+    
+    def __init__(self):
+        self._handlers = defaultdict(list)
+        self._last_id = 0
+        self._poll_lock = threading.Lock()
+    
+    def subscribe(self, topic: str, handler):
+        self._handlers[topic].append(handler)
+    
+    def publish(self, topic: str, payload: dict):
+        self.publish_many(topic, [payload])
+    
+    def publish_many(self, topic: str, payloads: List[dict]):
+        if not payloads:
+            return
+        with tracer.span(f"publish {topic}", tracing.KIND_PRODUCER, {"events": len(payloads)}) as span:
+            for payload in payloads:
+                self._dispatch(topic, payload)
+            if database.settings.multi_worker:
+                origin = worker_id()
+                now = datetime.utcnow()
+                # Other workers handle the events as part of this trace
+                context = span.context
+                trace = {"traceparent": tracing.format_traceparent(context)} if context.sampled else {}
+                with database.engine.begin() as conn:
+                    conn.execute(
+                        insert(EventLogEntry.__table__),
+                        [
+                            {
+                                "topic": topic,
+                                "payload": json.dumps(dict(payload, **trace), default=str),
+                                "origin": origin,
+                                "created_at": now
+                            } for payload in payloads
+                        ]
+                    )
+    
+    def seek_to_end(self):
+        """Start delivering only events logged from now on."""
+        with database.engine.connect() as conn:
+            last_id = conn.execute(select(func.max(EventLogEntry.id))).scalar()
+        self._last_id = last_id or 0
+    
+    def poll(self, limit: int = 500) -> int:
+        """Deliver events other workers logged since the last poll."""
+        with self._poll_lock:
+            with database.engine.connect() as conn:
+                rows = conn.execute(
+                    select(EventLogEntry.id, EventLogEntry.topic, EventLogEntry.payload, EventLogEntry.origin)
+                    .where(EventLogEntry.id > self._last_id)
+                    .order_by(EventLogEntry.id)
+                    .limit(limit)
+                ).all()
+            me = worker_id()
+            for row in rows:
+                self._last_id = row.id
+                if row.origin != me:
+                    payload = json.loads(row.payload)
+                    parent = tracing.parse_traceparent(payload.pop("traceparent", None))
+                    with tracer.span(f"receive {row.topic}", tracing.KIND_CONSUMER, parent=parent or tracing.UNSAMPLED):
+                        self._dispatch(row.topic, payload)
+            return len(rows)
+    
+    def prune(self, older_than: timedelta):
+        log = EventLogEntry.__table__
+        with database.engine.begin() as conn:
+            # The newest entry stays, so an event log created before ids were
+            # AUTOINCREMENT never hands out an id a worker has already seen
+            conn.execute(
+                delete(log).where(
+                    log.c.created_at < datetime.utcnow() - older_than,
+                    log.c.id < select(func.max(log.c.id)).scalar_subquery()
+                )
+            )
+    
+    def _dispatch(self, topic: str, payload: dict):
+        for handler in self._handlers.get(topic, ()):
+            try:
+                handler(payload)
+            except Exception:
+                logger.exception("Event handler failed for %s", topic)
+
+event_bus = EventBus()
@@ -0,0 +1,75 @@
+# services/feeds.py
+"""The homepage feed index, kept current from auction and bid events."""
+from sqlalchemy import select
+from datetime import datetime, timedelta
+
+from models import AuctionStatus, Auction, Bid
+from feeds import FeedIndex
+import database
+from database import epoch_seconds, to_epoch
+from services.events import event_bus
+
+FEED_REPLAY_HOURS = 1
+
+AUCTION_CARD_COLUMNS = (
+    Auction.id, Auction.product_name, Auction.current_highest_bid,
+    Auction.end_time, Auction.image_url, Auction.seller_id
+)
+
+def auction_card(row) -> dict:
+    """Compact auction summary kept in the feed indexes and sent with status events."""
+    return {
+        "id": row.id,
+        "product_name": row.product_name,
+        "current_highest_bid": row.current_highest_bid,
+        "end_time": row.end_time,
+        "image_url": row.image_url,
+        "seller_id": row.seller_id
+    }
+
+def event_time(value) -> datetime:
+    # Events from other workers arrive JSON-encoded
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+def rebuild_feed_index():
+    """Load active auctions and the last hour of bids into the feed indexes."""
+    since = datetime.utcnow() - timedelta(hours=FEED_REPLAY_HOURS)
+    cards = []
+    bids = []
+    for shard_engine in database.shard_router.engines:
+        with shard_engine.connect() as conn:
+            cards.extend(auction_card(row) for row in conn.execute(
+                select(*AUCTION_CARD_COLUMNS).where(Auction.status == AuctionStatus.ACTIVE)
+            ))
+            bids.extend(conn.execute(
+                select(Bid.auction_id, epoch_seconds(Bid.bid_time))
+                .join(Auction, Auction.id == Bid.auction_id)
+                .where(Auction.status == AuctionStatus.ACTIVE, Bid.bid_time >= since)
+            ))
+    feed_index.reset(cards, bids)
+
+def on_feed_status_event(event: dict):
+    card = event.get("card")
+    if event["status"] == AuctionStatus.ACTIVE.value and card:
+        feed_index.add(dict(card, end_time=event_time(card["end_time"])))
+    elif event["status"] != AuctionStatus.ACTIVE.value:
+        feed_index.remove(event["auction_id"])
+
+def on_feed_bid_event(event: dict):
+    feed_index.record_bid(event["auction_id"], event["amount"], to_epoch(event_time(event["bid_time"])))
+
+def on_feed_import_event(event: dict):
+    with database.shard_router.engines[event["shard"]].connect() as conn:
+        rows = conn.execute(
+            select(*AUCTION_CARD_COLUMNS).where(
+                Auction.id.between(event["first_id"], event["last_id"]),
+                Auction.status == AuctionStatus.ACTIVE
+            )
+        ).all()
+    for row in rows:
+        feed_index.add(auction_card(row))
+
+feed_index = FeedIndex()
+event_bus.subscribe("auction.status", on_feed_status_event)
+event_bus.subscribe("bid.placed", on_feed_bid_event)
+event_bus.subscribe("auctions.imported", on_feed_import_event)
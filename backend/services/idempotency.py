@@ -0,0 +1,262 @@
+# services/idempotency.py
+"""Idempotency-Key handling for retried writes."""
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select, insert, update, delete, or_, tuple_
+from datetime import datetime, timedelta
+import json
+import logging
+import threading
+import hashlib
+import time
+
+from models import IdempotencyRecord
+import database
+from services.cache import LRUCache
+
+logger = logging.getLogger("auction")
+
+# Idempotency-Key handling for retried writes
+IDEMPOTENCY_TTL_HOURS = 24
+IDEMPOTENCY_CACHE_SIZE = 10000
+IDEMPOTENCY_LOCK_SECONDS = 30
+IDEMPOTENCY_WAIT_SECONDS = 10
+
+class IdempotencyClaim:
+    """A claimed Idempotency-Key, handed to the handler so it can store its
+    response in the same transaction as the work the response describes."""
+    
+    def __init__(self, scope: str, key: str, request_hash: str):
+        self.scope = scope
+        self.key = key
+        self.request_hash = request_hash
+        self.response = None
+        self.saved_on = None
+    
+    def save(self, conn, response):
+        """Store ``response`` in the transaction open on ``conn``.
+        
+        On auction.db this fills in the claim row. Another shard gets a row of
+        its own, which the store copies to auction.db once the handler returns.
+        """
+        self.response = jsonable_encoder(response)
+        records = IdempotencyRecord.__table__
+        if conn.engine is database.engine:
+            conn.execute(
+                update(records)
+                .where(records.c.scope == self.scope, records.c.key == self.key)
+                .values(response=json.dumps(self.response))
+            )
+        else:
+            now = datetime.utcnow()
+            conn.execute(insert(records).prefix_with("OR REPLACE").values(
+                scope=self.scope,
+                key=self.key,
+                request_hash=self.request_hash,
+                response=json.dumps(self.response),
+                locked_until=now,
+                expires_at=now + timedelta(hours=IDEMPOTENCY_TTL_HOURS)
+            ))
+        self.saved_on = conn.engine
+
+class IdempotencyStore:
+    """Replays stored responses for retried requests carrying an Idempotency-Key.
+    
+    Completed responses live in the idempotency_keys table (with a TTL) behind an
+    in-memory LRU. The first request for a key claims it in auction.db;
+    concurrent duplicates wait for that request to finish and then replay its
+    response. The handler gets the IdempotencyClaim and stores its response
+    in its own transaction, so a committed request always has its response
+    recorded. Failed requests release their claim so a retry executes again.
+    While a handler runs, a heartbeat keeps extending its claim's lock, so a
+    slow request is never taken over and executed a second time.
+    """
+    
+    def __init__(self, cache_size: int):
+        self._cache = LRUCache(cache_size)
+        self._inflight = {}
+        self._held = set()
+        self._heartbeat = None
+        self._lock = threading.Lock()
+    
+    def execute(self, scope: str, key: str, request_body, handler):
+        ident = (scope, key)
+        request_hash = hashlib.sha256(
+            json.dumps(jsonable_encoder(request_body), sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        while True:
+            cached = self._cache.get(ident)
+            if cached is not None:
+                return self._replay(cached, request_hash)
+            with self._lock:
+                done = self._inflight.get(ident)
+                owner = done is None
+                if owner:
+                    done = self._inflight[ident] = threading.Event()
+            if not owner:
+                if not done.wait(IDEMPOTENCY_WAIT_SECONDS):
+                    raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress")
+                continue
+            try:
+                return self._execute_claimed(ident, request_hash, handler)
+            finally:
+                with self._lock:
+                    self._inflight.pop(ident, None)
+                done.set()
+    
+    def prune(self):
+        for shard_engine in database.shard_router.engines:
+            with shard_engine.begin() as conn:
+                conn.execute(
+                    delete(IdempotencyRecord.__table__)
+                    .where(IdempotencyRecord.expires_at < datetime.utcnow())
+                )
+    
+    def _execute_claimed(self, ident, request_hash: str, handler):
+        deadline = time.monotonic() + IDEMPOTENCY_WAIT_SECONDS
+        while True:
+            claimed, took_over = self._claim(ident, request_hash)
+            if claimed:
+                break
+            record = self._load(ident)
+            if record is not None and record[1] is not None:
+                return self._replay(self._cache.put(ident, record), request_hash)
+            if time.monotonic() > deadline:
+                raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress")
+            time.sleep(0.05)
+        
+        if took_over:
+            # The abandoned claim may belong to a request that committed on
+            # another shard but stopped before copying its response here
+            record = self._load_from_shards(ident)
+            if record is not None:
+                self._store(ident, record[1])
+                return self._replay(self._cache.put(ident, record), request_hash)
+        
+        claim = IdempotencyClaim(ident[0], ident[1], request_hash)
+        self._hold(ident)
+        try:
+            response = jsonable_encoder(handler(claim))
+        except BaseException:
+            self._release(ident)
+            raise
+        finally:
+            with self._lock:
+                self._held.discard(ident)
+        
+        if claim.saved_on is not database.engine:
+            # Saved on another shard (or not at all); copy it to the claim row
+            try:
+                self._store(ident, response)
+            except Exception:
+                logger.exception("Copying idempotent response for %s to auction.db failed", ident)
+        self._cache.put(ident, (request_hash, response))
+        return response
+    
+    def _claim(self, ident, request_hash: str):
+        """Returns (claimed, took_over); took_over if it replaced an abandoned claim."""
+        now = datetime.utcnow()
+        records = IdempotencyRecord.__table__
+        with database.engine.begin() as conn:
+            # Expired keys and abandoned claims can be taken over
+            removed = conn.execute(
+                delete(records).where(
+                    records.c.scope == ident[0],
+                    records.c.key == ident[1],
+                    or_(
+                        records.c.expires_at < now,
+                        (records.c.response.is_(None)) & (records.c.locked_until < now)
+                    )
+                ).returning(records.c.expires_at)
+            ).all()
+            took_over = any(row.expires_at >= now for row in removed)
+            result = conn.execute(
+                insert(records).prefix_with("OR IGNORE").values(
+                    scope=ident[0],
+                    key=ident[1],
+                    request_hash=request_hash,
+                    locked_until=now + timedelta(seconds=IDEMPOTENCY_LOCK_SECONDS),
+                    expires_at=now + timedelta(hours=IDEMPOTENCY_TTL_HOURS)
+                )
+            )
+            return result.rowcount == 1, took_over
+    
+    def _hold(self, ident):
+        with self._lock:
+            self._held.add(ident)
+            if self._heartbeat is None:
+                self._heartbeat = threading.Thread(target=self._extend_held, name="idempotency-heartbeat", daemon=True)
+                self._heartbeat.start()
+    
+    def _extend_held(self):
+        """Push back the locks of claims whose handlers are still running."""
+        records = IdempotencyRecord.__table__
+        while True:
+            time.sleep(IDEMPOTENCY_LOCK_SECONDS / 3)
+            with self._lock:
+                held = list(self._held)
+            if not held:
+                continue
+            try:
+                with database.engine.begin() as conn:
+                    conn.execute(
+                        update(records)
+                        .where(tuple_(records.c.scope, records.c.key).in_(held), records.c.response.is_(None))
+                        .values(locked_until=datetime.utcnow() + timedelta(seconds=IDEMPOTENCY_LOCK_SECONDS))
+                    )
+            except Exception:
+                logger.exception("Extending %d idempotency claims failed", len(held))
+    
+    def _store(self, ident, response):
+        records = IdempotencyRecord.__table__
+        with database.engine.begin() as conn:
+            conn.execute(
+                update(records)
+                .where(records.c.scope == ident[0], records.c.key == ident[1])
+                .values(response=json.dumps(response))
+            )
+    
+    def _release(self, ident):
+        records = IdempotencyRecord.__table__
+        with database.engine.begin() as conn:
+            conn.execute(
+                delete(records).where(
+                    records.c.scope == ident[0],
+                    records.c.key == ident[1],
+                    records.c.response.is_(None)
+                )
+            )
+    
+    def _load(self, ident):
+        with database.engine.connect() as conn:
+            row = conn.execute(
+                select(IdempotencyRecord.request_hash, IdempotencyRecord.response)
+                .where(IdempotencyRecord.scope == ident[0], IdempotencyRecord.key == ident[1])
+            ).first()
+        if row is None:
+            return None
+        return (row.request_hash, json.loads(row.response) if row.response is not None else None)
+    
+    def _load_from_shards(self, ident):
+        for shard_engine in database.shard_router.engines:
+            if shard_engine is database.engine:
+                continue
+            with shard_engine.connect() as conn:
+                row = conn.execute(
+                    select(IdempotencyRecord.request_hash, IdempotencyRecord.response)
+                    .where(
+                        IdempotencyRecord.scope == ident[0],
+                        IdempotencyRecord.key == ident[1],
+                        IdempotencyRecord.expires_at >= datetime.utcnow()
+                    )
+                ).first()
+            if row is not None:
+                return (row.request_hash, json.loads(row.response))
+        return None
+    
+    def _replay(self, record, request_hash: str):
+        if record[0] != request_hash:
+            raise HTTPException(status_code=422, detail="Idempotency-Key was already used with a different request")
+        return record[1]
+
+idempotency_store = IdempotencyStore(IDEMPOTENCY_CACHE_SIZE)
@@ -0,0 +1,88 @@
+# services/leaderboards.py
+"""Buyer, seller and bidder leaderboards, kept current from auction and bid events."""
+from sqlalchemy import select, delete
+from sqlalchemy.sql import func
+from datetime import datetime
+from contextlib import nullcontext
+
+from models import AuctionStatus, Auction, Bid, LeaderboardRollup
+from leaderboard import Leaderboard
+import database
+from database import epoch_day, day_number, claim_backfill
+from services.events import event_bus
+from services.feeds import event_time
+from services.settlement import SETTLEMENT_CHUNK_SIZE, auction_rollups, post_rollups
+
+# Leaderboards (window name -> days, None for all time)
+LEADERBOARD_WINDOWS = {"all": None, "30d": 30, "7d": 7}
+
+def backfill_leaderboard_rollups():
+    """Roll up auctions settled before the leaderboards existed, once."""
+    rollups = LeaderboardRollup.__table__
+    with database.engine.begin() as conn:
+        if not claim_backfill(conn, "leaderboard_rollups"):
+            return
+        # Builds before the backfills table marked themselves with a "backfilled" rollup
+        legacy = conn.execute(delete(rollups).where(rollups.c.board == "backfilled")).rowcount
+        if legacy:
+            return
+        for shard_engine in database.shard_router.engines:
+            # auction.db is read in this transaction; a second connection to it
+            # would share (and on close roll back) the in-memory database's one
+            with nullcontext(conn) if shard_engine is database.engine else shard_engine.connect() as shard_conn:
+                sold = shard_conn.execute(
+                    select(Auction.id, Auction.seller_id, Auction.winner_id, Auction.current_highest_bid, Auction.end_time)
+                    .where(Auction.status == AuctionStatus.WINNER_SELECTED)
+                ).all()
+                for start in range(0, len(sold), SETTLEMENT_CHUNK_SIZE):
+                    post_rollups(conn, auction_rollups(shard_conn, sold[start:start + SETTLEMENT_CHUNK_SIZE]))
+
+def rebuild_leaderboards():
+    """Load the leaderboards from the rollups, plus bids on auctions not settled yet."""
+    today = day_number(datetime.utcnow())
+    longest = max(days for days in LEADERBOARD_WINDOWS.values() if days)
+    rollups = LeaderboardRollup.__table__
+    with database.engine.connect() as conn:
+        for board, leaderboard in leaderboards.items():
+            totals = conn.execute(
+                select(rollups.c.user_id, func.sum(rollups.c.amount))
+                .where(rollups.c.board == board)
+                .group_by(rollups.c.user_id)
+            ).all()
+            buckets = conn.execute(
+                select(rollups.c.user_id, rollups.c.day, rollups.c.amount)
+                .where(rollups.c.board == board, rollups.c.day > today - longest)
+            ).all()
+            leaderboard.load(totals, buckets, today)
+    # Bids reach the rollups with their auction's settlement
+    bid_day = epoch_day(Bid.bid_time)
+    for shard_engine in database.shard_router.engines:
+        with shard_engine.connect() as conn:
+            for row in conn.execute(
+                select(Bid.bidder_id, bid_day.label("day"), func.count().label("bids"))
+                .join(Auction, Auction.id == Bid.auction_id)
+                .where(Auction.status != AuctionStatus.WINNER_SELECTED)
+                .group_by(Bid.bidder_id, bid_day)
+            ):
+                leaderboards["bidders"].record(row.bidder_id, row.bids, row.day, today)
+
+def on_leaderboard_status_event(event: dict):
+    # Sales carry their amount only the first time they are credited, and a
+    # cancelled sale carries it negated, once, with its former winner
+    if event.get("amount") is None:
+        return
+    today = day_number(datetime.utcnow())
+    day = day_number(event_time(event["end_time"]))
+    buyer_id = event["winner_id"] if event["status"] == AuctionStatus.WINNER_SELECTED.value else event["former_winner_id"]
+    leaderboards["buyers"].record(buyer_id, event["amount"], day, today)
+    leaderboards["sellers"].record(event["seller_id"], event["amount"], day, today)
+
+def on_leaderboard_bid_event(event: dict):
+    leaderboards["bidders"].record(
+        event["bidder_id"], 1, day_number(event_time(event["bid_time"])), day_number(datetime.utcnow())
+    )
+
+# Buyers by spend, sellers by sales volume, bidders by bids placed
+leaderboards = {board: Leaderboard(LEADERBOARD_WINDOWS) for board in ("buyers", "sellers", "bidders")}
+event_bus.subscribe("auction.status", on_leaderboard_status_event)
+event_bus.subscribe("bid.placed", on_leaderboard_bid_event)
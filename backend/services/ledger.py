@@ -0,0 +1,126 @@
+# services/ledger.py
+"""Wallet ledger: seller credits, fees and balance snapshots."""
+from sqlalchemy import String, cast, literal, select, insert
+from sqlalchemy.sql import func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import List
+from datetime import datetime
+
+from models import AuctionStatus, LedgerEntryType, Auction, LedgerEntry, BalanceSnapshot
+import database
+from database import claim_backfill
+
+# Wallet ledger
+BALANCE_SNAPSHOT_INTERVAL_MINUTES = 5
+
+def settlement_entries(auction_id: int, seller_id: int, amount: float) -> List[dict]:
+    """Ledger rows crediting a seller for a sold auction, less the platform fee."""
+    reference = f"auction:{auction_id}"
+    entries = [{
+        "user_id": seller_id,
+        "entry_type": LedgerEntryType.SETTLEMENT_CREDIT,
+        "amount": amount,
+        "reference": reference
+    }]
+    if database.settings.platform_fee_percent:
+        entries.append({
+            "user_id": seller_id,
+            "entry_type": LedgerEntryType.FEE,
+            "amount": -round(amount * database.settings.platform_fee_percent / 100, 2),
+            "reference": reference
+        })
+    return entries
+
+def reverse_settlement(conn, auction_id: int, seller_id: int) -> bool:
+    """Take back what a sold auction's settlement credited its seller, net of the fee.
+    
+    The reversal is posted even when nothing was credited, so it marks the
+    sale as cancelled. Returns False when it had already been reversed.
+    """
+    reference = f"auction:{auction_id}"
+    net = conn.execute(
+        select(func.coalesce(func.sum(LedgerEntry.amount), 0.0)).where(
+            LedgerEntry.user_id == seller_id,
+            LedgerEntry.reference == reference,
+            LedgerEntry.entry_type.in_([LedgerEntryType.SETTLEMENT_CREDIT, LedgerEntryType.FEE])
+        )
+    ).scalar()
+    return post_ledger_entries(conn, [{
+        "user_id": seller_id,
+        "entry_type": LedgerEntryType.SETTLEMENT_REVERSAL,
+        "amount": -net,
+        "reference": reference
+    }]) > 0
+
+def post_ledger_entries(conn, entries: List[dict]) -> int:
+    """Append ledger rows, skipping any already posted for the same reference.
+    
+    Returns how many were written.
+    """
+    if not entries:
+        return 0
+    now = datetime.utcnow()
+    return conn.execute(
+        insert(LedgerEntry.__table__).prefix_with("OR IGNORE"),
+        [dict(entry, created_at=now) for entry in entries]
+    ).rowcount
+
+def wallet_balance(conn, user_id: int) -> float:
+    """Latest snapshot plus the ledger tail written after it."""
+    snapshot = conn.execute(
+        select(BalanceSnapshot.balance, BalanceSnapshot.last_entry_id).where(BalanceSnapshot.user_id == user_id)
+    ).first()
+    balance, last_entry_id = snapshot if snapshot else (0.0, 0)
+    tail = conn.execute(
+        select(func.coalesce(func.sum(LedgerEntry.amount), 0.0))
+        .where(LedgerEntry.user_id == user_id, LedgerEntry.id > last_entry_id)
+    ).scalar()
+    return round(balance + tail, 2)
+
+def snapshot_balances():
+    """Fold every user's new ledger entries into their balance snapshot."""
+    ledger = LedgerEntry.__table__
+    snapshots = BalanceSnapshot.__table__
+    with database.engine.begin() as conn:
+        upto = conn.execute(select(func.max(ledger.c.id))).scalar()
+        if upto is None:
+            return
+        deltas = conn.execute(
+            select(ledger.c.user_id, func.sum(ledger.c.amount).label("delta"))
+            .select_from(ledger.outerjoin(snapshots, snapshots.c.user_id == ledger.c.user_id))
+            .where(ledger.c.id > func.coalesce(snapshots.c.last_entry_id, 0), ledger.c.id <= upto)
+            .group_by(ledger.c.user_id)
+        ).all()
+        if not deltas:
+            return
+        now = datetime.utcnow()
+        stmt = sqlite_insert(snapshots)
+        conn.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[snapshots.c.user_id],
+                set_={
+                    "balance": snapshots.c.balance + stmt.excluded.balance,
+                    "last_entry_id": stmt.excluded.last_entry_id,
+                    "taken_at": stmt.excluded.taken_at
+                }
+            ),
+            [{"user_id": row.user_id, "balance": row.delta, "last_entry_id": upto, "taken_at": now} for row in deltas]
+        )
+
+def backfill_settlement_credits():
+    """Credit sellers, less the platform fee, for auctions settled before the ledger existed; once.
+    
+    Those auctions predate sharding too, so they are all in auction.db.
+    """
+    with database.engine.begin() as conn:
+        if not claim_backfill(conn, "settlement_credits"):
+            return
+        sold = conn.execute(
+            select(Auction.id, Auction.seller_id, Auction.current_highest_bid)
+            .outerjoin(LedgerEntry, (LedgerEntry.reference == literal("auction:") + cast(Auction.id, String))
+                       & (LedgerEntry.entry_type == LedgerEntryType.SETTLEMENT_CREDIT))
+            .where(Auction.status == AuctionStatus.WINNER_SELECTED, LedgerEntry.id.is_(None))
+        ).all()
+        post_ledger_entries(conn, [
+            entry for row in sold for entry in settlement_entries(row.id, row.seller_id, row.current_highest_bid)
+        ])
@@ -0,0 +1,121 @@
+# services/lifecycle.py
+"""Background jobs: the auction lifecycle sweep and the event log poll."""
+from sqlalchemy import select, update, exists
+from datetime import datetime, timedelta
+import logging
+import threading
+
+from models import AuctionStatus, Auction
+import database
+from database import tracer, begin_with_changes, main_db_connection, prune_change_log
+from services.audit import anchor_bid_audit_log
+from services.dashboards import SUMMARY_AUCTION_COLUMNS, auction_summary, upsert_auction_summaries
+from services.events import EVENT_LOG_RETENTION_MINUTES, LeaderLease, LeaseLost, event_bus
+from services.feeds import auction_card
+from services import idempotency
+from services.ledger import BALANCE_SNAPSHOT_INTERVAL_MINUTES, snapshot_balances
+from services.settlement import SETTLEMENT_CHUNK_SIZE, prune_settlement_runs, settle_due_auctions
+
+logger = logging.getLogger("auction")
+
+lifecycle_lease = LeaderLease("auction-lifecycle", database.settings.lifecycle_lease_ttl_seconds)
+
+def lease_fence():
+    """The lease check for leader-only writes; None when there is one worker."""
+    return lifecycle_lease.fence if database.settings.multi_worker else None
+
+def check_auction_status():
+    """Start and settle due auctions on every shard.
+    
+    Runs from the lifecycle loop only; request handlers never sweep, and
+    bids on an auction past its end time are refused until it is settled.
+    """
+    # Only the elected worker settles auctions, so winners are notified once
+    if database.settings.multi_worker and not lifecycle_lease.is_leader:
+        return
+    with tracer.span("check_auction_status"):
+        _check_auction_status()
+
+def _check_auction_status():    
+    now = datetime.utcnow()
+    auctions = Auction.__table__
+    fence = lease_fence()
+    
+    for shard, shard_engine in enumerate(database.shard_router.engines):
+        # Start auctions that should be active
+        started = []
+        with shard_engine.connect() as conn:
+            due = conn.execute(select(
+                exists().where(auctions.c.status == AuctionStatus.CREATED, auctions.c.start_time <= now)
+            )).scalar()
+        while due:
+            with begin_with_changes(shard_engine) as (conn, changes):
+                rows = conn.execute(
+                    select(*SUMMARY_AUCTION_COLUMNS)
+                    .where(auctions.c.status == AuctionStatus.CREATED, auctions.c.start_time <= now)
+                    .limit(SETTLEMENT_CHUNK_SIZE)
+                ).all()
+                if rows:
+                    conn.execute(
+                        update(auctions)
+                        .where(auctions.c.id.in_([row.id for row in rows]), auctions.c.status == AuctionStatus.CREATED)
+                        .values(status=AuctionStatus.ACTIVE)
+                    )
+                    changes.extend(("auction", row.id, None) for row in rows)
+                    with main_db_connection(conn) as main_conn:
+                        if fence:
+                            fence(main_conn)
+                        upsert_auction_summaries(main_conn, [
+                            auction_summary(row._mapping, status=AuctionStatus.ACTIVE) for row in rows
+                        ])
+            started.extend(rows)
+            due = len(rows) == SETTLEMENT_CHUNK_SIZE
+        event_bus.publish_many("auction.status", [
+            {"auction_id": row.id, "status": AuctionStatus.ACTIVE.value, "winner_id": None, "card": auction_card(row)}
+            for row in started
+        ])
+        
+        # End auctions that should be ended and select winners
+        with tracer.span("settlement.run", attributes={"db.shard": shard}):
+            event_bus.publish_many("auction.status", settle_due_auctions(shard_engine, now, fence))
+
+def run_lifecycle_loop(stop: threading.Event):
+    """Periodic auction lifecycle sweep, run by the lease holder only."""
+    last_prune = datetime.utcnow()
+    last_snapshot = datetime.utcnow()
+    last_anchor = datetime.utcnow()
+    while not stop.wait(database.settings.lifecycle_interval_seconds):
+        try:
+            if database.settings.multi_worker and not lifecycle_lease.try_acquire():
+                continue
+            # Each sweep is its own trace, sampled like a request
+            with tracer.span("lifecycle.sweep"):
+                check_auction_status()
+                if datetime.utcnow() - last_prune > timedelta(minutes=1):
+                    if database.settings.multi_worker:
+                        event_bus.prune(timedelta(minutes=EVENT_LOG_RETENTION_MINUTES))
+                    idempotency.idempotency_store.prune()
+                    prune_change_log()
+                    prune_settlement_runs()
+                    last_prune = datetime.utcnow()
+                if datetime.utcnow() - last_snapshot > timedelta(minutes=BALANCE_SNAPSHOT_INTERVAL_MINUTES):
+                    with tracer.span("balances.snapshot"):
+                        snapshot_balances()
+                    last_snapshot = datetime.utcnow()
+                if datetime.utcnow() - last_anchor > timedelta(seconds=database.settings.audit_window_seconds):
+                    for shard, shard_engine in enumerate(database.shard_router.engines):
+                        with tracer.span("audit.anchor", attributes={"db.shard": shard}):
+                            anchor_bid_audit_log(shard_engine, lease_fence())
+                    last_anchor = datetime.utcnow()
+        except LeaseLost:
+            logger.warning("Lifecycle lease was taken over mid-sweep; its last chunk was rolled back")
+        except Exception:
+            logger.exception("Auction lifecycle sweep failed")
+
+def run_event_poll_loop(stop: threading.Event):
+    while not stop.wait(database.settings.event_poll_interval_seconds):
+        try:
+            while event_bus.poll() and not stop.is_set():
+                pass
+        except Exception:
+            logger.exception("Event log poll failed")
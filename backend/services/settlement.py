@@ -0,0 +1,224 @@
+# services/settlement.py
+"""Settling auctions that have ended."""
+from sqlalchemy import select, insert, update, delete, exists, or_, bindparam
+from sqlalchemy.sql import func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import Callable, List, Optional
+from datetime import datetime, timedelta
+
+from models import AuctionStatus, LedgerEntryType, Auction, Bid, LedgerEntry, SettlementRun, LeaderboardRollup
+import database
+from database import (
+    tracer, begin_with_changes, main_db_connection, notify, deliver_notifications, epoch_day, day_number
+)
+from services.dashboards import summarize_settlement
+from services.ledger import settlement_entries, post_ledger_entries
+
+# Auctions started/settled per lifecycle transaction
+SETTLEMENT_CHUNK_SIZE = 500
+# Finished settlement_runs rows are kept this long for /admin/settlement-stats
+SETTLEMENT_RUN_RETENTION_DAYS = 7
+
+def prune_settlement_runs():
+    runs = SettlementRun.__table__
+    cutoff = datetime.utcnow() - timedelta(days=SETTLEMENT_RUN_RETENTION_DAYS)
+    for shard_engine in database.shard_router.engines:
+        with shard_engine.begin() as conn:
+            conn.execute(delete(runs).where(runs.c.finished_at.isnot(None), runs.c.finished_at < cutoff))
+
+def auction_rollups(shard_conn, sold: list) -> List[dict]:
+    """Leaderboard rows for sold auctions: the winner's spend and the seller's
+    volume on the end day, plus every bidder's bids on the days they were placed."""
+    if not sold:
+        return []
+    rows = []
+    for auction_id, seller_id, winner_id, amount, end_time in sold:
+        day = day_number(end_time)
+        rows.append({"board": "buyers", "user_id": winner_id, "day": day, "amount": amount})
+        rows.append({"board": "sellers", "user_id": seller_id, "day": day, "amount": amount})
+    bid_day = epoch_day(Bid.bid_time)
+    rows.extend(
+        {"board": "bidders", "user_id": row.bidder_id, "day": row.day, "amount": row.bids}
+        for row in shard_conn.execute(
+            select(Bid.bidder_id, bid_day.label("day"), func.count().label("bids"))
+            .where(Bid.auction_id.in_([sale[0] for sale in sold]))
+            .group_by(Bid.bidder_id, bid_day)
+        )
+    )
+    return rows
+
+def post_rollups(conn, rows: List[dict]):
+    if not rows:
+        return
+    rollups = LeaderboardRollup.__table__
+    stmt = sqlite_insert(rollups)
+    conn.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[rollups.c.board, rollups.c.user_id, rollups.c.day],
+            set_={"amount": rollups.c.amount + stmt.excluded.amount}
+        ),
+        rows
+    )
+
+def reverse_rollups(conn, shard_conn, sold: list):
+    """Take cancelled sales back out of the leaderboard rollups.
+    
+    Their bids stay on the shard under an auction that is no longer sold, so
+    rebuilding the leaderboards counts them once, as unsettled bids.
+    """
+    post_rollups(conn, [dict(row, amount=-row["amount"]) for row in auction_rollups(shard_conn, sold)])
+
+def post_sales(conn, shard_conn, sold: list) -> set:
+    """Credit sellers and add leaderboard rollups for sold auctions.
+    
+    ``sold`` holds (auction_id, seller_id, winner_id, amount, end_time) tuples;
+    ``conn`` is on auction.db and ``shard_conn`` on the auctions' shard. A sale
+    whose seller credit is already in the ledger is skipped, so settling an
+    auction again never counts it twice. Returns the ids credited now.
+    """
+    if not sold:
+        return set()
+    credited = set(conn.execute(
+        select(LedgerEntry.reference).where(
+            LedgerEntry.entry_type == LedgerEntryType.SETTLEMENT_CREDIT,
+            LedgerEntry.reference.in_([f"auction:{sale[0]}" for sale in sold])
+        )
+    ).scalars())
+    new = [sale for sale in sold if f"auction:{sale[0]}" not in credited]
+    post_ledger_entries(conn, [entry for sale in new for entry in settlement_entries(sale[0], sale[1], sale[3])])
+    post_rollups(conn, auction_rollups(shard_conn, new))
+    return {sale[0] for sale in new}
+
+def settle_due_auctions(shard_engine, now: datetime, fence: Optional[Callable] = None) -> List[dict]:
+    """Settle every ACTIVE auction on a shard whose end time has passed, in bounded chunks.
+    
+    Winners for a whole chunk come from one window-function query, and status
+    updates and notifications are written with bulk statements. Each chunk
+    commits together with its settlement_runs progress row, so a crashed run
+    is resumed by the next sweep from where it stopped. Seller credits and
+    leaderboard rollups go to auction.db; on other shards they are committed
+    just before the chunk, and a chunk that then fails is settled again by the
+    next sweep, which skips the sales already credited. Notifications for
+    users on other shards are written once the chunk has committed.
+    ``fence``, given the chunk's connection on auction.db, raises to roll the
+    chunk back once this worker is no longer the leader.
+    """
+    auctions = Auction.__table__
+    bids = Bid.__table__
+    runs = SettlementRun.__table__
+    
+    # Most sweeps find nothing to do; checking that with a read keeps them off
+    # the write lock and out of settlement_runs
+    with shard_engine.connect() as conn:
+        pending = conn.execute(select(or_(
+            exists().where(auctions.c.status == AuctionStatus.ACTIVE, auctions.c.end_time <= now),
+            exists().where(runs.c.finished_at.is_(None))
+        ))).scalar()
+    if not pending:
+        return []
+    
+    with shard_engine.begin() as conn:
+        run_id = conn.execute(
+            select(runs.c.id).where(runs.c.finished_at.is_(None)).order_by(runs.c.id.desc()).limit(1)
+        ).scalar()
+        if run_id is None:
+            run_id = conn.execute(
+                insert(runs).values(
+                    started_at=now, heartbeat_at=now, cutoff=now,
+                    chunks=0, settled=0, winners=0, max_lag_seconds=0
+                )
+            ).inserted_primary_key[0]
+        else:
+            conn.execute(update(runs).where(runs.c.id == run_id).values(cutoff=now))
+    
+    status_events = []
+    while True:
+        remote = []
+        with tracer.span("settlement.chunk") as span, begin_with_changes(shard_engine) as (conn, changes):
+            # Writing the progress row first takes SQLite's write lock, so nobody
+            # else can settle the chunk selected below before we commit
+            conn.execute(update(runs).where(runs.c.id == run_id).values(heartbeat_at=datetime.utcnow()))
+            due = conn.execute(
+                select(auctions.c.id, auctions.c.product_name, auctions.c.seller_id, auctions.c.end_time)
+                .where(auctions.c.status == AuctionStatus.ACTIVE, auctions.c.end_time <= now)
+                .order_by(auctions.c.end_time, auctions.c.id)
+                .limit(SETTLEMENT_CHUNK_SIZE)
+            ).all()
+            if not due:
+                conn.execute(update(runs).where(runs.c.id == run_id).values(finished_at=datetime.utcnow()))
+                break
+            
+            ids = [row.id for row in due]
+            ranked = select(
+                bids.c.auction_id,
+                bids.c.bidder_id,
+                bids.c.amount,
+                func.row_number().over(
+                    partition_by=bids.c.auction_id,
+                    order_by=(bids.c.amount.desc(), bids.c.id)
+                ).label("rank")
+            ).where(bids.c.auction_id.in_(ids)).subquery()
+            winners = {
+                row.auction_id: row for row in conn.execute(
+                    select(ranked.c.auction_id, ranked.c.bidder_id, ranked.c.amount).where(ranked.c.rank == 1)
+                )
+            }
+            
+            if winners:
+                conn.execute(
+                    update(auctions)
+                    .where(auctions.c.id == bindparam("b_id"))
+                    .values(status=AuctionStatus.WINNER_SELECTED, winner_id=bindparam("b_winner")),
+                    [{"b_id": auction_id, "b_winner": bid.bidder_id} for auction_id, bid in winners.items()]
+                )
+            unsold = [auction_id for auction_id in ids if auction_id not in winners]
+            span.set_attribute("auctions", len(ids))
+            span.set_attribute("winners", len(winners))
+            if unsold:
+                conn.execute(update(auctions).where(auctions.c.id.in_(unsold)).values(status=AuctionStatus.ENDED))
+            
+            notifications = []
+            for auction in due:
+                bid = winners.get(auction.id)
+                if bid is None:
+                    status_events.append({"auction_id": auction.id, "status": AuctionStatus.ENDED.value, "winner_id": None})
+                    continue
+                notifications.append({
+                    "user_id": bid.bidder_id,
+                    "message": f"Congratulations! You won the auction for {auction.product_name} with a bid of ${bid.amount}"
+                })
+                notifications.append({
+                    "user_id": auction.seller_id,
+                    "message": f"Your auction for {auction.product_name} has ended. Winner: User {bid.bidder_id} with ${bid.amount}"
+                })
+                status_events.append({
+                    "auction_id": auction.id,
+                    "status": AuctionStatus.WINNER_SELECTED.value,
+                    "winner_id": bid.bidder_id,
+                    "seller_id": auction.seller_id,
+                    "amount": bid.amount,
+                    "end_time": auction.end_time
+                })
+            remote = notify(conn, notifications, changes)
+            changes.extend(("auction", auction_id, None) for auction_id in ids)
+            sold = [
+                (auction.id, auction.seller_id, winners[auction.id].bidder_id, winners[auction.id].amount, auction.end_time)
+                for auction in due if auction.id in winners
+            ]
+            with main_db_connection(conn) as main_conn:
+                if fence:
+                    fence(main_conn)
+                post_sales(main_conn, conn, sold)
+                summarize_settlement(main_conn, ids, winners)
+            
+            lag = max((datetime.utcnow() - row.end_time).total_seconds() for row in due)
+            conn.execute(
+                update(runs).where(runs.c.id == run_id).values(
+                    chunks=runs.c.chunks + 1,
+                    settled=runs.c.settled + len(ids),
+                    winners=runs.c.winners + len(winners),
+                    max_lag_seconds=func.max(runs.c.max_lag_seconds, lag)
+                )
+            )
+        deliver_notifications(remote)
+    return status_events
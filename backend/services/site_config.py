@@ -0,0 +1,59 @@
+# services/site_config.py
+"""Homepage sliders and contact settings, served from an in-memory snapshot."""
+from sqlalchemy import Integer, String, cast, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from contextlib import contextmanager
+
+from models import HomeSlider, SiteSetting
+import siteconfig
+import database
+from responses import RESPONSE_COMPRESS_MIN_BYTES
+from services.events import event_bus
+
+# Field names follow the admin UI's slider list
+def slider_to_dict(row) -> dict:
+    return {
+        "id": row.id,
+        "title": row.title,
+        "imageUrl": row.image_url,
+        "linkUrl": row.link_url,
+        "description": row.description,
+        "order": row.order,
+        "isActive": row.is_active,
+        "createdAt": row.created_at,
+        "updatedAt": row.updated_at
+    }
+
+def load_site_config(conn) -> siteconfig.Snapshot:
+    sliders = [slider_to_dict(row) for row in conn.execute(select(HomeSlider.__table__))]
+    values = dict(conn.execute(select(SiteSetting.key, SiteSetting.value)).all())
+    version = int(values.pop("version", None) or 0)
+    return siteconfig.build_snapshot(version, sliders, values, RESPONSE_COMPRESS_MIN_BYTES)
+
+def reload_site_config() -> siteconfig.Snapshot:
+    with database.engine.connect() as conn:
+        return site_config.publish(load_site_config(conn))
+
+@contextmanager
+def editing_site_config():
+    """A transaction on auction.db whose edits are published as the next site config version."""
+    settings_table = SiteSetting.__table__
+    with database.engine.begin() as conn:
+        yield conn
+        conn.execute(
+            sqlite_insert(settings_table).values(key="version", value="1")
+            .on_conflict_do_update(
+                index_elements=[settings_table.c.key],
+                set_={"value": cast(cast(settings_table.c.value, Integer) + 1, String)}
+            )
+        )
+        snapshot = load_site_config(conn)
+    site_config.publish(snapshot)
+    event_bus.publish("site_config.updated", {"version": snapshot.version})
+
+def on_site_config_event(event: dict):
+    if event["version"] > site_config.current.version:
+        reload_site_config()
+
+site_config = siteconfig.SnapshotStore()
+event_bus.subscribe("site_config.updated", on_site_config_event)
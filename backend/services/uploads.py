@@ -0,0 +1,21 @@
+# services/uploads.py
+"""Uploaded images."""
+from fastapi import UploadFile
+import os
+
+async def save_upload(file: UploadFile) -> str:
+    """Store an uploaded image and return its path"""
+    # Simple image storage (in production, use cloud storage like AWS S3)
+    import uuid
+    file_extension = file.filename.split('.')[-1]
+    filename = f"{uuid.uuid4()}.{file_extension}"
+    file_path = f"uploads/{filename}"
+    
+    # Create uploads directory if it doesn't exist
+    os.makedirs("uploads", exist_ok=True)
+    
+    # Save file
+    with open(file_path, "wb") as buffer:
+        content = await file.read()
+        buffer.write(content)
+    return file_path
@@ -0,0 +1,80 @@
+# settings.py
+"""Deployment settings for create_app.
+
+``Settings.from_env()`` reads the AUCTION_* environment variables; tests build
+one directly, e.g. ``Settings.in_memory()`` for a private in-memory database
+that disappears with the app.
+"""
+import os
+from typing import NamedTuple, Optional
+
+MEMORY_DATABASE_URL = "sqlite://"
+
+
+class Settings(NamedTuple):
+    database_url: str = "sqlite:///./auction.db"
+    # Formatted with the shard number, 1 upwards
+    shard_database_url: str = "sqlite:///./auction_shard{}.db"
+    shard_count: int = 1
+    # Multi-worker mode (e.g. AUCTION_WORKERS=4 uvicorn main:app --workers 4)
+    workers: int = 1
+    # Lifecycle sweeps and event log polling run in background threads
+    background_jobs: bool = True
+    lifecycle_interval_seconds: float = 1.0
+    lifecycle_lease_ttl_seconds: float = 10.0
+    event_poll_interval_seconds: float = 0.2
+    platform_fee_percent: float = 0.0
+    audit_window_seconds: float = 60.0
+    # Group commit: bids arriving within this many milliseconds of each other,
+    # up to bid_flush_max_bids, are written in one transaction (0 turns it off)
+    bid_flush_window_ms: float = 0.0
+    bid_flush_max_bids: int = 100
+    # "otlp" posts spans to an OTLP/HTTP collector, "file" appends them to trace_file
+    trace_exporter: str = ""
+    trace_sample_rate: float = 0.01
+    trace_otlp_endpoint: str = "http://localhost:4318/v1/traces"
+    trace_file: str = "traces.jsonl"
+    profile_continuous: bool = False
+    capture_file: Optional[str] = None
+    # Defaults to the JWT secret
+    capture_salt: Optional[str] = None
+
+    @property
+    def multi_worker(self) -> bool:
+        return self.workers > 1
+
+    @property
+    def in_memory_database(self) -> bool:
+        return self.database_url == MEMORY_DATABASE_URL
+
+    @classmethod
+    def from_env(cls, environ=None) -> "Settings":
+        env = os.environ if environ is None else environ
+        defaults = cls()
+        return cls(
+            shard_count=int(env.get("AUCTION_SHARDS", defaults.shard_count)),
+            workers=int(env.get("AUCTION_WORKERS", defaults.workers)),
+            lifecycle_interval_seconds=float(env.get("AUCTION_LIFECYCLE_INTERVAL", defaults.lifecycle_interval_seconds)),
+            lifecycle_lease_ttl_seconds=float(env.get("AUCTION_LEASE_TTL", defaults.lifecycle_lease_ttl_seconds)),
+            event_poll_interval_seconds=float(env.get("AUCTION_EVENT_POLL_INTERVAL", defaults.event_poll_interval_seconds)),
+            platform_fee_percent=float(env.get("AUCTION_PLATFORM_FEE_PERCENT", defaults.platform_fee_percent)),
+            audit_window_seconds=float(env.get("AUCTION_AUDIT_WINDOW", defaults.audit_window_seconds)),
+            bid_flush_window_ms=float(env.get("AUCTION_BID_FLUSH_WINDOW_MS", defaults.bid_flush_window_ms)),
+            bid_flush_max_bids=int(env.get("AUCTION_BID_FLUSH_MAX_BIDS", defaults.bid_flush_max_bids)),
+            trace_exporter=env.get("AUCTION_TRACE_EXPORTER", defaults.trace_exporter),
+            trace_sample_rate=float(env.get("AUCTION_TRACE_SAMPLE_RATE", defaults.trace_sample_rate)),
+            trace_otlp_endpoint=env.get("AUCTION_OTLP_ENDPOINT", defaults.trace_otlp_endpoint),
+            trace_file=env.get("AUCTION_TRACE_FILE", defaults.trace_file),
+            profile_continuous=env.get("AUCTION_PROFILE_CONTINUOUS", "0") == "1",
+            capture_file=env.get("AUCTION_CAPTURE_FILE") or None,
+            capture_salt=env.get("AUCTION_CAPTURE_SALT"),
+        )
+
+    @classmethod
+    def in_memory(cls, **overrides) -> "Settings":
+        """Private in-memory databases, one per shard, with no background threads."""
+        return cls(
+            database_url=MEMORY_DATABASE_URL,
+            shard_database_url=MEMORY_DATABASE_URL,
+            background_jobs=False,
+        )._replace(**overrides)
@@ -0,0 +1,82 @@
+# siteconfig.py
+"""Published snapshots of the homepage sliders and contact settings.
+
+Admin edits write the database and then publish a new snapshot; readers only
+ever see a whole snapshot, so the public endpoint serves pre-encoded bytes from
+memory and never queries the database.
+"""
+import hashlib
+import threading
+from typing import NamedTuple
+
+import serialization
+
+# Contact settings keys, as the admin UI names them
+CONTACT_FIELDS = ("contactNo", "email", "website")
+
+
+class Snapshot(NamedTuple):
+    version: int
+    sliders: tuple  # every slider, in display order
+    contact: dict
+    etag: str
+    # Public body, keyed by content coding (None for uncompressed)
+    bodies: dict
+
+    def body_for(self, accept_encoding=""):
+        """(body, content_encoding or None) for an Accept-Encoding header."""
+        coding = serialization.content_coding(accept_encoding)
+        if coding in self.bodies:
+            return self.bodies[coding], coding
+        return self.bodies[None], None
+
+
+def build_snapshot(version, sliders, contact, min_compress_size=1024):
+    """Encode and compress the public document once, for every request that reads it."""
+    sliders = tuple(sorted(sliders, key=lambda slider: (slider["order"], slider["id"])))
+    contact = {name: contact.get(name) for name in CONTACT_FIELDS}
+    body = serialization.dumps_json({
+        "version": version,
+        "sliders": [slider for slider in sliders if slider["isActive"]],
+        "contact": contact
+    })
+    bodies = {None: body}
+    for coding in ("br", "gzip"):
+        compressed, used = serialization.compress(body, coding, min_compress_size)
+        if used == coding:
+            bodies[coding] = compressed
+    # Derived from the content, so every worker agrees and a reset database
+    # never revalidates a stale copy
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    return Snapshot(version, sliders, contact, etag, bodies)
+
+
+EMPTY = build_snapshot(0, (), {})
+
+
+class SnapshotStore:
+    """Holds the current snapshot; reads are a plain attribute load."""
+
+    def __init__(self):
+        self.current = EMPTY
+        self._lock = threading.Lock()
+
+    def publish(self, snapshot):
+        """Swap in ``snapshot`` unless a newer version is already current."""
+        with self._lock:
+            if snapshot.version >= self.current.version:
+                self.current = snapshot
+            return self.current
+
+    def reset(self, snapshot=EMPTY):
+        with self._lock:
+            self.current = snapshot
+
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Compression doesn't change the representation's validator here
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
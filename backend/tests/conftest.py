@@ -0,0 +1,38 @@
+# conftest.py
+"""Every test gets its own app on private in-memory databases.
+
+Run from the backend directory: ``python -m pytest -q tests``.
+"""
+import os
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from settings import Settings
+
+
+@pytest.fixture
+def settings():
+    """Overridden by tests that need other settings (shards, group commit)."""
+    return Settings.in_memory()
+
+
+@pytest.fixture
+def client(settings):
+    with TestClient(main.create_app(settings)) as client:
+        yield client
+
+
+@pytest.fixture
+def register(client):
+    """register(email, user_type) -> (user_id, bearer headers)"""
+    def register(email, user_type="buyer", password="secret123"):
+        response = client.post("/auth/register", json={"email": email, "password": password, "user_type": user_type})
+        assert response.status_code == 200, response.text
+        token = response.json()
+        return token["user_id"], {"Authorization": f"Bearer {token['access_token']}"}
+    return register
@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+import database
+from models import Bid
+from services.lifecycle import check_auction_status
+
+np = pytest.importorskip("numpy")
+import analytics  # noqa: E402
+
+
+def bids(*rows, dtype=analytics.BID_DTYPE):
+    return analytics.load(rows, dtype, order="time")
+
+
+def test_auction_metrics_bucket_the_price_curve_and_bid_velocity():
+    # Bids at 0s, 30s, 90s and 115s of a two-minute auction starting at 10
+    result = analytics.auction_metrics(
+        bids((20.0, 1030.0, 1), (12.0, 1000.0, 2), (25.0, 1090.0, 1), (30.0, 1115.0, 3)),
+        base_price=10, start_time=1000, end_time=1120, buckets=2
+    )
+    assert result["total_bids"] == 4
+    assert result["unique_bidders"] == 3
+    assert result["final_price"] == 30
+    assert result["price_over_base"] == 3
+    assert result["final_minute_bids"] == 2 and result["sniping_share"] == 0.5
+    assert [point["price"] for point in result["price_curve"]] == [20, 30]
+    assert [point["bids_per_minute"] for point in result["price_curve"]] == [2, 2]
+
+
+def test_auction_metrics_without_bids_or_base_price():
+    result = analytics.auction_metrics(bids(), base_price=0, start_time=1000, end_time=1120, buckets=4)
+    assert result["total_bids"] == 0
+    assert result["sniping_share"] == 0
+    assert result["price_over_base"] is None
+    assert [point["price"] for point in result["price_curve"]] == [0, 0, 0, 0]
+
+
+def test_seller_metrics_skip_auctions_without_a_base_price():
+    auctions = analytics.load([(2, 0.0, 2000.0), (1, 10.0, 1000.0), (3, 5.0, 3000.0)], analytics.AUCTION_DTYPE, order="id")
+    seller_bids = bids(
+        (20.0, 500.0, 1, 1), (40.0, 990.0, 2, 1), (15.0, 1950.0, 1, 2),
+        dtype=analytics.SELLER_BID_DTYPE
+    )
+    with np.errstate(all="raise"):
+        result = analytics.seller_metrics(seller_bids, auctions)
+    assert result["auctions"] == 3
+    assert result["auctions_with_bids"] == 2
+    assert result["total_bids"] == 3
+    assert result["final_minute_bids"] == 2
+    # Only auction 1 has both bids and a base price
+    assert result["average_price_over_base"] == result["median_price_over_base"] == 4
+    assert sum(result["bids_by_hour_utc"]) == 3
+
+    only_free = analytics.load([(2, 0.0, 2000.0)], analytics.AUCTION_DTYPE)
+    result = analytics.seller_metrics(bids((15.0, 1950.0, 1, 2), dtype=analytics.SELLER_BID_DTYPE), only_free)
+    assert result["average_price_over_base"] is None and result["median_price_over_base"] is None
+
+
+def test_seller_analytics_endpoint_handles_free_auctions(client, register):
+    _, seller = register("seller@example.com", "seller")
+    bidder_id, _ = register("buyer@example.com")
+    now = datetime.utcnow()
+    auction_ids = [
+        client.post("/auctions/create", json={
+            "product_name": f"Lamp {base_price}",
+            "description": "Brass",
+            "base_price": base_price,
+            "start_time": (now - timedelta(minutes=5)).isoformat(),
+            "end_time": (now + timedelta(hours=1)).isoformat()
+        }, headers=seller).json()["id"]
+        for base_price in (0, 10)
+    ]
+    check_auction_status()
+    with database.engine.begin() as conn:
+        conn.execute(insert(Bid.__table__), [
+            {"auction_id": auction_id, "bidder_id": bidder_id, "amount": 20, "bid_time": now}
+            for auction_id in auction_ids
+        ])
+    response = client.get("/seller/analytics", headers=seller)
+    assert response.status_code == 200, response.text
+    assert response.json()["average_price_over_base"] == 2
+    response = client.get(f"/auctions/{auction_ids[0]}/analytics", params={"buckets": 5})
+    assert response.status_code == 200, response.text
+    assert response.json()["price_over_base"] is None
+    assert len(response.json()["price_curve"]) == 5
@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import serialization
+
+
+@pytest.fixture
+def auctions(client, register):
+    _, seller = register("seller@example.com", "seller")
+    now = datetime.utcnow()
+    return [
+        client.post("/auctions/create", json={
+            "product_name": f"Lamp {n}",
+            "description": "Brass " * 100,
+            "base_price": 10 + n,
+            "start_time": (now + timedelta(hours=1)).isoformat(),
+            "end_time": (now + timedelta(hours=2)).isoformat()
+        }, headers=seller).json()["id"]
+        for n in range(3)
+    ]
+
+
+@pytest.mark.parametrize("path", ["/auctions", "/auctions/active", "/auctions/past"])
+def test_auction_lists_return_only_the_projected_fields(client, auctions, path):
+    response = client.get(path, params={"fields": "product_name,base_price"})
+    assert response.status_code == 200, response.text
+    assert all(set(row) == {"id", "product_name", "base_price"} for row in response.json())
+    assert client.get(path, params={"fields": "product_name,password"}).status_code == 400
+
+
+def test_auction_list_projection_and_paging(client, auctions):
+    response = client.get("/auctions", params={"fields": "status", "skip": 1, "limit": 1})
+    assert response.json() == [{"id": auctions[1], "status": "created"}]
+    full = client.get("/auctions").json()
+    assert [row["id"] for row in full] == auctions
+    assert full[0]["start_time"] == client.get(f"/auctions/{auctions[0]}").json()["start_time"]
+
+
+def test_auction_lists_encode_json_with_and_without_orjson(client, auctions, monkeypatch):
+    fast = client.get("/auctions")
+    assert fast.headers["content-type"] == "application/json"
+    assert {"Accept", "Accept-Encoding"} <= set(fast.headers["vary"].split(", "))
+    monkeypatch.setattr(serialization, "orjson", None)
+    assert client.get("/auctions").json() == fast.json()
+
+
+def test_auction_lists_negotiate_msgpack(client, auctions):
+    msgpack = pytest.importorskip("msgpack")
+    response = client.get("/auctions", headers={"Accept": "application/x-msgpack, application/json;q=0.5"})
+    assert response.headers["content-type"] == "application/x-msgpack"
+    assert msgpack.unpackb(response.content) == client.get("/auctions").json()
+    assert client.get("/auctions", headers={"Accept": "application/msgpack;q=0"}).headers["content-type"] == "application/json"
+
+
+def test_auction_lists_fall_back_to_json_without_msgpack(client, auctions, monkeypatch):
+    monkeypatch.setattr(serialization, "msgpack", None)
+    response = client.get("/auctions", headers={"Accept": "application/msgpack"})
+    assert response.headers["content-type"] == "application/json"
+    assert [row["id"] for row in response.json()] == auctions
+
+
+def test_large_auction_lists_are_gzipped(client, auctions):
+    response = client.get("/auctions", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    small = client.get("/auctions", params={"fields": "status", "limit": 1}, headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+    assert small.json() == [{"id": auctions[0], "status": "created"}]
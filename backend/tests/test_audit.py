@@ -0,0 +1,133 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+import database
+import merkle
+from models import AuditWindow, BidAuditEntry
+from services.audit import anchor_bid_audit_log
+from services.lifecycle import check_auction_status
+from settings import Settings
+
+
+@pytest.fixture
+def bid(client, register):
+    """bid(auction_id) places a higher bid than the last, alternating between two buyers."""
+    buyers = [register(f"buyer{n}@example.com")[1] for n in range(2)]
+    placed = []
+
+    def bid(auction_id):
+        response = client.post("/bids/place", json={"auction_id": auction_id, "amount": 20 + len(placed)},
+                               headers=buyers[len(placed) % 2])
+        assert response.status_code == 200, response.text
+        placed.append(response.json())
+        return response.json()
+    return bid
+
+
+def create_auctions(client, register, count):
+    _, seller = register("seller@example.com", "seller")
+    now = datetime.utcnow()
+    ids = [
+        client.post("/auctions/create", json={
+            "product_name": f"Lamp {n}",
+            "description": "Brass",
+            "base_price": 10,
+            "start_time": (now - timedelta(minutes=1)).isoformat(),
+            "end_time": (now + timedelta(hours=1)).isoformat()
+        }, headers=seller).json()["id"]
+        for n in range(count)
+    ]
+    check_auction_status()
+    return ids
+
+
+def audit_log(shard_engine):
+    with shard_engine.connect() as conn:
+        return conn.execute(select(BidAuditEntry.__table__).order_by(BidAuditEntry.id)).all()
+
+
+def windows(shard_engine):
+    with shard_engine.connect() as conn:
+        return conn.execute(select(AuditWindow.__table__).order_by(AuditWindow.id)).all()
+
+
+def test_entries_chain_each_bid_to_the_one_before(client, register, bid):
+    [auction_id] = create_auctions(client, register, 1)
+    bids = [bid(auction_id) for _ in range(3)]
+    # Entries are appended with their bids and hashed when their window closes
+    assert [entry.entry_hash for entry in audit_log(database.engine)] == [None] * 3
+    anchor_bid_audit_log(database.engine)
+
+    entries = audit_log(database.engine)
+    assert [entry.bid_id for entry in entries] == [placed["id"] for placed in bids]
+    assert json.loads(entries[0].payload) == {
+        "bid_id": bids[0]["id"], "auction_id": auction_id, "bidder_id": bids[0]["bidder_id"],
+        "amount": 20, "bid_time": bids[0]["bid_time"]
+    }
+    prev_hash = merkle.GENESIS_HASH
+    for entry in entries:
+        assert entry.prev_hash == prev_hash
+        assert entry.entry_hash == merkle.chain_hash(prev_hash, entry.payload)
+        prev_hash = entry.entry_hash
+
+
+def test_each_anchor_closes_a_window_over_the_new_entries(client, register, bid):
+    [auction_id] = create_auctions(client, register, 1)
+    for _ in range(3):
+        bid(auction_id)
+    first = anchor_bid_audit_log(database.engine)
+    assert anchor_bid_audit_log(database.engine) is None
+    for _ in range(2):
+        bid(auction_id)
+    second = anchor_bid_audit_log(database.engine)
+
+    entries = audit_log(database.engine)
+    assert [entry.window_id for entry in entries] == [first] * 3 + [second] * 2
+    # The chain runs on across windows
+    assert entries[3].prev_hash == entries[2].entry_hash
+    assert [(window.first_entry_id, window.last_entry_id, window.leaf_count) for window in windows(database.engine)] == [
+        (entries[0].id, entries[2].id, 3), (entries[3].id, entries[4].id, 2)
+    ]
+    assert [window.merkle_root for window in windows(database.engine)] == [
+        merkle.merkle_root([entry.entry_hash for entry in entries[:3]]),
+        merkle.merkle_root([entry.entry_hash for entry in entries[3:]])
+    ]
+
+
+def test_proofs_verify_against_their_window_root(client, register, bid):
+    [auction_id] = create_auctions(client, register, 1)
+    bids = [bid(auction_id) for _ in range(5)]
+    response = client.get(f"/auctions/{auction_id}/proof/{bids[0]['id']}")
+    assert response.status_code == 409
+    anchor_bid_audit_log(database.engine)
+
+    for index, placed in enumerate(bids):
+        response = client.get(f"/auctions/{auction_id}/proof/{placed['id']}")
+        assert response.status_code == 200, response.text
+        proof = response.json()
+        assert proof["leaf_index"] == index and proof["leaf_count"] == 5
+        assert proof["entry_hash"] == merkle.chain_hash(proof["prev_hash"], proof["canonical_payload"])
+        assert merkle.verify_proof(proof["entry_hash"], proof["proof"], proof["merkle_root"])
+        assert not merkle.verify_proof(proof["prev_hash"], proof["proof"], proof["merkle_root"])
+    assert client.get(f"/auctions/{auction_id}/proof/999").status_code == 404
+    assert client.get(f"/auctions/{auction_id + 1}/proof/{bids[0]['id']}").status_code == 404
+
+
+@pytest.mark.parametrize("settings", [Settings.in_memory(shard_count=2)])
+def test_every_shard_keeps_a_chain_of_its_own(client, register, bid):
+    auction_ids = create_auctions(client, register, 2)
+    for auction_id in auction_ids * 2:
+        bid(auction_id)
+    for shard_engine in database.shard_router.engines:
+        anchor_bid_audit_log(shard_engine)
+        entries = audit_log(shard_engine)
+        assert len(entries) == 2 and entries[0].prev_hash == merkle.GENESIS_HASH
+        assert entries[1].prev_hash == entries[0].entry_hash
+        [window] = windows(shard_engine)
+        assert window.merkle_root == merkle.merkle_root([entry.entry_hash for entry in entries])
+    for auction_id in auction_ids:
+        proof = client.get(f"/auctions/{auction_id}/proof/{audit_log(database.shard_router.engine_for(auction_id))[1].bid_id}").json()
+        assert merkle.verify_proof(proof["entry_hash"], proof["proof"], proof["merkle_root"])
@@ -0,0 +1,103 @@
+import re
+from datetime import datetime, timedelta
+
+import pytest
+
+
+def test_set_user_status_requires_a_token(client, register):
+    user_id, _ = register("buyer@example.com")
+    response = client.put(f"/admin/users/{user_id}/status", params={"is_active": False})
+    assert response.status_code == 401
+
+
+def test_set_user_status_rejects_non_admins(client, register):
+    user_id, _ = register("buyer@example.com")
+    _, seller = register("seller@example.com", "seller")
+    response = client.put(f"/admin/users/{user_id}/status", params={"is_active": False}, headers=seller)
+    assert response.status_code == 403
+    assert client.get(f"/users/{user_id}").json()["isActive"] is True
+
+
+def test_admin_deactivates_a_user(client, register):
+    user_id, buyer = register("buyer@example.com")
+    _, admin = register("admin@example.com", "admin")
+    assert client.get("/users/me", headers=buyer).status_code == 200
+    response = client.put(f"/admin/users/{user_id}/status", params={"is_active": False}, headers=admin)
+    assert response.json() == {"id": user_id, "is_active": False}
+    # The cached login is dropped straight away
+    assert client.get("/users/me", headers=buyer).status_code == 403
+
+
+def test_login_checks_password_and_user_type(client, register):
+    user_id, _ = register("seller@example.com", "seller")
+    login = {"email": "seller@example.com", "password": "secret123", "user_type": "seller"}
+    response = client.post("/auth/login", json=login)
+    assert response.status_code == 200
+    token = response.json()
+    assert token["user_id"] == user_id
+    assert client.get("/users/me", headers={"Authorization": f"Bearer {token['access_token']}"}).status_code == 200
+    assert client.post("/auth/login", json={**login, "password": "wrong"}).status_code == 401
+    assert client.post("/auth/login", json={**login, "user_type": "buyer"}).status_code == 401
+
+
+def test_register_rejects_a_taken_email(client, register):
+    register("buyer@example.com")
+    response = client.post("/auth/register", json={"email": "buyer@example.com", "password": "secret123", "user_type": "buyer"})
+    assert response.status_code == 400
+
+
+def admin_paths():
+    from routers import api_routes
+    for route in api_routes():
+        if route.path.startswith("/admin/") or route.path in ("/dashboard/admin", "/contests/{contest_id}/entries"):
+            for method in route.methods:
+                yield method, re.sub(r"\{[^}]+\}", "1", route.path)
+
+
+@pytest.mark.parametrize("method,path", sorted(admin_paths()))
+def test_admin_routes_need_an_admin(client, register, method, path):
+    _, seller = register("seller@example.com", "seller")
+    assert client.request(method, path).status_code == 401
+    assert client.request(method, path, headers=seller).status_code == 403
+
+
+@pytest.mark.parametrize("path", [
+    "/wallet/balance", "/wallet/ledger", "/dashboard/buyer", "/dashboard/seller", "/notifications",
+    "/buyer/bidding-history", "/buyer/won-items", "/seller/live-auctions", "/seller/completed-auctions",
+    "/seller/earnings-summary", "/users/me"
+])
+def test_per_user_reads_need_a_token(client, path):
+    assert client.get(path).status_code == 401
+
+
+def test_users_read_only_their_own_data_unless_admin(client, register):
+    buyer_id, buyer = register("buyer@example.com")
+    other_id, other = register("other@example.com")
+    _, admin = register("admin@example.com", "admin")
+    assert client.get("/wallet/balance", headers=buyer).json()["user_id"] == buyer_id
+    assert client.get("/wallet/balance", params={"user_id": other_id}, headers=buyer).status_code == 403
+    assert client.get("/dashboard/buyer", params={"user_id": other_id}, headers=buyer).status_code == 403
+    assert client.get("/changes", params={"user_id": other_id}, headers=buyer).status_code == 403
+    assert client.get("/changes", params={"user_id": other_id}).status_code == 401
+    assert client.get("/wallet/balance", params={"user_id": other_id}, headers=admin).json()["user_id"] == other_id
+
+
+def test_writes_act_as_the_caller(client, register):
+    seller_id, seller = register("seller@example.com", "seller")
+    _, buyer = register("buyer@example.com")
+    now = datetime.utcnow()
+    auction = {
+        "product_name": "Lamp",
+        "description": "Brass",
+        "base_price": 10,
+        "start_time": (now - timedelta(minutes=1)).isoformat(),
+        "end_time": (now + timedelta(hours=1)).isoformat()
+    }
+    assert client.post("/auctions/create", json=auction).status_code == 401
+    assert client.post("/auctions/create", json=auction, headers=buyer).status_code == 403
+    assert client.post("/auctions/create", json={**auction, "seller_id": seller_id + 1}, headers=seller).status_code == 403
+    created = client.post("/auctions/create", json=auction, headers=seller).json()
+    assert created["seller_id"] == seller_id
+    bid = {"auction_id": created["id"], "amount": 20}
+    assert client.post("/bids/place", json=bid).status_code == 401
+    assert client.post("/bids/place", json={**bid, "bidder_id": seller_id}, headers=buyer).status_code == 403
@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+import database
+from models import Auction, AuctionStatus
+from responses import BATCH_MAX_IDS
+from services.lifecycle import check_auction_status
+from settings import Settings
+
+
+@pytest.fixture
+def settings():
+    return Settings.in_memory(shard_count=2)
+
+
+@pytest.fixture
+def auction_ids(client, register):
+    _, seller = register("seller@example.com", "seller")
+    now = datetime.utcnow()
+    ids = [
+        client.post("/auctions/create", json={
+            "product_name": f"Lamp {n}",
+            "description": "Brass",
+            "base_price": 10,
+            "start_time": (now - timedelta(minutes=1)).isoformat(),
+            "end_time": (now + timedelta(hours=1)).isoformat()
+        }, headers=seller).json()["id"]
+        for n in range(3)
+    ]
+    check_auction_status()
+    return ids
+
+
+def batch(client, ids, **params):
+    response = client.get("/auctions/batch", params={"ids": ",".join(str(i) for i in ids), **params})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_batch_keeps_the_requested_order_and_reports_missing_ids(client, auction_ids):
+    assert {database.shard_router.shard_for(auction_id) for auction_id in auction_ids} == {0, 1}
+    requested = [auction_ids[2], 9999, auction_ids[0], auction_ids[2], auction_ids[1], 8888]
+    result = batch(client, requested, fields="product_name")
+    assert result["auctions"] == [
+        {"id": auction_ids[2], "product_name": "Lamp 2"},
+        {"id": auction_ids[0], "product_name": "Lamp 0"},
+        {"id": auction_ids[1], "product_name": "Lamp 1"}
+    ]
+    assert result["missing"] == [9999, 8888]
+    assert batch(client, [9999]) == {"auctions": [], "missing": [9999]}
+
+
+def test_batch_includes_bid_aggregates_and_winner_email(client, register, auction_ids):
+    buyer_id, buyer = register("buyer@example.com")
+    _, rival = register("rival@example.com")
+    for amount, headers in ((20, buyer), (30, rival), (40, buyer)):
+        assert client.post("/bids/place", json={"auction_id": auction_ids[1], "amount": amount}, headers=headers).status_code == 200
+    with database.shard_router.engine_for(auction_ids[1]).begin() as conn:
+        conn.execute(update(Auction.__table__).where(Auction.id == auction_ids[1]).values(
+            status=AuctionStatus.WINNER_SELECTED, winner_id=buyer_id
+        ))
+
+    result = batch(client, auction_ids, fields="status", include="bid_count,top_bid,winner_email")
+    assert result["auctions"] == [
+        {"id": auction_ids[0], "status": "active", "bid_count": 0, "top_bid": None, "winner_email": None},
+        {"id": auction_ids[1], "status": "winner_selected", "bid_count": 3, "top_bid": 40, "winner_email": "buyer@example.com"},
+        {"id": auction_ids[2], "status": "active", "bid_count": 0, "top_bid": None, "winner_email": None}
+    ]
+    single = client.get(f"/auctions/{auction_ids[1]}", params={"fields": "status", "include": "top_bid"}).json()
+    assert single == {"id": auction_ids[1], "status": "winner_selected", "top_bid": 40}
+
+
+@pytest.mark.parametrize("params", [
+    {"ids": ""},
+    {"ids": "1,two"},
+    {"ids": ",".join(str(n) for n in range(BATCH_MAX_IDS + 1))},
+    {"ids": "1", "include": "bids"},
+    {"ids": "1", "fields": "password"}
+])
+def test_batch_rejects_bad_requests(client, auction_ids, params):
+    assert client.get("/auctions/batch", params=params).status_code == 400
+
+
+def test_user_batch_reports_missing_ids(client, register):
+    buyer_id, _ = register("buyer@example.com")
+    seller_id, _ = register("seller@example.com", "seller")
+    response = client.get("/users/batch", params={"ids": f"{seller_id},0,{buyer_id}"})
+    assert response.status_code == 200, response.text
+    assert [user["email"] for user in response.json()["users"]] == ["seller@example.com", "buyer@example.com"]
+    assert response.json()["missing"] == [0]
+    assert client.get("/users/0").status_code == 404
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from services.lifecycle import check_auction_status
+
+
+@pytest.fixture
+def auction(client, register):
+    """(auction id, seller headers) of an active auction starting at 10."""
+    _, seller = register("seller@example.com", "seller")
+    now = datetime.utcnow()
+    response = client.post("/auctions/create", json={
+        "product_name": "Lamp",
+        "description": "Brass",
+        "base_price": 10,
+        "start_time": (now - timedelta(minutes=1)).isoformat(),
+        "end_time": (now + timedelta(hours=1)).isoformat()
+    }, headers=seller)
+    check_auction_status()
+    return response.json()["id"], seller
+
+
+def test_bids_must_beat_the_highest_bid(client, register, auction):
+    auction_id, seller = auction
+    _, buyer = register("buyer@example.com")
+    bid = {"auction_id": auction_id}
+    assert client.post("/bids/place", json={**bid, "amount": 10}, headers=buyer).status_code == 400
+    first = client.post("/bids/place", json={**bid, "amount": 20}, headers=buyer).json()
+    second = client.post("/bids/place", json={**bid, "amount": 25}, headers=buyer).json()
+    response = client.post("/bids/place", json={**bid, "amount": 25}, headers=buyer)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Bid must be higher than current highest bid of $25.0"
+
+    assert client.get(f"/auctions/{auction_id}").json()["current_highest_bid"] == 25
+    assert [bid["id"] for bid in client.get(f"/auctions/{auction_id}/bids").json()] == [second["id"], first["id"]]
+    messages = [notification["message"] for notification in client.get("/notifications", headers=seller).json()]
+    assert len(messages) == 2 and all("placed on your auction 'Lamp'" in message for message in messages)
+
+
+def test_bids_need_an_active_auction(client, register, auction):
+    _, buyer = register("buyer@example.com")
+    response = client.post("/bids/place", json={"auction_id": 999, "amount": 20}, headers=buyer)
+    assert response.status_code == 404
+
+    _, seller = auction
+    now = datetime.utcnow()
+    upcoming = client.post("/auctions/create", json={
+        "product_name": "Vase",
+        "description": "Glass",
+        "base_price": 10,
+        "start_time": (now + timedelta(hours=1)).isoformat(),
+        "end_time": (now + timedelta(hours=2)).isoformat()
+    }, headers=seller).json()
+    response = client.post("/bids/place", json={"auction_id": upcoming["id"], "amount": 20}, headers=buyer)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Auction is not active"
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+import database
+from database import CHANGE_LOG_RETENTION_HOURS, prune_change_log
+from models import ChangeLogEntry
+
+
+def create_auction(client, seller, name):
+    now = datetime.utcnow()
+    response = client.post("/auctions/create", json={
+        "product_name": name,
+        "description": "Brass",
+        "base_price": 10,
+        "start_time": (now + timedelta(hours=1)).isoformat(),
+        "end_time": (now + timedelta(hours=2)).isoformat()
+    }, headers=seller)
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def test_cursors_outside_the_change_log_reset_the_client(client, register):
+    _, seller = register("seller@example.com", "seller")
+    create_auction(client, seller, "Lamp")
+    reset = client.get("/changes").json()
+    assert reset["reset"] is True and set(reset) == {"cursor", "reset"}
+    cursor = reset["cursor"]
+    assert client.get("/changes", params={"since": cursor + 1}).json() == {"cursor": cursor, "reset": True}
+    assert client.get("/changes", params={"since": cursor}).json()["auctions"] == []
+
+    # Once the entries after a cursor are pruned, it can no longer be served
+    create_auction(client, seller, "Clock")
+    with database.engine.begin() as conn:
+        conn.execute(update(ChangeLogEntry.__table__).values(
+            created_at=datetime.utcnow() - timedelta(hours=CHANGE_LOG_RETENTION_HOURS + 1)
+        ))
+    prune_change_log()
+    assert client.get("/changes", params={"since": 0}).json() == {"cursor": cursor + 1, "reset": True}
+    # The newest entry is kept, so a client that was up to date sees no gap
+    caught_up = client.get("/changes", params={"since": cursor + 1}).json()
+    assert "reset" not in caught_up and caught_up["auctions"] == []
+
+
+def test_changes_are_paged_in_log_order(client, register):
+    _, seller = register("seller@example.com", "seller")
+    cursor = client.get("/changes").json()["cursor"]
+    ids = [create_auction(client, seller, f"Lamp {n}") for n in range(5)]
+    pages = []
+    while True:
+        page = client.get("/changes", params={"since": cursor, "limit": 2, "fields": "product_name"}).json()
+        pages.append([auction["id"] for auction in page["auctions"]])
+        assert page["cursor"] > cursor
+        cursor = page["cursor"]
+        if not page["more"]:
+            break
+    assert pages == [ids[0:2], ids[2:4], ids[4:]]
+    assert page["auctions"][0] == {"id": ids[4], "product_name": "Lamp 4"}
+    idle = client.get("/changes", params={"since": cursor}).json()
+    assert idle == {"cursor": cursor, "more": False, "auctions": [], "users": []}
+
+
+def test_changes_list_users_and_the_callers_notifications(client, register):
+    cursor = client.get("/changes").json()["cursor"]
+    buyer_id, buyer = register("buyer@example.com")
+    register("other@example.com")
+    anonymous = client.get("/changes", params={"since": cursor}).json()
+    assert [user["email"] for user in anonymous["users"]] == ["buyer@example.com", "other@example.com"]
+    assert "notifications" not in anonymous
+    assert client.get("/changes", params={"since": cursor}, headers=buyer).json()["notifications"] == []
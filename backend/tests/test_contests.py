@@ -0,0 +1,24 @@
+from sqlalchemy import func, select
+
+import database
+from models import ContestWinner, LedgerEntry
+
+
+def test_announcing_twice_draws_once(client, register):
+    user_ids = [register(f"buyer{n}@example.com")[0] for n in range(4)]
+    _, admin = register("admin@example.com", "admin")
+    contest_id = client.post("/admin/contests", json={"name": "Spring draw"}, headers=admin).json()["id"]
+    entries = [{"user_id": user_id} for user_id in user_ids]
+    assert client.post(f"/contests/{contest_id}/entries", json=entries, headers=admin).status_code == 200
+    tiers = [{"prizeRank": 1, "prizeAmount": 50, "numberOfWinners": 2}]
+    assert client.post(f"/admin/contests/{contest_id}/prize-structure", json=tiers, headers=admin).status_code == 200
+
+    announce = f"/admin/contests/{contest_id}/announce-prize"
+    first = client.post(announce, params={"seed": "a"}, headers=admin).json()
+    second = client.post(announce, params={"seed": "b"}, headers=admin).json()
+    assert second == first
+    assert first["seed"] == "a"
+    assert len(first["winners"]) == 2
+    with database.engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(ContestWinner.__table__)).scalar() == 2
+        assert conn.execute(select(func.count()).select_from(LedgerEntry.__table__)).scalar() == 2
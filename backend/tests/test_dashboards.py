@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import delete, insert, select
+
+import database
+from schemas import BidResponse
+from services import dashboards
+from services.dashboards import backfill_dashboards, count_auctions, rebuild_dashboards, summarize_bids
+from services.lifecycle import check_auction_status
+from models import AuctionSummary, Backfill, RebuiltSummary, UserSummary
+from settings import Settings
+
+
+@pytest.fixture
+def settings():
+    return Settings.in_memory(shard_count=2)
+
+
+def create_auctions(client, seller, count):
+    now = datetime.utcnow()
+    ids = []
+    for n in range(count):
+        response = client.post("/auctions/create", json={
+            "product_name": f"Lamp {n}",
+            "description": "Brass",
+            "base_price": 10,
+            "start_time": (now - timedelta(minutes=1)).isoformat(),
+            "end_time": (now + timedelta(hours=1)).isoformat()
+        }, headers=seller)
+        ids.append(response.json()["id"])
+    check_auction_status()
+    return ids
+
+
+def test_summaries_queued_behind_a_rebuild_are_not_counted_twice(client, register, monkeypatch):
+    seller_id, seller = register("seller@example.com", "seller")
+    _, buyer = register("buyer@example.com")
+    auction_ids = create_auctions(client, seller, 2)
+    assert {database.shard_router.shard_for(auction_id) for auction_id in auction_ids} == {0, 1}
+    bids = []
+    for auction_id in auction_ids:
+        response = client.post("/bids/place", json={"auction_id": auction_id, "amount": 20}, headers=buyer)
+        bids.append(BidResponse(**response.json()))
+
+    def summarize_queued(seconds):
+        # As if the other shard's bid and auction had their summaries waiting for the rebuild
+        with database.engine.begin() as conn:
+            summarize_bids(conn, [bid for bid in bids if database.shard_router.shard_for(bid.auction_id) == 1])
+            count_auctions(conn, [
+                {"id": auction_id, "seller_id": seller_id}
+                for auction_id in auction_ids if database.shard_router.shard_for(auction_id) == 1
+            ])
+    monkeypatch.setattr(dashboards, "time", SimpleNamespace(sleep=summarize_queued))
+    rebuild_dashboards()
+
+    assert client.get("/dashboard/buyer", headers=buyer).json()["total_bids"] == 2
+    assert client.get("/dashboard/seller", headers=seller).json()["total_auctions"] == 2
+    with database.engine.connect() as conn:
+        assert conn.execute(select(AuctionSummary.total_bids).order_by(AuctionSummary.auction_id)).scalars().all() == [1, 1]
+        assert conn.execute(select(RebuiltSummary.entity_id)).first() is None
+
+    # Later bids are counted as usual
+    client.post("/bids/place", json={"auction_id": auction_ids[1], "amount": 30}, headers=buyer)
+    assert client.get("/dashboard/buyer", headers=buyer).json()["total_bids"] == 3
+
+
+def test_backfill_retires_the_legacy_marker_row(client, register):
+    _, seller = register("seller@example.com", "seller")
+    create_auctions(client, seller, 1)
+    with database.engine.begin() as conn:
+        conn.execute(delete(Backfill.__table__))
+        conn.execute(insert(UserSummary.__table__).values(user_id=0, total_bids=0, total_auctions=0))
+    backfill_dashboards()
+    backfill_dashboards()
+    with database.engine.connect() as conn:
+        assert conn.execute(select(UserSummary.user_id).where(UserSummary.user_id == 0)).first() is None
+    assert client.get("/dashboard/seller", headers=seller).json()["total_auctions"] == 1
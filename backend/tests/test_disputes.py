@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import delete, insert
+
+import database
+from services.leaderboards import rebuild_leaderboards
+from services.ledger import backfill_settlement_credits
+from services.lifecycle import check_auction_status
+from models import Auction, AuctionStatus, Backfill
+from settings import Settings
+
+
+@pytest.fixture
+def settings():
+    return Settings.in_memory(platform_fee_percent=10)
+
+
+def balance(client, headers):
+    return client.get("/wallet/balance", headers=headers).json()["balance"]
+
+
+def test_cancelling_a_sold_auction_reverses_the_seller_credit(client, register):
+    _, seller = register("seller@example.com", "seller")
+    bidder_id, _ = register("buyer@example.com")
+    _, admin = register("admin@example.com", "admin")
+    now = datetime.utcnow()
+    auction_id = client.post("/auctions/create", json={
+        "product_name": "Lamp",
+        "description": "Brass",
+        "base_price": 100,
+        "start_time": (now - timedelta(minutes=1)).isoformat(),
+        "end_time": (now + timedelta(hours=1)).isoformat()
+    }, headers=seller).json()["id"]
+    resolve = f"/admin/resolve-dispute/{auction_id}"
+
+    assert client.post(resolve, params={"action": "force_winner", "winner_id": bidder_id}, headers=admin).status_code == 200
+    assert balance(client, seller) == 90
+    assert client.post(resolve, params={"action": "cancel"}, headers=admin).status_code == 200
+    assert balance(client, seller) == 0
+    assert client.post(resolve, params={"action": "cancel"}, headers=admin).status_code == 200
+    assert balance(client, seller) == 0
+    for params in ({"action": "force_winner", "winner_id": bidder_id}, {"action": "extend"}):
+        assert client.post(resolve, params=params, headers=admin).status_code == 409
+    assert balance(client, seller) == 0
+
+
+def test_cancelling_a_sold_auction_takes_it_off_the_leaderboards(client, register):
+    seller_id, seller = register("seller@example.com", "seller")
+    bidder_id, buyer = register("buyer@example.com")
+    _, admin = register("admin@example.com", "admin")
+    now = datetime.utcnow()
+    auction_id = client.post("/auctions/create", json={
+        "product_name": "Lamp",
+        "description": "Brass",
+        "base_price": 100,
+        "start_time": (now - timedelta(minutes=1)).isoformat(),
+        "end_time": (now + timedelta(hours=1)).isoformat()
+    }, headers=seller).json()["id"]
+    check_auction_status()
+    assert client.post("/bids/place", json={"auction_id": auction_id, "amount": 120}, headers=buyer).status_code == 200
+    resolve = f"/admin/resolve-dispute/{auction_id}"
+    client.post(resolve, params={"action": "force_winner", "winner_id": bidder_id}, headers=admin)
+
+    def scores():
+        return {
+            board: client.get(f"/admin/leaderboards/{board}/users/{user_id}", headers=admin).json()["score"]
+            for board, user_id in (("buyers", bidder_id), ("sellers", seller_id), ("bidders", bidder_id))
+        }
+
+    assert scores() == {"buyers": 120, "sellers": 120, "bidders": 1}
+    client.post(resolve, params={"action": "cancel"}, headers=admin)
+    client.post(resolve, params={"action": "cancel"}, headers=admin)
+    assert scores() == {"buyers": 0, "sellers": 0, "bidders": 1}
+    # The rollups agree with the live boards, so a restart counts the bid once
+    rebuild_leaderboards()
+    assert scores() == {"buyers": 0, "sellers": 0, "bidders": 1}
+
+
+def test_settlement_backfill_charges_the_fee_and_runs_once(client, register):
+    seller_id, seller = register("seller@example.com", "seller")
+    bidder_id, _ = register("buyer@example.com")
+    now = datetime.utcnow()
+    with database.engine.begin() as conn:
+        conn.execute(insert(Auction.__table__).values(
+            product_name="Lamp", description="Brass", base_price=50, current_highest_bid=200,
+            start_time=now - timedelta(days=2), end_time=now - timedelta(days=1),
+            status=AuctionStatus.WINNER_SELECTED, seller_id=seller_id, winner_id=bidder_id
+        ))
+    backfill_settlement_credits()
+    assert balance(client, seller) == 0
+
+    with database.engine.begin() as conn:
+        conn.execute(delete(Backfill.__table__).where(Backfill.name == "settlement_credits"))
+    backfill_settlement_credits()
+    backfill_settlement_credits()
+    assert balance(client, seller) == 180
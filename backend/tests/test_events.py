@@ -0,0 +1,23 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, select
+
+import database
+from services.events import event_bus
+from models import EventLogEntry
+
+
+def log_event(conn):
+    return conn.execute(
+        insert(EventLogEntry.__table__).values(topic="bid.placed", payload="{}", origin="other", created_at=datetime.utcnow())
+    ).inserted_primary_key[0]
+
+
+def test_pruned_event_ids_are_never_reused(client):
+    with database.engine.begin() as conn:
+        ids = [log_event(conn) for _ in range(3)]
+    event_bus.prune(timedelta(0))
+    with database.engine.begin() as conn:
+        assert conn.execute(select(func.count()).select_from(EventLogEntry.__table__)).scalar() == 1
+        conn.execute(EventLogEntry.__table__.delete())
+        assert log_event(conn) > ids[-1]
@@ -0,0 +1,88 @@
+import math
+from datetime import datetime, timedelta
+
+import feeds
+from feeds import DecayingRank, EndingSoonIndex
+from models import AuctionStatus
+from services.feeds import on_feed_status_event
+from services.lifecycle import check_auction_status
+
+
+def test_ending_soon_orders_by_end_time_within_the_window():
+    index = EndingSoonIndex()
+    for auction_id, end_time in ((1, 50), (2, 10), (3, 30), (4, 30), (5, 90)):
+        index.upsert(auction_id, end_time)
+    assert index.ending_between(0, 60, 10) == [2, 3, 4, 1]
+    # Ended auctions drop out at the start of the window, later ones at its end
+    assert index.ending_between(10, 50, 10) == [3, 4, 1]
+    assert index.ending_between(0, 60, 2) == [2, 3]
+
+    index.upsert(2, 100)
+    index.remove(3)
+    index.remove(42)
+    assert len(index) == 4
+    assert index.ending_between(0, 1000, 10) == [4, 1, 5, 2]
+
+
+def test_decaying_rank_orders_by_recent_rate():
+    rank = DecayingRank(decay_seconds=60)
+    start = 1_000_000.0
+    rank._reference = start
+    for at in (0, 1, 2, 3):
+        rank.record("old", start + at)
+    for at in (200, 201):
+        rank.record("new", start + at)
+    # Four bids 3 minutes ago weigh less than two just now
+    assert [key for key, _ in rank.top(2, now=start + 201)] == ["new", "old"]
+    [(key, rate)] = rank.top(1, now=start + 201)
+    assert math.isclose(rate, (1 + math.exp(-1 / 60)) * 60 / 60)
+    # Reads don't consume the heap
+    assert [key for key, _ in rank.top(5, now=start + 201)] == ["new", "old"]
+
+    rank.remove("new")
+    assert [key for key, _ in rank.top(5, now=start + 201)] == ["old"]
+
+
+def test_decaying_rank_rebases_without_losing_order(monkeypatch):
+    monkeypatch.setattr(feeds, "HOT_REBASE_SECONDS", 100)
+    rank = DecayingRank(decay_seconds=60)
+    start = rank._reference
+    for n in range(200):
+        rank.record(n % 3, start + n)
+    assert rank._reference > start
+    assert len(rank._heap) <= 2 * len(rank) + 64
+    assert [key for key, _ in rank.top(3, now=start + 199)] == [1, 0, 2]
+    # Long-idle keys decay away at a rebase
+    rank.record("late", start + 100_000)
+    assert len(rank) == 1
+
+
+def test_feeds_follow_auctions_and_bids(client, register):
+    _, seller = register("seller@example.com", "seller")
+    _, buyer = register("buyer@example.com")
+    now = datetime.utcnow()
+    ids = [
+        client.post("/auctions/create", json={
+            "product_name": f"Lamp {n}",
+            "description": "Brass",
+            "base_price": 10,
+            "start_time": (now - timedelta(minutes=1)).isoformat(),
+            "end_time": (now + timedelta(minutes=minutes)).isoformat()
+        }, headers=seller).json()["id"]
+        for n, minutes in enumerate((30, 10, 120))
+    ]
+    check_auction_status()
+    assert [card["id"] for card in client.get("/feeds/ending-soon").json()] == [ids[1], ids[0]]
+    assert [card["id"] for card in client.get("/feeds/ending-soon", params={"within_minutes": 180, "limit": 2}).json()] == ids[1::-1]
+
+    for amount in (20, 30):
+        client.post("/bids/place", json={"auction_id": ids[2], "amount": amount}, headers=buyer)
+    client.post("/bids/place", json={"auction_id": ids[0], "amount": 20}, headers=buyer)
+    hot = client.get("/feeds/hot").json()
+    assert [card["id"] for card in hot] == [ids[2], ids[0]]
+    assert hot[0]["current_highest_bid"] == 30 and hot[0]["bids_per_minute"] > hot[1]["bids_per_minute"]
+
+    # An auction leaves both feeds once it ends
+    on_feed_status_event({"auction_id": ids[2], "status": AuctionStatus.ENDED.value})
+    assert [card["id"] for card in client.get("/feeds/hot").json()] == [ids[0]]
+    assert ids[2] not in [card["id"] for card in client.get("/feeds/ending-soon", params={"within_minutes": 180}).json()]
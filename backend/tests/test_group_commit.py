@@ -0,0 +1,107 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+import database
+import main
+from schemas import BidCreate
+from services import bids
+from services.events import event_bus
+from services.lifecycle import check_auction_status
+from models import Bid
+from settings import Settings
+
+
+@pytest.fixture
+def settings():
+    return Settings.in_memory(shard_count=2, bid_flush_window_ms=50)
+
+
+@pytest.fixture
+def auction_ids(client, register):
+    _, seller = register("seller@example.com", "seller")
+    now = datetime.utcnow()
+    ids = []
+    for n in range(4):
+        response = client.post("/auctions/create", json={
+            "product_name": f"Lamp {n}",
+            "description": "Brass",
+            "base_price": 10,
+            "start_time": (now - timedelta(minutes=1)).isoformat(),
+            "end_time": (now + timedelta(hours=1)).isoformat()
+        }, headers=seller)
+        ids.append(response.json()["id"])
+    check_auction_status()
+    return ids
+
+
+def test_batched_bids_keep_the_time_they_were_queued_at(client, register, auction_ids):
+    _, buyer = register("buyer@example.com")
+    bids = [{"auction_id": auction_id, "amount": 20} for auction_id in auction_ids * 2]
+    bids[4:] = [dict(bid, amount=30) for bid in bids[4:]]
+    with ThreadPoolExecutor(len(bids)) as pool:
+        responses = list(pool.map(lambda bid: client.post("/bids/place", json=bid, headers=buyer), bids))
+    placed = [response.json() for response in responses if response.status_code == 200]
+    assert len(placed) >= len(auction_ids)
+    assert len({bid["bid_time"] for bid in placed}) == len(placed)
+    for engine in database.shard_router.engines:
+        with engine.connect() as conn:
+            times = conn.execute(select(Bid.bid_time).order_by(Bid.id)).scalars().all()
+        assert times == sorted(times)
+
+
+def test_committed_bids_succeed_when_publishing_fails(client, register, auction_ids, monkeypatch):
+    _, buyer = register("buyer@example.com")
+
+    def fail(topic, payloads):
+        raise RuntimeError("event log unavailable")
+
+    monkeypatch.setattr(event_bus, "publish_many", fail)
+    response = client.post("/bids/place", json={"auction_id": auction_ids[0], "amount": 20}, headers=buyer)
+    assert response.status_code == 200
+    assert client.get(f"/auctions/{auction_ids[0]}").json()["current_highest_bid"] == 20
+
+
+def test_a_stopped_writer_refuses_bids_straight_away(client, register, auction_ids):
+    _, buyer = register("buyer@example.com")
+    writer = bids.bid_writer
+    writer.stop()
+    bid = BidCreate(auction_id=auction_ids[0], amount=20, bidder_id=1)
+    with pytest.raises(HTTPException) as refused:
+        writer.submit(bid)
+    assert refused.value.status_code == 503
+    # Requests arriving after shutdown no longer reach the stopped writer
+    bids.bid_writer = None
+    assert client.post("/bids/place", json={"auction_id": auction_ids[0], "amount": 20}, headers=buyer).status_code == 200
+
+
+def test_stopping_the_app_detaches_the_writer(settings):
+    with TestClient(main.create_app(settings)):
+        assert bids.bid_writer is not None
+    assert bids.bid_writer is None
+
+
+def test_batches_join_the_traces_of_their_requests(client, register, auction_ids, monkeypatch):
+    _, buyer = register("buyer@example.com")
+    exported = []
+    monkeypatch.setattr(database.tracer, "exporter", type("Collector", (), {"export": lambda self, request: exported.append(request)})())
+    trace_ids = [f"{n + 1:032x}" for n in range(len(auction_ids))]
+
+    def place(auction_id, trace_id):
+        headers = {**buyer, "traceparent": f"00-{trace_id}-{'1' * 16}-01"}
+        return client.post("/bids/place", json={"auction_id": auction_id, "amount": 20}, headers=headers)
+
+    with ThreadPoolExecutor(len(auction_ids)) as pool:
+        assert all(response.status_code == 200 for response in pool.map(place, auction_ids, trace_ids))
+    # Bids are answered before their batch span ends; stopping the writer waits for it
+    bids.bid_writer.stop()
+    database.tracer.flush()
+    spans = [span for request in exported for span in request["resourceSpans"][0]["scopeSpans"][0]["spans"]]
+    batches = [span for span in spans if span["name"] == "bid.batch"]
+    assert batches and all("parentSpanId" in span for span in batches)
+    traced = {span["traceId"] for span in batches} | {link["traceId"] for span in batches for link in span.get("links", [])}
+    assert traced == set(trace_ids)
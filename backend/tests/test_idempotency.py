@@ -0,0 +1,137 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, insert, select
+
+import database
+from services import idempotency
+from services.idempotency import IDEMPOTENCY_CACHE_SIZE, IdempotencyStore
+from services.lifecycle import check_auction_status
+from models import Bid, IdempotencyRecord
+from settings import Settings
+
+
+@pytest.fixture(params=[0, 50], ids=["direct", "group-commit"])
+def settings(request):
+    return Settings.in_memory(shard_count=2, bid_flush_window_ms=request.param)
+
+
+@pytest.fixture
+def auction_id(client, register):
+    _, seller = register("seller@example.com", "seller")
+    now = datetime.utcnow()
+    # One of the two lands on the other shard
+    ids = []
+    for n in range(2):
+        response = client.post("/auctions/create", json={
+            "product_name": f"Lamp {n}",
+            "description": "Brass",
+            "base_price": 10,
+            "start_time": (now - timedelta(minutes=1)).isoformat(),
+            "end_time": (now + timedelta(hours=1)).isoformat()
+        }, headers=seller)
+        assert response.status_code == 200, response.text
+        ids.append(response.json()["id"])
+    check_auction_status()
+    return next(auction_id for auction_id in ids if database.shard_router.shard_for(auction_id) != 0)
+
+
+def place(client, bid, key, headers):
+    return client.post("/bids/place", json=bid, headers={**headers, "Idempotency-Key": key})
+
+
+def count_bids(auction_id):
+    with database.shard_router.engine_for(auction_id).connect() as conn:
+        return conn.execute(select(func.count()).select_from(Bid).where(Bid.auction_id == auction_id)).scalar()
+
+
+def stored_response(engine, scope, key):
+    with engine.connect() as conn:
+        return conn.execute(
+            select(IdempotencyRecord.response).where(IdempotencyRecord.scope == scope, IdempotencyRecord.key == key)
+        ).scalar()
+
+
+def test_retry_replays_the_stored_response(client, register, auction_id):
+    bidder_id, buyer = register("buyer@example.com")
+    bid = {"auction_id": auction_id, "amount": 20}
+    first = place(client, bid, "k1", buyer)
+    assert first.status_code == 200, first.text
+    assert place(client, bid, "k1", buyer).json() == first.json()
+    assert count_bids(auction_id) == 1
+    # Stored with the bid on its shard, and copied to the claim in auction.db
+    scope = f"bids.place:{bidder_id}"
+    assert json.loads(stored_response(database.shard_router.engine_for(auction_id), scope, "k1")) == first.json()
+    assert json.loads(stored_response(database.engine, scope, "k1")) == first.json()
+
+
+def test_keys_are_scoped_per_user(client, register, auction_id):
+    _, first_buyer = register("first@example.com")
+    _, second_buyer = register("second@example.com")
+    first = place(client, {"auction_id": auction_id, "amount": 20}, "same", first_buyer)
+    second = place(client, {"auction_id": auction_id, "amount": 30}, "same", second_buyer)
+    assert first.status_code == second.status_code == 200
+    assert first.json()["id"] != second.json()["id"]
+    assert count_bids(auction_id) == 2
+
+
+def test_abandoned_claim_replays_a_response_committed_on_the_shard(client, register, auction_id):
+    bidder_id, buyer = register("buyer@example.com")
+    bid = {"auction_id": auction_id, "amount": 20}
+    first = place(client, bid, "k1", buyer)
+    # As if the worker committed the bid but died before copying the response
+    # to auction.db and its claim's lock has since run out
+    scope = f"bids.place:{bidder_id}"
+    now = datetime.utcnow()
+    records = IdempotencyRecord.__table__
+    with database.engine.begin() as conn:
+        conn.execute(records.delete().where(records.c.scope == scope))
+        conn.execute(insert(records).values(
+            scope=scope, key="k1", request_hash="abandoned",
+            locked_until=now - timedelta(seconds=1), expires_at=now + timedelta(hours=1)
+        ))
+    idempotency.idempotency_store = IdempotencyStore(IDEMPOTENCY_CACHE_SIZE)
+    assert place(client, bid, "k1", buyer).json() == first.json()
+    assert count_bids(auction_id) == 1
+
+
+def test_retried_auction_create_replays(client, register):
+    _, seller = register("seller@example.com", "seller")
+    now = datetime.utcnow()
+    auction = {
+        "product_name": "Lamp",
+        "description": "Brass",
+        "base_price": 10,
+        "start_time": now.isoformat(),
+        "end_time": (now + timedelta(hours=1)).isoformat()
+    }
+    headers = {**seller, "Idempotency-Key": "k1"}
+    first = client.post("/auctions/create", json=auction, headers=headers)
+    assert first.json()["status"] == "created"
+    assert client.post("/auctions/create", json=auction, headers=headers).json() == first.json()
+    assert len(client.get("/auctions").json()) == 1
+
+
+def test_a_slow_request_keeps_its_claim(client, monkeypatch):
+    # Another worker's store shares the table but not this one's in-flight map
+    monkeypatch.setattr(idempotency, "IDEMPOTENCY_LOCK_SECONDS", 0.3)
+    first_store, second_store = IdempotencyStore(IDEMPOTENCY_CACHE_SIZE), IdempotencyStore(IDEMPOTENCY_CACHE_SIZE)
+    calls = []
+    started = threading.Event()
+
+    def slow(claim):
+        calls.append(claim.key)
+        started.set()
+        time.sleep(1.2)
+        return {"id": len(calls)}
+
+    with ThreadPoolExecutor(2) as pool:
+        first = pool.submit(first_store.execute, "bids.place:1", "k1", {"amount": 20}, slow)
+        started.wait()
+        second = pool.submit(second_store.execute, "bids.place:1", "k1", {"amount": 20}, slow)
+        assert first.result() == second.result() == {"id": 1}
+    assert calls == ["k1"]
@@ -0,0 +1,50 @@
+import csv
+import json
+from datetime import datetime, timedelta
+
+
+def auction_row(**overrides):
+    now = datetime.utcnow()
+    row = {
+        "product_name": "Lamp",
+        "description": "Brass",
+        "base_price": "10",
+        "start_time": (now + timedelta(hours=1)).isoformat(),
+        "end_time": (now + timedelta(hours=2)).isoformat()
+    }
+    row.update(overrides)
+    return row
+
+
+def upload(client, seller, name, content):
+    response = client.post("/auctions/import", files={"file": (name, content)}, headers=seller)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_csv_rows_with_bad_content_are_reported_per_row(client, register):
+    _, seller = register("seller@example.com", "seller")
+    row = auction_row()
+    header = ",".join(row).encode()
+    good = ",".join(row.values()).encode()
+    bad_bytes = ",".join(auction_row(product_name="L\xe4mpe").values()).encode("latin-1")
+    too_long = b"x" * (csv.field_size_limit() + 1)
+    content = b"\n".join([header, good, good + b",extra", bad_bytes, too_long, good]) + b"\n"
+    result = upload(client, seller, "auctions.csv", content)
+    assert result["imported"] == 2
+    assert result["errors"] == [
+        {"row": 2, "error": "Row has 1 more fields than the header"},
+        {"row": 3, "error": "Row is not valid UTF-8"},
+        {"row": 4, "error": f"Invalid CSV: field larger than field limit ({csv.field_size_limit()})"}
+    ]
+
+
+def test_ndjson_rows_with_bad_content_are_reported_per_row(client, register):
+    _, seller = register("seller@example.com", "seller")
+    good = json.dumps(auction_row()).encode()
+    bad_bytes = json.dumps(auction_row(product_name="L\xe4mpe"), ensure_ascii=False).encode("latin-1")
+    content = b"\n".join([good, bad_bytes, b"[1, 2]", b"{", good]) + b"\n"
+    result = upload(client, seller, "auctions.ndjson", content)
+    assert result["imported"] == 2
+    assert [error["row"] for error in result["errors"]] == [2, 3, 4]
+    assert result["errors"][0]["error"] == "Row is not valid UTF-8"
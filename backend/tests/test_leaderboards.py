@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.sql import func
+
+import database
+from services.leaderboards import backfill_leaderboard_rollups
+from models import Auction, AuctionStatus, Backfill, LeaderboardRollup
+
+
+def sold_auction(seller_id, winner_id):
+    now = datetime.utcnow()
+    with database.engine.begin() as conn:
+        conn.execute(insert(Auction.__table__).values(
+            product_name="Lamp", description="Brass", base_price=50, current_highest_bid=200,
+            start_time=now - timedelta(days=2), end_time=now - timedelta(days=1),
+            status=AuctionStatus.WINNER_SELECTED, seller_id=seller_id, winner_id=winner_id
+        ))
+
+
+def rollup_totals():
+    rollups = LeaderboardRollup.__table__
+    with database.engine.connect() as conn:
+        return dict(conn.execute(select(rollups.c.board, func.sum(rollups.c.amount)).group_by(rollups.c.board)).all())
+
+
+def test_rollup_backfill_runs_once(client, register):
+    seller_id, _ = register("seller@example.com", "seller")
+    bidder_id, _ = register("buyer@example.com")
+    sold_auction(seller_id, bidder_id)
+    with database.engine.begin() as conn:
+        conn.execute(delete(Backfill.__table__).where(Backfill.name == "leaderboard_rollups"))
+    backfill_leaderboard_rollups()
+    backfill_leaderboard_rollups()
+    assert rollup_totals() == {"buyers": 200, "sellers": 200}
+
+
+def test_rollup_backfill_retires_the_legacy_marker_row(client, register):
+    seller_id, _ = register("seller@example.com", "seller")
+    bidder_id, _ = register("buyer@example.com")
+    sold_auction(seller_id, bidder_id)
+    # A build from before the backfills table rolled the sale up and left its marker
+    with database.engine.begin() as conn:
+        conn.execute(delete(Backfill.__table__).where(Backfill.name == "leaderboard_rollups"))
+        conn.execute(insert(LeaderboardRollup.__table__).values(board="backfilled", user_id=0, day=0, amount=0))
+    backfill_leaderboard_rollups()
+    backfill_leaderboard_rollups()
+    assert rollup_totals() == {}
@@ -0,0 +1,11 @@
+def test_profiles_are_admin_only(client, register):
+    _, buyer = register("buyer@example.com")
+    for path in ("/admin/profile", "/admin/profile/routes"):
+        assert client.get(path, params={"seconds": 0.05}).status_code == 401
+        assert client.get(path, params={"seconds": 0.05}, headers=buyer).status_code == 403
+
+
+def test_admin_captures_a_short_profile(client, register):
+    _, admin = register("admin@example.com", "admin")
+    assert client.get("/admin/profile", params={"seconds": 0.05}, headers=admin).status_code == 200
+    assert client.get("/admin/profile", params={"seconds": 60}, headers=admin).status_code == 400
@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+import replay
+from services.auth import SECRET_KEY, ALGORITHM
+from settings import Settings
+
+
+@pytest.fixture
+def settings(tmp_path):
+    return Settings.in_memory(capture_file=str(tmp_path / "capture.jsonl"), capture_salt="salt")
+
+
+def drive_traffic(client, register):
+    _, seller = register("seller@example.com", "seller")
+    register("buyer@example.com")
+    assert client.post("/auth/login", json={"email": "buyer@example.com", "password": "secret123", "user_type": "buyer"}).status_code == 200
+    assert client.post("/auth/login", json={"email": "buyer@example.com", "password": "wrong", "user_type": "buyer"}).status_code == 401
+    now = datetime.utcnow()
+    response = client.post("/auctions/create", json={
+        "product_name": "Lamp",
+        "description": "Brass",
+        "base_price": 10,
+        "start_time": (now + timedelta(hours=1)).isoformat(),
+        "end_time": (now + timedelta(hours=2)).isoformat()
+    }, headers=seller)
+    assert response.status_code == 200, response.text
+    assert client.get("/auctions", params={"fields": "product_name"}).status_code == 200
+    assert client.get("/dashboard/seller", headers=seller).status_code == 200
+    assert client.get("/auctions/999").status_code == 404
+
+
+def test_capture_holds_no_pii_and_replays_with_the_same_statuses(client, register, settings, capsys):
+    drive_traffic(client, register)
+    with open(settings.capture_file, encoding="utf-8") as f:
+        raw = f.read()
+    assert "seller@example.com" not in raw and "secret123" not in raw and "Bearer" not in raw
+
+    records = replay.load_capture(settings.capture_file)
+    assert [(record["m"], record.get("r"), record["s"]) for record in records] == [
+        ("POST", "/auth/register", 200),
+        ("POST", "/auth/register", 200),
+        ("POST", "/auth/login", 200),
+        ("POST", "/auth/login", 401),
+        ("POST", "/auctions/create", 200),
+        ("GET", "/auctions", 200),
+        ("GET", "/dashboard/seller", 200),
+        ("GET", "/auctions/{auction_id}", 404)
+    ]
+    register_seller, _, login, wrong_login = records[:4]
+    # Hashed emails stay valid and equal, so the replayed login finds the replayed account
+    assert register_seller["b"]["email"].endswith("@example.com")
+    assert login["b"]["email"] == records[1]["b"]["email"] != register_seller["b"]["email"]
+    assert login["b"]["password"] != wrong_login["b"]["password"]
+    assert records[4]["u"] == records[6]["u"] and "u" not in records[5]
+    assert records[5]["q"] == "fields=product_name"
+
+    # A fresh app on empty databases answers the replay as the original did
+    with TestClient(main.create_app(Settings.in_memory()), raise_server_exceptions=False) as fresh:
+        results = replay.Replayer(fresh, SECRET_KEY, ALGORITHM).run(records, speed=0, workers=1)
+    assert [result["s"] for result in results] == [record["s"] for record in records]
+    assert not any(replay.is_error(result) for result in results)
+
+    replay.diff(results, results)
+    assert "0 requests changed status" in capsys.readouterr().out
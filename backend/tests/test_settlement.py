@@ -0,0 +1,122 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, insert, select
+
+import database
+from services import lifecycle
+from services.events import LeaseLost
+from services.lifecycle import check_auction_status
+from models import Auction, AuctionStatus, AuditWindow, BidAuditEntry, SettlementRun, WorkerLease
+from services.audit import anchor_bid_audit_log
+from settings import Settings
+
+
+def create_auction(client, seller, ends_in):
+    now = datetime.utcnow()
+    response = client.post("/auctions/create", json={
+        "product_name": "Lamp",
+        "description": "Brass",
+        "base_price": 10,
+        "start_time": (now - timedelta(minutes=1)).isoformat(),
+        "end_time": (now + ends_in).isoformat()
+    }, headers=seller)
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def settlement_runs():
+    with database.engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(SettlementRun.__table__)).scalar()
+
+
+def test_reads_and_idle_sweeps_write_no_settlement_runs(client, register):
+    _, seller = register("seller@example.com", "seller")
+    auction_id = create_auction(client, seller, timedelta(hours=1))
+    assert client.get("/auctions").status_code == 200
+    assert client.get(f"/auctions/{auction_id}").json()["status"] == "created"
+    check_auction_status()
+    check_auction_status()
+    assert client.get(f"/auctions/{auction_id}").json()["status"] == "active"
+    assert settlement_runs() == 0
+
+
+def test_due_auction_settles_on_the_next_sweep(client, register):
+    _, seller = register("seller@example.com", "seller")
+    bidder_id, buyer = register("buyer@example.com")
+    auction_id = create_auction(client, seller, timedelta(seconds=1))
+    check_auction_status()
+    bid = {"auction_id": auction_id, "amount": 20}
+    assert client.post("/bids/place", json=bid, headers=buyer).status_code == 200
+    time.sleep(1.1)
+
+    # Past its end time it takes no more bids, even before the sweep settles it
+    response = client.post("/bids/place", json={**bid, "amount": 30}, headers=buyer)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Auction has ended"
+    assert client.get(f"/auctions/{auction_id}").json()["status"] == "active"
+
+    check_auction_status()
+    assert client.get(f"/auctions/{auction_id}").json()["status"] == "winner_selected"
+    with database.engine.connect() as conn:
+        assert conn.execute(select(Auction.winner_id).where(Auction.id == auction_id)).scalar() == bidder_id
+    assert settlement_runs() == 1
+
+
+def ended_auction(seller_id):
+    now = datetime.utcnow()
+    with database.engine.begin() as conn:
+        return conn.execute(insert(Auction.__table__).values(
+            product_name="Lamp", description="Brass", base_price=10, current_highest_bid=10,
+            start_time=now - timedelta(hours=1), end_time=now - timedelta(minutes=1),
+            status=AuctionStatus.ACTIVE, seller_id=seller_id, created_at=now
+        )).inserted_primary_key[0]
+
+
+def auction_status(auction_id):
+    with database.engine.connect() as conn:
+        return conn.execute(select(Auction.status).where(Auction.id == auction_id)).scalar()
+
+
+@pytest.mark.parametrize("settings", [Settings.in_memory(workers=2)])
+def test_a_sweep_stops_writing_once_its_lease_is_taken_over(client, register):
+    seller_id, _ = register("seller@example.com", "seller")
+    auction_id = ended_auction(seller_id)
+    assert lifecycle.lifecycle_lease.try_acquire()
+    # Another worker took the lease over while this one still thinks it leads
+    with database.engine.begin() as conn:
+        conn.execute(WorkerLease.__table__.update().values(holder="other:1"))
+    with pytest.raises(LeaseLost):
+        check_auction_status()
+    assert auction_status(auction_id) == AuctionStatus.ACTIVE
+    assert not lifecycle.lifecycle_lease.is_leader
+    assert settlement_runs() == 1
+
+
+@pytest.mark.parametrize("settings", [Settings.in_memory(workers=2)])
+def test_the_leader_renews_its_lease_with_each_chunk(client, register):
+    seller_id, _ = register("seller@example.com", "seller")
+    auction_id = ended_auction(seller_id)
+    assert lifecycle.lifecycle_lease.try_acquire()
+    leases = WorkerLease.__table__
+    with database.engine.begin() as conn:
+        conn.execute(leases.update().values(expires_at=datetime.utcnow() + timedelta(seconds=1)))
+    check_auction_status()
+    assert auction_status(auction_id) == AuctionStatus.ENDED
+    with database.engine.connect() as conn:
+        assert conn.execute(select(leases.c.expires_at)).scalar() > datetime.utcnow() + timedelta(seconds=5)
+
+
+@pytest.mark.parametrize("settings", [Settings.in_memory(workers=2)])
+def test_audit_anchoring_is_fenced_by_the_lease(client):
+    with database.engine.begin() as conn:
+        conn.execute(insert(BidAuditEntry.__table__).values(bid_id=1, auction_id=1, payload="{}"))
+    assert lifecycle.lifecycle_lease.try_acquire()
+    with database.engine.begin() as conn:
+        conn.execute(WorkerLease.__table__.update().values(holder="other:1"))
+    with pytest.raises(LeaseLost):
+        anchor_bid_audit_log(database.engine, lifecycle.lease_fence())
+    with database.engine.connect() as conn:
+        assert conn.execute(select(BidAuditEntry.entry_hash)).scalar() is None
+        assert conn.execute(select(func.count()).select_from(AuditWindow.__table__)).scalar() == 0
@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import delete, insert, select
+
+import database
+from database import backfill_user_notifications
+from services.lifecycle import check_auction_status
+from models import Auction, Backfill, Notification
+from settings import Settings
+
+
+@pytest.fixture
+def settings():
+    return Settings.in_memory(shard_count=2)
+
+
+def auction_payload(**overrides):
+    now = datetime.utcnow()
+    payload = {
+        "product_name": "Lamp",
+        "description": "Brass",
+        "base_price": 10,
+        "start_time": (now - timedelta(minutes=1)).isoformat(),
+        "end_time": (now + timedelta(hours=1)).isoformat()
+    }
+    payload.update(overrides)
+    return payload
+
+
+def import_csv(client, seller, count):
+    header = "product_name,description,base_price,start_time,end_time"
+    row = auction_payload()
+    lines = [header] + [f"Lamp {n},Brass,10,{row['start_time']},{row['end_time']}" for n in range(count)]
+    response = client.post("/auctions/import", files={"file": ("a.csv", "\n".join(lines))}, headers=seller)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def auction_ids():
+    ids = {}
+    for shard, engine in enumerate(database.shard_router.engines):
+        with engine.connect() as conn:
+            ids[shard] = conn.execute(select(Auction.id)).scalars().all()
+    return ids
+
+
+def test_an_import_chunk_lands_on_one_shard(client, register):
+    _, seller = register("seller@example.com", "seller")
+    assert import_csv(client, seller, 5)["imported"] == 5
+    assert import_csv(client, seller, 5)["imported"] == 5
+    ids = auction_ids()
+    assert sorted(len(shard_ids) for shard_ids in ids.values()) in ([0, 10], [5, 5])
+    assert client.get("/dashboard/seller", headers=seller).json()["total_auctions"] == 10
+
+
+def test_a_failed_chunk_reports_each_of_its_rows(client, register, monkeypatch):
+    _, seller = register("seller@example.com", "seller")
+    import_csv(client, seller, 2)
+    taken = [auction_id for shard_ids in auction_ids().values() for auction_id in shard_ids]
+    monkeypatch.setattr(database.shard_router, "reserve_colocated", lambda name, count, conn=None: taken[:1] * count)
+    result = import_csv(client, seller, 3)
+    assert result["imported"] == 0
+    assert [error["row"] for error in result["errors"]] == [1, 2, 3]
+    assert sum(len(shard_ids) for shard_ids in auction_ids().values()) == 2
+
+
+def test_notifications_live_on_their_users_shard(client, register):
+    users = [register(f"user{n}@example.com", "seller" if n == 0 else "buyer") for n in range(3)]
+    (seller_id, seller), buyer = users[0], next(headers for user_id, headers in users if user_id % 2 != users[0][0] % 2)
+    created = [client.post("/auctions/create", json=auction_payload(), headers=seller).json()["id"] for _ in range(2)]
+    auction_id = next(auction_id for auction_id in created if auction_id % 2 != seller_id % 2)
+    check_auction_status()
+    cursor = client.get("/changes", headers=seller).json()["cursor"]
+
+    response = client.post("/bids/place", json={"auction_id": auction_id, "amount": 20}, headers=buyer)
+    assert response.status_code == 200
+    notifications = client.get("/notifications", headers=seller).json()
+    assert [n["message"] for n in notifications] == ["New bid of $20.0 placed on your auction 'Lamp'"]
+    with database.shard_router.engines[seller_id % 2].connect() as conn:
+        assert conn.execute(select(Notification.user_id)).scalars().all() == [seller_id]
+    changes = client.get("/changes", params={"since": cursor}, headers=seller).json()
+    assert [n["id"] for n in changes["notifications"]] == [notifications[0]["id"]]
+    response = client.put(f"/notifications/{notifications[0]['id']}/read", headers=seller)
+    assert response.status_code == 200
+
+
+def test_notifications_written_next_to_their_auction_move_once(client, register):
+    user_id, buyer = register("buyer@example.com")
+    wrong = 1 - database.shard_router.shard_for_user(user_id)
+    with database.shard_router.engines[wrong].begin() as conn:
+        conn.execute(insert(Notification.__table__).values(id=999, user_id=user_id, message="Hello", is_read=False))
+    with database.engine.begin() as conn:
+        conn.execute(delete(Backfill.__table__).where(Backfill.name == "user_notifications"))
+    backfill_user_notifications()
+    assert [n["id"] for n in client.get("/notifications", headers=buyer).json()] == [999]
+    with database.shard_router.engines[wrong].connect() as conn:
+        assert conn.execute(select(Notification.id)).first() is None
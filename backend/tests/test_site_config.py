@@ -0,0 +1,57 @@
+from routers.site_config import SITE_CONFIG_IMMUTABLE_MAX_AGE_SECONDS, SITE_CONFIG_MAX_AGE_SECONDS
+
+
+def add_slider(client, admin, title, **fields):
+    response = client.post("/admin/home-sliders", data={"title": title, "image_url": f"/{title}.jpg", **fields}, headers=admin)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_site_config_revalidates_with_its_etag(client, register):
+    _, admin = register("admin@example.com", "admin")
+    add_slider(client, admin, "Spring", order=2)
+    add_slider(client, admin, "Summer", order=1)
+    response = client.get("/site-config")
+    assert response.status_code == 200
+    assert response.headers["cache-control"].startswith(f"public, max-age={SITE_CONFIG_MAX_AGE_SECONDS},")
+    assert [slider["title"] for slider in response.json()["sliders"]] == ["Summer", "Spring"]
+    etag = response.headers["etag"]
+
+    for if_none_match in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        cached = client.get("/site-config", headers={"If-None-Match": if_none_match})
+        assert cached.status_code == 304 and cached.content == b""
+        assert cached.headers["etag"] == etag
+
+    # An edit publishes a new snapshot, and with it a new ETag
+    assert client.put("/admin/contact", json={"email": "help@example.com"}, headers=admin).status_code == 200
+    changed = client.get("/site-config", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+    assert changed.json()["contact"] == {"contactNo": None, "email": "help@example.com", "website": None}
+    assert changed.json()["version"] > response.json()["version"]
+
+
+def test_the_current_version_is_cached_as_immutable(client, register):
+    _, admin = register("admin@example.com", "admin")
+    slider = add_slider(client, admin, "Spring")
+    version = client.get("/site-config").json()["version"]
+    pinned = client.get("/site-config", params={"v": version})
+    assert pinned.headers["cache-control"] == f"public, max-age={SITE_CONFIG_IMMUTABLE_MAX_AGE_SECONDS}, immutable"
+
+    # Once the config moves on, the old version is only cached briefly
+    assert client.put(f"/admin/home-sliders/{slider['id']}", json={"is_active": False}, headers=admin).status_code == 200
+    stale = client.get("/site-config", params={"v": version})
+    assert "immutable" not in stale.headers["cache-control"]
+    assert stale.json()["sliders"] == []
+    assert stale.json()["version"] > version
+
+
+def test_large_site_configs_are_served_precompressed(client, register):
+    _, admin = register("admin@example.com", "admin")
+    for n in range(20):
+        add_slider(client, admin, f"Slider {n}", description="Handmade lamps and clocks " * 5)
+    plain = client.get("/site-config", headers={"Accept-Encoding": "identity"})
+    compressed = client.get("/site-config", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in plain.headers
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["etag"] == plain.headers["etag"]
+    assert compressed.json() == plain.json()
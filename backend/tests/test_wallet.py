@@ -0,0 +1,62 @@
+import pytest
+
+import database
+from services.ledger import post_ledger_entries
+from models import LedgerEntryType
+
+
+@pytest.fixture
+def buyer(register):
+    """(user id, headers) of a buyer holding a 100 prize credit."""
+    user_id, headers = register("buyer@example.com")
+    with database.engine.begin() as conn:
+        post_ledger_entries(conn, [{
+            "user_id": user_id, "entry_type": LedgerEntryType.PRIZE_CREDIT, "amount": 100, "reference": "contest:1"
+        }])
+    return user_id, headers
+
+
+def balance(client, headers):
+    return client.get("/wallet/balance", headers=headers).json()["balance"]
+
+
+def withdraw(client, headers, amount, **extra):
+    return client.post("/wallet/withdrawals", json={"amount": amount, "bank_name": "Bank", **extra}, headers=headers)
+
+
+def test_withdrawals_debit_the_callers_wallet(client, register, buyer):
+    user_id, headers = buyer
+    other_id, _ = register("other@example.com")
+    assert withdraw(client, {}, 10).status_code == 401
+    assert withdraw(client, headers, 10, user_id=other_id).status_code == 403
+    response = withdraw(client, headers, 30)
+    assert response.status_code == 200, response.text
+    assert response.json()["user"]["userId"] == str(user_id)
+    assert response.json()["status"] == "pending"
+    assert balance(client, headers) == 70
+
+
+def test_withdrawals_cannot_overdraw_the_wallet(client, buyer):
+    _, headers = buyer
+    assert withdraw(client, headers, 0).status_code == 400
+    response = withdraw(client, headers, 150)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Insufficient wallet balance"
+    assert balance(client, headers) == 100
+    assert client.get("/wallet/ledger", headers=headers).json()["entries"][0]["type"] == "prize_credit"
+
+
+def test_rejected_withdrawals_are_refunded_once(client, register, buyer):
+    _, headers = buyer
+    _, admin = register("admin@example.com", "admin")
+    withdrawal_id = withdraw(client, headers, 40).json()["id"]
+    status = f"/admin/withdrawals/{withdrawal_id}/status"
+    assert client.put(status, params={"status": "rejected"}, headers=headers).status_code == 403
+    assert client.put(status, params={"status": "rejected"}, headers=admin).status_code == 200
+    assert balance(client, headers) == 100
+    assert client.put(status, params={"status": "rejected"}, headers=admin).status_code == 400
+    response = client.put("/admin/withdrawals/status", json={"ids": [int(withdrawal_id)], "status": "rejected"}, headers=admin)
+    assert response.json() == {"updated": [], "skipped": [int(withdrawal_id)]}
+    assert balance(client, headers) == 100
+    queue = client.get("/admin/withdrawals", params={"status": "rejected"}, headers=admin).json()["withdrawals"]
+    assert [withdrawal["id"] for withdrawal in queue] == [withdrawal_id]
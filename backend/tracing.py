@@ -0,0 +1,318 @@
+# tracing.py
+"""Request tracing with OTLP/JSON export.
+
+Spans nest through a context variable, so SQL statements, event handlers and
+settlement work done on behalf of a request land in the request's trace.
+Sampling is decided once per trace at its root span (or taken from an
+incoming ``traceparent`` header); an unsampled trace costs one context
+variable lookup per span. Finished spans are batched by a background thread
+and posted to an OTLP/HTTP collector or appended to a JSON-lines file, one
+ExportTraceServiceRequest per line.
+"""
+import contextvars
+import json
+import logging
+import random
+import secrets
+import threading
+import time
+import urllib.request
+from collections import deque, namedtuple
+from contextlib import contextmanager
+
+logger = logging.getLogger("auction.tracing")
+
+# OTLP span kinds
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+KIND_CLIENT = 3
+KIND_PRODUCER = 4
+KIND_CONSUMER = 5
+
+STATUS_ERROR = 2
+
+EXPORT_INTERVAL_SECONDS = 2.0
+EXPORT_BATCH_SIZE = 512
+# Spans beyond this many waiting for export are dropped rather than buffered
+EXPORT_QUEUE_SIZE = 20000
+
+SpanContext = namedtuple("SpanContext", "trace_id span_id sampled")
+
+UNSAMPLED = SpanContext("0" * 32, "0" * 16, False)
+_current = contextvars.ContextVar("trace_context", default=None)
+
+
+def parse_traceparent(header):
+    """SpanContext from a W3C ``traceparent`` header, or None if it is malformed."""
+    parts = (header or "").strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16 or len(parts[3]) != 2:
+        return None
+    try:
+        flags = int(parts[3], 16)
+        int(parts[1], 16)
+        int(parts[2], 16)
+    except ValueError:
+        return None
+    if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+        return None
+    return SpanContext(parts[1], parts[2], bool(flags & 1))
+
+
+def format_traceparent(context):
+    return f"00-{context.trace_id}-{context.span_id}-{'01' if context.sampled else '00'}"
+
+
+class Span:
+    __slots__ = ("name", "context", "parent_id", "kind", "start_ns", "end_ns", "attributes", "links", "error", "_tracer")
+
+    def __init__(self, tracer, name, context, parent_id, kind, attributes, links=None):
+        self._tracer = tracer
+        self.name = name
+        self.context = context
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = dict(attributes) if attributes else {}
+        self.links = [link for link in links or () if link.sampled]
+        self.error = None
+        self.end_ns = None
+        self.start_ns = time.time_ns()
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def record_error(self, exc):
+        self.error = f"{type(exc).__name__}: {exc}"
+
+    def end(self):
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            self._tracer._finished(self)
+
+
+class _NoopSpan:
+    """Stands in for a span of an unsampled trace."""
+    context = UNSAMPLED
+
+    def set_attribute(self, key, value):
+        pass
+
+    def record_error(self, exc):
+        pass
+
+    def end(self):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """Creates spans and hands finished ones to an exporter.
+
+    Without an exporter, or with a sample rate of 0, no trace is sampled
+    unless an incoming traceparent asks for it and an exporter exists.
+    """
+
+    def __init__(self, service_name, sample_rate=0.0, exporter=None):
+        self.service_name = service_name
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+        self._queue = deque()
+        self._wake = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    @property
+    def enabled(self):
+        return self.exporter is not None
+
+    def current(self):
+        """The active SpanContext, or None outside any trace."""
+        return _current.get()
+
+    def start_span(self, name, kind=KIND_INTERNAL, attributes=None, parent=None, links=None):
+        """A span that is not made current; children of it must pass ``parent``.
+
+        ``links`` are SpanContexts of other traces the span works for, such as
+        the requests whose bids share one group commit.
+        """
+        parent = parent if parent is not None else _current.get()
+        if parent is None:
+            if self.exporter is None or random.random() >= self.sample_rate:
+                return NOOP_SPAN
+            return Span(self, name, SpanContext(secrets.token_hex(16), secrets.token_hex(8), True), None, kind, attributes, links)
+        if not parent.sampled or self.exporter is None:
+            return NOOP_SPAN
+        return Span(self, name, SpanContext(parent.trace_id, secrets.token_hex(8), True), parent.span_id, kind, attributes, links)
+
+    @contextmanager
+    def span(self, name, kind=KIND_INTERNAL, attributes=None, parent=None, links=None):
+        """Run a block as the current span; exceptions are recorded and re-raised."""
+        span = self.start_span(name, kind, attributes, parent, links)
+        token = _current.set(span.context if span is not NOOP_SPAN else (parent or _current.get() or UNSAMPLED))
+        try:
+            yield span
+        except BaseException as exc:
+            span.record_error(exc)
+            raise
+        finally:
+            _current.reset(token)
+            span.end()
+
+    @contextmanager
+    def use(self, context):
+        """Make ``context`` (e.g. captured with current()) the parent of spans in this block."""
+        token = _current.set(context)
+        try:
+            yield
+        finally:
+            _current.reset(token)
+
+    def flush(self):
+        while self._queue:
+            self._export_batch()
+
+    def shutdown(self):
+        self._wake.set()
+        self.flush()
+
+    def _finished(self, span):
+        if len(self._queue) >= EXPORT_QUEUE_SIZE:
+            self.dropped += 1
+            return
+        self._queue.append(span)
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="trace-export", daemon=True)
+                    self._thread.start()
+        if len(self._queue) >= EXPORT_BATCH_SIZE:
+            self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(EXPORT_INTERVAL_SECONDS)
+            self._wake.clear()
+            self.flush()
+
+    def _export_batch(self):
+        batch = []
+        while self._queue and len(batch) < EXPORT_BATCH_SIZE:
+            try:
+                batch.append(self._queue.popleft())
+            except IndexError:
+                break
+        if not batch:
+            return
+        try:
+            self.exporter.export(otlp_request(self.service_name, batch))
+        except Exception:
+            logger.exception("Exporting %d spans failed", len(batch))
+
+
+def _attribute_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def otlp_request(service_name, spans):
+    """ExportTraceServiceRequest in the OTLP/JSON encoding."""
+    encoded = []
+    for span in spans:
+        item = {
+            "traceId": span.context.trace_id,
+            "spanId": span.context.span_id,
+            "name": span.name,
+            "kind": span.kind,
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": [{"key": key, "value": _attribute_value(value)} for key, value in span.attributes.items()],
+        }
+        if span.parent_id:
+            item["parentSpanId"] = span.parent_id
+        if span.links:
+            item["links"] = [{"traceId": link.trace_id, "spanId": link.span_id} for link in span.links]
+        if span.error:
+            item["status"] = {"code": STATUS_ERROR, "message": span.error}
+        encoded.append(item)
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+            "scopeSpans": [{"scope": {"name": "auction"}, "spans": encoded}]
+        }]
+    }
+
+
+class OtlpHttpExporter:
+    """Posts OTLP/JSON to a collector's /v1/traces endpoint."""
+
+    def __init__(self, endpoint, timeout=5.0):
+        self.endpoint = endpoint
+        self.timeout = timeout
+
+    def export(self, request):
+        body = json.dumps(request, separators=(",", ":")).encode("utf-8")
+        http_request = urllib.request.Request(
+            self.endpoint, data=body, method="POST", headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(http_request, timeout=self.timeout) as response:
+            response.read()
+
+
+class FileExporter:
+    """Appends one OTLP/JSON export request per line."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, request):
+        line = json.dumps(request, separators=(",", ":")) + "\n"
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+class TracingMiddleware:
+    """ASGI middleware opening a server span per HTTP request.
+
+    The span is named after the matched route template once routing has
+    run, and joins the caller's trace when a traceparent header is sent.
+    """
+
+    def __init__(self, app, tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+        parent = None
+        for key, value in scope.get("headers", ()):
+            if key == b"traceparent":
+                parent = parse_traceparent(value.decode("latin-1"))
+                break
+        method = scope["method"]
+        # Unmatched paths keep the bare method as name, so span names stay low-cardinality
+        with self.tracer.span(method, KIND_SERVER, {
+            "http.request.method": method,
+            "url.path": scope["path"],
+        }, parent=parent) as span:
+            async def send_with_status(message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.response.status_code", message["status"])
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = scope.get("route")
+                if route is not None and span is not NOOP_SPAN:
+                    span.name = f"{method} {route.path}"
+                    span.set_attribute("http.route", route.path)